@@ -0,0 +1,11 @@
+"""Offline performance benchmarks.
+
+Everything runs against local stand-ins: Binance and Alpha Vantage are
+served by :mod:`benchmarks.upstream` from recorded (or synthesised)
+responses and the chat model is the scripted :mod:`benchmarks.fake_llm`, so
+results are repeatable and need no API keys or network access.
+
+Usage:
+    python -m benchmarks.run --repeat 5 --save baseline.json
+    python -m benchmarks.run --compare baseline.json
+"""
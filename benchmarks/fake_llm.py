@@ -0,0 +1,125 @@
+"""Deterministic stand-in for the ``ChatOpenAI`` model in ``src.config.llm``.
+
+:class:`ScriptedChatModel` plays the analysis agents' happy path without a
+network call:
+
+1. First turn: request the multi-interval price, indicator and pattern
+   tools for the trade in the user message, all in one parallel call.
+2. Once tool results are in: answer with a short fixed text.
+3. Structured output (``with_structured_output`` / the agents'
+   ``response_format``): return a schema-valid placeholder object.
+
+An optional fixed ``latency_s`` stands in for model time.
+"""
+
+import ast
+import asyncio
+import datetime
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Tools requested on the first turn, per market, with the interval used.
+TOOL_PLAN = {
+    "coin": (("get_coin_price_multi", None), ("get_coin_indicators", "1h"), ("get_coin_patterns", "1h")),
+    "stock": (("get_stock_price_multi", None), ("get_stock_indicators", "5min"), ("get_stock_patterns", "5min")),
+}
+WINDOW = datetime.timedelta(days=2)
+
+
+def example_from_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """Smallest value that validates against a JSON schema."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return example_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if combinator in schema:
+            return example_from_schema(schema[combinator][0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    kind = schema.get("type", "object")
+    if kind == "object":
+        return {name: example_from_schema(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}), defs)]
+    return {"string": "benchmark", "number": 0.0, "integer": 0, "boolean": False, "null": None}.get(kind, "benchmark")
+
+
+def _trade(messages: List[BaseMessage]) -> Dict[str, Any]:
+    """The trade dict embedded in the latest user message."""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            match = re.search(r"\{.*\}", str(message.content), re.S)
+            if match:
+                return ast.literal_eval(match.group())
+    return {}
+
+
+def _plan_calls(trade: Dict[str, Any], available: List[str]) -> List[Dict[str, Any]]:
+    from src.agent.fast_path import parse_trade_time
+
+    market = "stock" if "trading_stock" in trade else "coin"
+    when = parse_trade_time(trade["trading_time"])
+    window = {
+        "start_date": (when - WINDOW).isoformat(),
+        "end_date": min(when + WINDOW, datetime.datetime.now()).isoformat(),
+    }
+    symbol = {"stock_symbol": trade["trading_stock"]} if market == "stock" else {"coin": trade["trading_coin"]}
+    calls = []
+    for name, interval in TOOL_PLAN[market]:
+        if name not in available:
+            continue
+        args = {**symbol, **window}
+        if interval is not None:
+            args.update(interval=interval, at_time=when.isoformat())
+            if market == "stock":
+                args["function_type"] = "TIME_SERIES_INTRADAY"
+        calls.append({"name": name, "args": args, "id": f"call_{len(calls)}"})
+    return calls
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that follows a fixed tool-calling script."""
+
+    latency_s: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, *, tool_choice: Optional[Any] = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], tool_choice=tool_choice, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools: List[Dict[str, Any]], tool_choice: Any) -> AIMessage:
+        if tool_choice and tools:
+            function = tools[0]["function"]
+            args = example_from_schema(function.get("parameters", {}))
+            return AIMessage(content="", tool_calls=[{"name": function["name"], "args": args, "id": "call_structured"}])
+        results = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            results += isinstance(message, ToolMessage)
+        if results:
+            return AIMessage(content=f"Reviewed {results} tool results; the trade analysis is complete.")
+        calls = _plan_calls(_trade(messages), [t["function"]["name"] for t in tools])
+        if not calls:
+            return AIMessage(content="No tools available for this trade.")
+        return AIMessage(content="", tool_calls=calls)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> ChatResult:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tools or [], tool_choice))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> ChatResult:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, tools or [], tool_choice))])
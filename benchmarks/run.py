@@ -0,0 +1,361 @@
+"""Offline benchmark harness.
+
+Starts the stand-in upstream server, points the tools at it, replaces the
+chat model with :class:`benchmarks.fake_llm.ScriptedChatModel` and
+measures, for every tool:
+
+* ``cold_ms`` – latency with empty candle store and response cache
+* ``warm_ms`` – latency of the same call again (served from the caches)
+* ``upstream_ms`` / ``requests`` / ``upstream_bytes`` – time, count and
+  size of the upstream HTTP requests of the cold call
+* ``decode_ms`` – JSON decoding of those responses
+* ``process_ms`` – everything else: parsing into frames/arrays,
+  indicators, patterns and encoding the tool output
+* ``payload_bytes`` / ``tokens`` – size of the output handed to the LLM
+
+and the end-to-end latency of each agent (and the fast path) on the
+benchmark trades. Figures are medians over ``--repeat`` runs.
+
+``--save`` writes the results as JSON; ``--compare`` checks them against a
+saved baseline and exits with status 1 on regressions beyond
+``--tolerance``.
+
+Usage:
+    python -m benchmarks.run --repeat 5 --save baseline.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.25
+    python -m benchmarks.run --record          # re-record fixtures (needs ALPHA_VANTAGE)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fixtures import load_scenarios, save_scenarios
+from .upstream import StandInServer
+
+# Portfolio-sized symbol lists for the bulk quote tools.
+WATCHLIST_STOCKS = [
+    "AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META", "TSLA", "BRK.B", "JPM", "V",
+    "UNH", "XOM", "JNJ", "WMT", "MA", "PG", "HD", "CVX", "MRK", "ABBV",
+    "KO", "PEP", "AVGO", "COST", "ADBE", "CRM", "NFLX", "AMD", "INTC", "ORCL",
+]
+WATCHLIST_COINS = [
+    "BTC", "ETH", "BNB", "SOL", "XRP", "ADA", "DOGE", "AVAX", "DOT", "LINK",
+    "MATIC", "LTC", "TRX", "ATOM", "UNI", "XLM", "ETC", "FIL", "APT", "NEAR",
+]
+
+LATENCY_KEYS = ("cold_ms", "warm_ms", "e2e_ms")
+SIZE_KEYS = ("payload_bytes", "tokens", "upstream_bytes", "requests")
+
+
+def tool_cases(scenarios: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(label, tool name, arguments) for every benchmarked tool call."""
+    from src.agent.fast_path import WINDOW, parse_trade_time
+
+    coin, stock = scenarios["coin"], scenarios["stock"]
+    coin_at, stock_at = parse_trade_time(coin["trading_time"]), parse_trade_time(stock["trading_time"])
+    coin_window = {
+        "coin": coin["trading_coin"],
+        "start_date": (coin_at - WINDOW).isoformat(),
+        "end_date": (coin_at + WINDOW).isoformat(),
+    }
+    stock_window = {
+        "stock_symbol": stock["trading_stock"],
+        "start_date": (stock_at - WINDOW).isoformat(),
+        "end_date": (stock_at + WINDOW).isoformat(),
+    }
+    intraday = {"function_type": "TIME_SERIES_INTRADAY", "interval": "5min"}
+    return [
+        ("get_coin_price[5m]", "get_coin_price", {**coin_window, "interval": "5m"}),
+        ("get_coin_price_multi", "get_coin_price_multi", coin_window),
+        ("get_coin_indicators[1h]", "get_coin_indicators", {**coin_window, "interval": "1h", "at_time": coin_at.isoformat()}),
+        ("get_coin_patterns[1h]", "get_coin_patterns", {**coin_window, "interval": "1h", "at_time": coin_at.isoformat()}),
+        ("get_coin_news", "get_coin_news", coin_window),
+        ("get_coin_news[query]", "get_coin_news", {**coin_window, "query": "ETF approval"}),
+        ("get_stock_price[5min]", "get_stock_price", {**stock_window, **intraday}),
+        ("get_stock_price[daily]", "get_stock_price", stock_window),
+        ("get_stock_price_multi", "get_stock_price_multi", stock_window),
+        ("get_stock_indicators[5min]", "get_stock_indicators", {**stock_window, **intraday, "at_time": stock_at.isoformat()}),
+        ("get_stock_patterns[5min]", "get_stock_patterns", {**stock_window, **intraday, "at_time": stock_at.isoformat()}),
+        ("get_stock_quote", "get_stock_quote", {"stock_symbol": stock["trading_stock"]}),
+        ("get_stock_quotes[30]", "get_stock_quotes", {"stock_symbols": WATCHLIST_STOCKS}),
+        ("get_coin_quotes[20]", "get_coin_quotes", {"coins": WATCHLIST_COINS}),
+        ("search_stocks", "search_stocks", {"keywords": "Apple"}),
+        ("get_company_overview", "get_company_overview", {"stock_symbol": stock["trading_stock"]}),
+        ("get_top_gainers_losers", "get_top_gainers_losers", {}),
+    ]
+
+
+def _union_s(intervals: List[Tuple[float, float]]) -> float:
+    """Wall time covered by possibly overlapping (start, end) intervals."""
+    total, reach = 0.0, float("-inf")
+    for start, end in sorted(intervals):
+        if end > reach:
+            total += end - max(start, reach)
+            reach = end
+    return total
+
+
+class UpstreamMeter:
+    """Wraps ``src.utils.http.get``/``aget`` to time requests and decoding.
+
+    Paged fetches run requests concurrently, so request time is reported
+    as wall time (the union of the request intervals), not their sum.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.bytes = 0
+        self._fetches: List[Tuple[float, float]] = []
+        self._decodes: List[Tuple[float, float]] = []
+
+    @property
+    def upstream_s(self) -> float:
+        return _union_s(self._fetches)
+
+    @property
+    def decode_s(self) -> float:
+        return sum(end - start for start, end in self._decodes)
+
+    @property
+    def io_s(self) -> float:
+        """Wall time spent waiting on or decoding upstream responses."""
+        return _union_s(self._fetches + self._decodes)
+
+    def _timed_json(self, response: Any) -> None:
+        decode = response.json
+
+        def json_(**kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return decode(**kwargs)
+            finally:
+                with self._lock:
+                    self._decodes.append((started, time.perf_counter()))
+
+        response.json = json_
+
+    def _record(self, response: Any, started: float) -> Any:
+        with self._lock:
+            self._fetches.append((started, time.perf_counter()))
+            self.requests += 1
+            self.bytes += len(response.content)
+        self._timed_json(response)
+        return response
+
+    def install(self) -> None:
+        from src.utils import http
+
+        get, aget = http.get, http.aget
+
+        def timed_get(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            return self._record(get(*args, **kwargs), started)
+
+        async def timed_aget(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            return self._record(await aget(*args, **kwargs), started)
+
+        http.get, http.aget = timed_get, timed_aget
+
+
+def clear_store() -> None:
+    from src.config import config
+    from src.store import get_response_cache
+
+    shutil.rmtree(config["CANDLE_STORE_DIR"], ignore_errors=True)
+    get_response_cache().clear()
+
+
+def _median(values: List[float]) -> float:
+    return round(statistics.median(values), 3)
+
+
+def bench_tool(name: str, args: Dict[str, Any], repeat: int, meter: UpstreamMeter) -> Dict[str, Any]:
+    from src.tools import get_tool
+    from src.utils.encoding import estimate_tokens
+
+    tool = get_tool(name)
+    samples: Dict[str, List[float]] = {k: [] for k in ("cold_ms", "warm_ms", "upstream_ms", "decode_ms", "process_ms")}
+    output: Any = None
+    for _ in range(repeat):
+        clear_store()
+        meter.reset()
+        started = time.perf_counter()
+        output = tool.invoke(args)
+        cold = time.perf_counter() - started
+        upstream, decode, io, requests, upstream_bytes = meter.upstream_s, meter.decode_s, meter.io_s, meter.requests, meter.bytes
+        started = time.perf_counter()
+        tool.invoke(args)
+        samples["warm_ms"].append((time.perf_counter() - started) * 1000)
+        samples["cold_ms"].append(cold * 1000)
+        samples["upstream_ms"].append(upstream * 1000)
+        samples["decode_ms"].append(decode * 1000)
+        samples["process_ms"].append(max(cold - io, 0.0) * 1000)
+    payload = json.dumps(output, default=str, separators=(",", ":"))
+    return {
+        **{key: _median(values) for key, values in samples.items()},
+        "requests": requests,
+        "upstream_bytes": upstream_bytes,
+        "payload_bytes": len(payload.encode()),
+        "tokens": estimate_tokens(output),
+    }
+
+
+def bench_agent(trade: Dict[str, Any], market: str, mode: str, repeat: int, meter: UpstreamMeter) -> Dict[str, Any]:
+    from src.batch import analyse_trade
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        clear_store()
+        meter.reset()
+        started = time.perf_counter()
+        asyncio.run(analyse_trade(trade, market, mode=mode))
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"e2e_ms": _median(samples), "requests": meter.requests, "upstream_bytes": meter.bytes}
+
+
+def configure(server: StandInServer, store_dir: str, llm_latency_s: float) -> None:
+    """Point ``src`` at the stand-ins. Must run before ``src`` reads its config."""
+    os.environ.update(server.environ())
+    os.environ.update(
+        {
+            "ALPHA_VANTAGE": os.environ.get("ALPHA_VANTAGE") or "benchmark",
+            "ALPHA_VANTAGE_REQUESTS_PER_MINUTE": "0",
+            "BINANCE_REQUESTS_PER_MINUTE": "0",
+            "CANDLE_STORE_DIR": os.path.join(store_dir, "candles"),
+            "SYMBOL_INDEX_PATH": os.path.join(store_dir, "listing_status.csv"),
+            "NEWS_DB_PATH": os.path.join(store_dir, "news.db"),
+            "LLM_CACHE_TTL_SECONDS": "-1",
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_MODEL_ID": "benchmark",
+        }
+    )
+    import src.config
+    from .fake_llm import ScriptedChatModel
+
+    src.config.llm = ScriptedChatModel(latency_s=llm_latency_s)
+
+
+def run(repeat: int, scenarios: Dict[str, Dict[str, Any]], meter: UpstreamMeter, only: Optional[str] = None) -> Dict[str, Any]:
+    from src.store import get_news_store, get_symbol_directory
+
+    results: Dict[str, Any] = {"tools": {}, "agents": {}}
+    # search_stocks and get_coin_news are measured against built indexes, as
+    # in steady state.
+    get_symbol_directory().refresh()
+    get_news_store().refresh()
+    for label, name, args in tool_cases(scenarios):
+        if only and only not in label:
+            continue
+        results["tools"][label] = bench_tool(name, args, repeat, meter)
+    for market, trade in scenarios.items():
+        for mode in ("agent", "fast"):
+            label = f"{market}_{mode}"
+            if only and only not in label:
+                continue
+            results["agents"][label] = bench_agent(trade, market, mode, repeat, meter)
+    return results
+
+
+def print_report(results: Dict[str, Any], out=sys.stdout) -> None:
+    columns = ("cold_ms", "warm_ms", "upstream_ms", "decode_ms", "process_ms", "requests", "upstream_bytes", "payload_bytes", "tokens")
+    print(f"{'tool':28}" + "".join(f"{c:>15}" for c in columns), file=out)
+    for label, row in results["tools"].items():
+        print(f"{label:28}" + "".join(f"{row[c]:>15}" for c in columns), file=out)
+    print(file=out)
+    print(f"{'agent':28}{'e2e_ms':>15}{'requests':>15}{'upstream_bytes':>15}", file=out)
+    for label, row in results["agents"].items():
+        print(f"{label:28}{row['e2e_ms']:>15}{row['requests']:>15}{row['upstream_bytes']:>15}", file=out)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Describe every metric that regressed beyond ``tolerance``."""
+    regressions = []
+    for section in ("tools", "agents"):
+        for label, row in results[section].items():
+            base = baseline.get(section, {}).get(label)
+            if base is None:
+                continue
+            for key in LATENCY_KEYS + SIZE_KEYS:
+                if key not in row or key not in base:
+                    continue
+                new, old = row[key], base[key]
+                limit = old * (1 + tolerance)
+                if key in LATENCY_KEYS:
+                    limit = max(limit, old + min_delta_ms)
+                if new > limit:
+                    regressions.append(f"{section}/{label} {key}: {old} -> {new}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the tools and agents.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="Only run benchmarks whose label contains this string")
+    parser.add_argument("--upstream-latency-ms", type=float, default=0.0, help="Delay added to every upstream response")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Delay added to every model call")
+    parser.add_argument("--save", help="Write results as JSON")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown/growth")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore latency changes smaller than this")
+    parser.add_argument("--record", action="store_true", help="Proxy to the live APIs and save their responses as fixtures")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios()
+    store_dir = tempfile.mkdtemp(prefix="bench-data-")
+    server = StandInServer(
+        latency_ms=args.upstream_latency_ms,
+        record=args.record,
+        alpha_vantage_key=os.environ.get("ALPHA_VANTAGE"),
+    )
+    try:
+        with server:
+            configure(server, store_dir, args.llm_latency_ms / 1000)
+            meter = UpstreamMeter()
+            meter.install()
+            started = time.perf_counter()
+            results = run(args.repeat, scenarios, meter, args.only)
+            results["meta"] = {
+                "repeat": args.repeat,
+                "scenarios": scenarios,
+                "upstream": dict(server.stats),
+                "elapsed_s": round(time.perf_counter() - started, 2),
+            }
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    if args.record:
+        save_scenarios(scenarios)
+
+    print_report(results)
+    stats = results["meta"]["upstream"]
+    print(
+        f"\n{stats['requests']} upstream requests ({stats['replayed']} replayed, {stats['synthetic']} synthetic, "
+        f"{stats['recorded']} recorded) in {results['meta']['elapsed_s']}s"
+    )
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
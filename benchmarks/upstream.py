@@ -0,0 +1,141 @@
+"""Local stand-in for the Binance and Alpha Vantage HTTP APIs and news feeds.
+
+Serves ``/binance/api/v3/klines``, ``/binance/api/v3/ticker/24hr``,
+``/alphavantage/query`` and ``/news/rss`` from the
+fixtures in :mod:`benchmarks.fixtures`. With ``record=True`` every request
+is proxied to the live API instead and its response saved as a fixture.
+
+Usage::
+
+    with StandInServer(latency_ms=30) as server:
+        os.environ.update(server.environ())
+        ...
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .fixtures import load_fixture, save_fixture, synthetic_response
+
+LIVE_URLS = {
+    "binance": "https://api.binance.com/api/v3/klines",
+    "binance_ticker": "https://api.binance.com/api/v3/ticker/24hr",
+    "alphavantage": "https://www.alphavantage.co/query",
+    "news": "https://www.coindesk.com/arc/outboundfeeds/rss/",
+}
+
+ROUTES = {
+    "/binance/api/v3/klines": "binance",
+    "/binance/api/v3/ticker/24hr": "binance_ticker",
+    "/alphavantage/query": "alphavantage",
+    "/news/rss": "news",
+}
+
+# Text bodies by provider; everything else is JSON.
+TEXT_CONTENT_TYPES = {"alphavantage": "text/csv", "news": "application/rss+xml"}
+
+
+class StandInServer:
+    """Threaded HTTP server replaying recorded upstream responses."""
+
+    def __init__(self, latency_ms: float = 0.0, record: bool = False, alpha_vantage_key: Optional[str] = None):
+        self.latency_ms = latency_ms
+        self.record = record
+        self.alpha_vantage_key = alpha_vantage_key
+        self.stats: Dict[str, int] = {"requests": 0, "replayed": 0, "synthetic": 0, "recorded": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self) -> Dict[str, str]:
+        """Environment overrides pointing the tools at this server."""
+        return {
+            "BINANCE_API_URL": f"{self.url}/binance/api/v3",
+            "ALPHA_VANTAGE_URL": f"{self.url}/alphavantage/query",
+            "NEWS_FEEDS": f"{self.url}/news/rss",
+        }
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-upstream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _count(self, source: str, size: int) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[source] += 1
+            self.stats["bytes"] += size
+
+    def respond(self, provider: str, params: Dict[str, Any]) -> Any:
+        """Return the body for one request and how it was produced."""
+        if self.record:
+            live_params = dict(params)
+            if provider == "alphavantage" and self.alpha_vantage_key:
+                live_params["apikey"] = self.alpha_vantage_key
+            response = requests.get(LIVE_URLS[provider], params=live_params, timeout=60)
+            response.raise_for_status()
+            # LISTING_STATUS (CSV) and news feeds (XML) are kept as text.
+            content_type = response.headers.get("Content-Type", "")
+            body = response.text if "csv" in content_type or "xml" in content_type else response.json()
+            save_fixture(provider, params, body)
+            return body, "recorded"
+        body = load_fixture(provider, params)
+        if body is not None:
+            return body, "replayed"
+        return synthetic_response(provider, params), "synthetic"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                provider = ROUTES.get(parts.path)
+                if provider is None:
+                    self.send_error(404)
+                    return
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                try:
+                    body, source = server.respond(provider, dict(parse_qsl(parts.query)))
+                except Exception as exc:
+                    self.send_error(502, f"{type(exc).__name__}: {exc}")
+                    return
+                if isinstance(body, str):
+                    payload, content_type = body.encode(), TEXT_CONTENT_TYPES.get(provider, "text/plain")
+                else:
+                    payload, content_type = json.dumps(body, separators=(",", ":")).encode(), "application/json"
+                server._count(source, len(payload))
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("X-Fixture", source)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -1,5 +1,6 @@
 from langchain_core.messages import HumanMessage
 import json
+import uuid
 
 from src import stock_analysis_agent
 
@@ -11,7 +12,11 @@ user_trade_details = {
     "trade_type": "buy"
 }
 
-result = stock_analysis_agent.invoke({"messages": [HumanMessage(content=f"Analyze the trade details: {user_trade_details}")],})
+# A checkpointed agent needs a thread id (see src.store.checkpoints)
+result = stock_analysis_agent.invoke(
+    {"messages": [HumanMessage(content=f"Analyze the trade details: {user_trade_details}")],},
+    {"configurable": {"thread_id": uuid.uuid4().hex}},
+)
 
 # Print the result properly
 print("=" * 80)
@@ -1,4 +1,11 @@
-from .agent import *
-from .config import *
-from .model import *
-from .tools import *
+from src.utils.lazy import lazy_exports
+from src.tools.registry import TOOL_MODULES
+
+__all__ = lazy_exports(__name__, {
+    "stock_analysis_agent": ".agent",
+    "trade_analysis_agent": ".agent",
+    "fast_trade_analysis": ".agent",
+    "afast_trade_analysis": ".agent",
+    "llm": ".config",
+    **{name: ".tools" for name in TOOL_MODULES},
+})
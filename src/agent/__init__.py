@@ -1,2 +1,12 @@
-from .trading import *
-from .stock import *
+from src.utils.lazy import lazy_exports
+
+# Agents compile their graphs (and import their tools) on first access.
+__all__ = lazy_exports(__name__, {
+    "trade_analysis_agent": ".trading.trade_analysis_agent",
+    "OutputSchema": ".trading.schema",
+    "stock_analysis_agent": ".stock.agent",
+    "Tranding": ".stock.schema",
+    "TradingAnalysisAgentOutput": ".stock.schema",
+    "fast_trade_analysis": ".fast_path",
+    "afast_trade_analysis": ".fast_path",
+})
@@ -0,0 +1,207 @@
+"""Context-window management for the ReAct agents' message history.
+
+Every tool result used to stay verbatim in ``messages`` for the rest of the
+loop, so each model turn re-sent every earlier candle series and prompt
+size grew with the square of the number of tool calls. :func:`compact_history`
+runs as the agents' ``pre_model_hook`` and, before each model call:
+
+* replaces tool results the model has already answered (they precede its
+  latest message) with a compact digest: summary stats of candle series,
+  indicator values by name, pattern counts, the first items of lists;
+* if the history still exceeds ``CONTEXT_TOKEN_BUDGET``, digests the
+  newest results too (except recalled ones), largest first, and then cuts
+  the oldest digests down to their reference.
+
+Messages are replaced in place (same id), so the final structured-response
+call sees the compact history as well. The full payloads move to the
+``tool_outputs`` state key, keyed by tool call id; a digest carries that id
+as its ``ref`` and the ``recall_tool_output`` tool returns the original.
+"""
+
+import json
+import math
+from collections import Counter
+from typing import Annotated, Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langgraph.prebuilt.chat_agent_executor import AgentStateWithStructuredResponse
+
+from src.config import config
+from src.utils.encoding import CHARS_PER_TOKEN
+
+# Items kept from list payloads and characters kept of text payloads.
+DIGEST_ITEMS = 5
+DIGEST_CHARS = 600
+# Its results were asked for in full, so they are never digested unread.
+RECALL_TOOL = "recall_tool_output"
+
+
+def _merge_outputs(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Dict[str, str]:
+    return {**(left or {}), **(right or {})}
+
+
+class AnalysisState(AgentStateWithStructuredResponse):
+    """Agent state plus the full payloads of digested tool results."""
+    tool_outputs: Annotated[Dict[str, str], _merge_outputs]
+
+
+# ------------------------------------------------------------------ digests
+
+def _values(column: Optional[Sequence[Any]]) -> List[float]:
+    return [float(v) for v in column or () if isinstance(v, (int, float)) and math.isfinite(v)]
+
+
+def _is_candles(payload: Any) -> bool:
+    return isinstance(payload, dict) and isinstance(payload.get("columns"), dict) and "rows" in payload
+
+
+def _candle_digest(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Window statistics of an ``encode_candles`` payload."""
+    columns = payload["columns"]
+    times = columns.get("timestamp") or []
+    digest: Dict[str, Any] = {"rows": payload.get("source_rows", payload["rows"])}
+    if times:
+        digest["from"], digest["to"] = times[0], times[-1]
+    opens, closes = _values(columns.get("open")), _values(columns.get("close"))
+    highs, lows, volumes = _values(columns.get("high")), _values(columns.get("low")), _values(columns.get("volume"))
+    if opens:
+        digest["open"] = opens[0]
+    if closes:
+        digest["close"] = closes[-1]
+    if highs:
+        digest["high"] = max(highs)
+    if lows:
+        digest["low"] = min(lows)
+    if opens and closes and opens[0]:
+        digest["change_pct"] = round((closes[-1] / opens[0] - 1) * 100, 3)
+    if volumes:
+        # Downsampling re-buckets by summing volume, so the sum is exact.
+        digest["volume"] = round(sum(volumes), 2)
+    return digest
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= DIGEST_CHARS else text[:DIGEST_CHARS - 1] + "…"
+
+
+def digest_payload(payload: Any) -> Any:
+    """A compact stand-in for a tool's JSON output."""
+    if _is_candles(payload):
+        return _candle_digest(payload)
+    if isinstance(payload, dict):
+        if payload and all(_is_candles(value) for value in payload.values()):
+            # get_*_price_multi: one series per interval.
+            return {interval: _candle_digest(series) for interval, series in payload.items()}
+        if len(json.dumps(payload, default=str)) <= DIGEST_CHARS:
+            return payload
+        return {key: digest_payload(value) for key, value in payload.items()}
+    if isinstance(payload, list):
+        items = [item for item in payload if isinstance(item, dict)]
+        if items and len(items) == len(payload):
+            if all("indicator_name" in item for item in items):
+                return {item["indicator_name"]: item.get("indicator_value") for item in items}
+            if all("pattern" in item for item in items):
+                return {
+                    "count": len(items),
+                    "signals": dict(Counter(str(item.get("signal")) for item in items)),
+                    "latest": items[-DIGEST_ITEMS:],
+                }
+        if len(payload) <= DIGEST_ITEMS:
+            return [digest_payload(item) for item in payload]
+        return {"count": len(payload), "first": [digest_payload(item) for item in payload[:DIGEST_ITEMS]]}
+    if isinstance(payload, str):
+        return _truncate(payload)
+    return payload
+
+
+def _text(content: Any) -> str:
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def digest_content(content: Any) -> Any:
+    """Digest of a tool message's content (JSON text or plain text)."""
+    text = _text(content)
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return _truncate(text)
+    return digest_payload(payload)
+
+
+# ------------------------------------------------------------------ history
+
+def estimate_message_tokens(message: BaseMessage) -> int:
+    size = len(_text(message.content))
+    if isinstance(message, AIMessage) and message.tool_calls:
+        size += len(json.dumps(message.tool_calls, default=str))
+    return int(size / CHARS_PER_TOKEN) + 1
+
+
+def _replace(message: ToolMessage, body: Dict[str, Any], kind: str) -> ToolMessage:
+    return ToolMessage(
+        content=json.dumps(body, ensure_ascii=False, separators=(",", ":"), default=str),
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+        id=message.id,
+        status=message.status,
+        additional_kwargs={**message.additional_kwargs, "context": kind},
+    )
+
+
+def compact_messages(
+    messages: Sequence[BaseMessage], token_budget: int
+) -> Tuple[List[ToolMessage], Dict[str, str]]:
+    """Tool messages to replace in ``messages`` and the full outputs they hide.
+
+    Returns:
+        Tuple[List[ToolMessage], Dict[str, str]]: Replacement messages (same
+        ids as the ones they replace) and the original content of each newly
+        digested message by tool call id.
+    """
+    latest = max((i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default=-1)
+    current = list(messages)
+    replaced: Dict[int, ToolMessage] = {}
+    outputs: Dict[str, str] = {}
+
+    def digest(i: int) -> None:
+        message = current[i]
+        outputs[message.tool_call_id] = _text(message.content)
+        current[i] = replaced[i] = _replace(
+            message, {"ref": message.tool_call_id, "digest": digest_content(message.content)}, "digest"
+        )
+
+    tools = [i for i, m in enumerate(current) if isinstance(m, ToolMessage)]
+    fresh = [i for i in tools if "context" not in current[i].additional_kwargs]
+    # Results the model has answered are only needed as a summary.
+    for i in fresh:
+        if i < latest:
+            digest(i)
+
+    total = sum(estimate_message_tokens(m) for m in current)
+    if total > token_budget:
+        unread = [i for i in fresh if i > latest and current[i].name != RECALL_TOOL]
+        for i in sorted(unread, key=lambda i: -estimate_message_tokens(current[i])):
+            if total <= token_budget:
+                break
+            before = estimate_message_tokens(current[i])
+            digest(i)
+            total += estimate_message_tokens(current[i]) - before
+    if total > token_budget:
+        for i in tools:
+            if total <= token_budget:
+                break
+            message = current[i]
+            if message.additional_kwargs.get("context") != "digest":
+                continue
+            before = estimate_message_tokens(message)
+            current[i] = replaced[i] = _replace(message, {"ref": message.tool_call_id}, "reference")
+            total += estimate_message_tokens(current[i]) - before
+    return [replaced[i] for i in sorted(replaced)], outputs
+
+
+def compact_history(state: Dict[str, Any]) -> Dict[str, Any]:
+    """``pre_model_hook`` keeping the history within ``CONTEXT_TOKEN_BUDGET``."""
+    updates, outputs = compact_messages(state["messages"], config["CONTEXT_TOKEN_BUDGET"])
+    if not updates:
+        return {}
+    return {"messages": updates, "tool_outputs": outputs}
@@ -0,0 +1,206 @@
+"""Deterministic fast-path trade analysis.
+
+An alternative to the ReAct agents for when latency matters more than
+open-ended tool use. Data is gathered with one upstream fetch, the
+indicators, forward returns and Good/Bad verdict are computed in Python
+(:mod:`src.analysis.verdict`), and the LLM is called exactly once, only to
+write ``trading_technical_analysis`` and ``recommendations`` from those
+facts. The result has the same shape as the agents' structured output
+(``OutputSchema`` for coins, ``Tranding`` for stocks).
+"""
+
+import datetime
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from src.analysis.indicators import WARMUP_BARS, indicator_snapshot
+from src.analysis.patterns import pattern_events
+from src.analysis.resample import resample
+from src.analysis.verdict import HOUR_MS, decide
+from src.store.candles import Candles
+from src.tools.coin_price import (
+    afetch_coin_candles,
+    fetch_coin_candles,
+    format_timestamp as format_coin_time,
+    normalize_coin_symbol,
+    parse_at_time,
+)
+from src.tools.stock.get_stock_price import (
+    afetch_stock_candles,
+    fetch_stock_candles,
+    format_timestamp as format_stock_time,
+    frame_to_ohlcv,
+    to_ms,
+)
+from .stock.schema import Tranding
+from .trading.schema import OutputSchema
+
+# Candles fetched at 5 minutes and aggregated to hourly bars locally.
+BARS_PER_HOUR = 12
+WINDOW = datetime.timedelta(days=2)
+
+NARRATIVE_PROMPT = """
+You are a trading analyst. The verdict and every number below were computed
+deterministically and are final; do not change or re-derive them. Using only
+these facts, write:
+
+* trading_technical_analysis: a concise technical analysis of the trade
+  (entry context, indicators, candlestick patterns, what happened after).
+* recommendations: concrete, actionable recommendations for the trader.
+"""
+
+
+class Narrative(BaseModel):
+    """The only part of the analysis written by the LLM."""
+    trading_technical_analysis: str
+    recommendations: str
+
+
+def parse_trade_time(value: str) -> datetime.datetime:
+    """Parse free-form trade times such as "9th April 2025, 19:00"."""
+    try:
+        return datetime.datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        pass
+    cleaned = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", str(value)).replace(",", " ")
+    try:
+        return pd.Timestamp(" ".join(cleaned.split())).to_pydatetime().replace(tzinfo=None)
+    except Exception as ex:
+        raise ValueError(f"Unrecognised trading_time {value!r}: {ex}")
+
+
+def parse_amount(value: Any) -> float:
+    """Extract the numeric part of amounts such as "500 $"."""
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value).replace(",", ""))
+    if not match:
+        raise ValueError(f"Unrecognised trading_amount {value!r}")
+    return float(match.group())
+
+
+def _trade_facts(trade: Dict[str, Any], market: str = "auto") -> Tuple[str, str, datetime.datetime, str]:
+    """Return (market, symbol, trade time, side) for a trade dict.
+
+    ``auto`` picks the market by trading_stock/trading_coin; an explicit
+    ``stock`` or ``coin`` requires the trade's symbol for that market.
+    """
+    if market == "auto":
+        if trade.get("trading_stock"):
+            market = "stock"
+        elif trade.get("trading_coin"):
+            market = "coin"
+        else:
+            raise ValueError("Trade has neither 'trading_stock' nor 'trading_coin'")
+    elif market not in ("stock", "coin"):
+        raise ValueError(f"Unknown market {market!r}; expected 'stock' or 'coin'")
+    elif not trade.get(f"trading_{market}"):
+        raise ValueError(f"Trade has no 'trading_{market}' to analyse as a {market} trade")
+    if market == "stock":
+        symbol = str(trade["trading_stock"]).strip().upper()
+    else:
+        symbol = normalize_coin_symbol(str(trade["trading_coin"]).strip())
+    side = str(trade.get("trade_type") or "buy").strip().lower()
+    if side not in ("buy", "sell"):
+        raise ValueError(f"Unknown trade_type {trade.get('trade_type')!r}")
+    return market, symbol, parse_trade_time(trade["trading_time"]), side
+
+
+def _fetch_args(market: str, symbol: str, when: datetime.datetime) -> Dict[str, Any]:
+    end = min(when + WINDOW, datetime.datetime.now())
+    args = {
+        "start_date": (when - WINDOW).isoformat(),
+        "end_date": end.isoformat(),
+        "lookback_bars": WARMUP_BARS * BARS_PER_HOUR,
+    }
+    if market == "coin":
+        return {"coin": symbol, "interval": "5m", **args}
+    args.update(stock_symbol=symbol, function_type="TIME_SERIES_INTRADAY", interval="5min")
+    return args
+
+
+def _facts(trade: Dict[str, Any], market: str, symbol: str, when: datetime.datetime, side: str, base: Candles) -> Dict[str, Any]:
+    """Compute everything the verdict and the narrative need."""
+    if market == "coin":
+        format_time, at_ms = format_coin_time, parse_at_time(when.isoformat())
+        hourly = resample(base, HOUR_MS)
+    else:
+        format_time, at_ms = format_stock_time, to_ms(when.isoformat())
+        hourly = resample(base, HOUR_MS, within_day=True)
+    window_start_ms = at_ms - int(WINDOW.total_seconds() * 1000)
+
+    verdict = decide(base, at_ms, side, format_time=format_time)
+    indicators = indicator_snapshot(hourly, "1h", format_time, window_start_ms=window_start_ms, at_ms=at_ms)
+    for r in verdict["forward_returns"]:
+        indicators.append(
+            {
+                "indicator_name": f"Forward return {r['horizon']}" + ("" if r["complete"] else " (partial)"),
+                "indicator_value": f"{r['return_pct']:.2f}%",
+                "interval": "5m",
+                "start_time": verdict["entry_time"],
+                "end_time": r["end_time"],
+            }
+        )
+    return {
+        "trading_info": {
+            f"trading_{market}": symbol,
+            "trading_amount": parse_amount(trade.get("trading_amount", 0)),
+            "trading_time": str(trade["trading_time"]),
+        },
+        "trade_type": side,
+        "verdict": verdict,
+        "trading_technical_indicators": indicators,
+        "patterns": pattern_events(hourly, format_time, window_start_ms=window_start_ms, at_ms=at_ms, window_bars=6),
+    }
+
+
+def _messages(facts: Dict[str, Any]) -> List:
+    return [
+        SystemMessage(content=NARRATIVE_PROMPT),
+        HumanMessage(content=json.dumps(facts, separators=(",", ":"), default=str)),
+    ]
+
+
+def _result(market: str, facts: Dict[str, Any], narrative: Narrative) -> Dict[str, Any]:
+    schema = OutputSchema if market == "coin" else Tranding
+    return schema(
+        trading_info=facts["trading_info"],
+        trading_technical_analysis=narrative.trading_technical_analysis,
+        trading_technical_indicators=facts["trading_technical_indicators"],
+        trade_decision=facts["verdict"]["trade_decision"],
+        recommendations=narrative.recommendations,
+    ).model_dump()
+
+
+def fast_trade_analysis(trade: Dict[str, Any], market: str = "auto") -> Dict[str, Any]:
+    """Analyse one trade deterministically with a single narrative LLM call.
+
+    ``market`` is ``stock``, ``coin`` or ``auto`` (decided by the trade's keys).
+    """
+    market, symbol, when, side = _trade_facts(trade, market)
+    args = _fetch_args(market, symbol, when)
+    if market == "coin":
+        base = fetch_coin_candles(**args)
+    else:
+        base = frame_to_ohlcv(fetch_stock_candles(**args))
+    facts = _facts(trade, market, symbol, when, side, base)
+    from src.config import llm
+    narrative = llm.with_structured_output(Narrative).invoke(_messages(facts))
+    return _result(market, facts, narrative)
+
+
+async def afast_trade_analysis(trade: Dict[str, Any], market: str = "auto") -> Dict[str, Any]:
+    """Async counterpart of :func:`fast_trade_analysis`."""
+    market, symbol, when, side = _trade_facts(trade, market)
+    args = _fetch_args(market, symbol, when)
+    if market == "coin":
+        base = await afetch_coin_candles(**args)
+    else:
+        base = frame_to_ohlcv(await afetch_stock_candles(**args))
+    facts = _facts(trade, market, symbol, when, side, base)
+    from src.config import llm
+    narrative = await llm.with_structured_output(Narrative).ainvoke(_messages(facts))
+    return _result(market, facts, narrative)
@@ -1,2 +1,9 @@
-from .agent import *
-from .schema import *
+from src.utils.lazy import lazy_exports
+
+__all__ = lazy_exports(__name__, {
+    "TradingInfo": ".schema",
+    "TradingTechnicalIndicator": ".schema",
+    "Tranding": ".schema",
+    "TradingAnalysisAgentOutput": ".schema",
+    "stock_analysis_agent": ".agent",
+})
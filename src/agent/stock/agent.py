@@ -1,16 +1,18 @@
 from langgraph.prebuilt import create_react_agent
-from src.tools import (
-    get_stock_price,
-    get_stock_quote,
-    search_stocks,
-)
+from src.tools import get_tools
+from src.tools.registry import STOCK_AGENT_TOOLS
 from src.config import llm, config
+from src.store.checkpoints import get_checkpointer
+from src.agent.context import AnalysisState, compact_history
 from .schema import TradingAnalysisAgentOutput
 
 stock_analysis_agent = create_react_agent(
     name="stock_analysis_agent",
     model=llm,
-    tools=[get_stock_price, get_stock_quote, search_stocks],
+    tools=get_tools(STOCK_AGENT_TOOLS),
     prompt=config["STOCK_PROMPTS"]["STOCK_TECHNICAL_ANALYSIS"],
     response_format=TradingAnalysisAgentOutput,
+    state_schema=AnalysisState,
+    pre_model_hook=compact_history,
+    checkpointer=get_checkpointer(),
 )
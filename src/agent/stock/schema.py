@@ -34,6 +34,7 @@ class Tranding(BaseModel):
     trade_decision: Literal["Good", "Bad"]
     recommendations: str
 
-class TradingAnalysisAgentOutput:
-    """Agent for performing stock trading analysis."""
-    output : list[Tranding]
+class TradingAnalysisAgentOutput(BaseModel):
+    """Structured response of the stock analysis agent."""
+    output: List[Tranding]
+
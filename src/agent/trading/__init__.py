@@ -1 +1,8 @@
-from .trade_analysis_agent import *
+from src.utils.lazy import lazy_exports
+
+__all__ = lazy_exports(__name__, {
+    "TradingInfo": ".schema",
+    "TradingTechnicalIndicator": ".schema",
+    "OutputSchema": ".schema",
+    "trade_analysis_agent": ".trade_analysis_agent",
+})
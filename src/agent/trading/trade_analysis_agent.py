@@ -1,17 +1,21 @@
 from langgraph.prebuilt import create_react_agent
-from src.tools import (
-    get_coin_price,
-)
+from src.tools import get_tools
+from src.tools.registry import COIN_AGENT_TOOLS
 from src.config import llm, config
+from src.store.checkpoints import get_checkpointer
+from src.agent.context import AnalysisState, compact_history
 from .schema import OutputSchema
 
 trade_analysis_agent = create_react_agent(
     name="trade_analysis_agent",
     model=llm,
-    tools=[get_coin_price],
+    tools=get_tools(COIN_AGENT_TOOLS),
     prompt=config["TRADE_ANALYSIS_PROMPT"],
     # Use the Pydantic model directly as the response_format. Passing
     # typing constructs like List[OutputSchema] causes runtime errors when
     # libraries attempt to access attributes like __name__ on the object.
     response_format=OutputSchema,
+    state_schema=AnalysisState,
+    pre_model_hook=compact_history,
+    checkpointer=get_checkpointer(),
 )
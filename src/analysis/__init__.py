@@ -0,0 +1,10 @@
+"""Deterministic numeric analysis over OHLCV candle arrays."""
+
+from src.utils.lazy import lazy_exports
+
+__all__ = lazy_exports(__name__, {
+    "indicator_snapshot": ".indicators",
+    "detect_patterns": ".patterns",
+    "pattern_events": ".patterns",
+    "decide": ".verdict",
+})
@@ -0,0 +1,220 @@
+"""Vectorised technical indicators over OHLCV arrays.
+
+All functions take NumPy arrays and return arrays of the same length, with
+``NaN`` where there is not yet enough history. Recursive smoothing (EMA and
+Wilder's RMA) uses pandas' compiled ``ewm`` so no Python loop runs per
+candle.
+
+:func:`indicator_snapshot` turns a candle set into a handful of values
+shaped like ``TradingTechnicalIndicator`` so the LLM reasons over dozens of
+numbers instead of thousands of raw candles.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.store.candles import Candles, TIMESTAMP
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Bars of history needed before the first value of every indicator below is
+# defined (MACD's slow EMA plus its signal line dominates).
+WARMUP_BARS = 60
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if period <= 0 or len(values) < period:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value."""
+    values = np.asarray(values, dtype=np.float64)
+    out = pd.Series(values).ewm(span=period, adjust=False).mean().to_numpy(copy=True)
+    out[: period - 1] = np.nan
+    return out
+
+
+def rma(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothed moving average (used by RSI and ATR)."""
+    values = np.asarray(values, dtype=np.float64)
+    out = pd.Series(values).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy(copy=True)
+    out[: period - 1] = np.nan
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder)."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    delta = np.diff(close)
+    avg_gain = rma(np.clip(delta, 0, None), period)
+    avg_loss = rma(np.clip(-delta, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + rs)
+    values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), values)
+    values[np.isnan(avg_gain)] = np.nan
+    out[1:] = values
+    return out
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    line = ema(close, fast) - ema(close, slow)
+    valid = ~np.isnan(line)
+    signal_line = np.full(len(line), np.nan)
+    if valid.any():
+        first = int(np.argmax(valid))
+        signal_line[first:] = ema(line[first:], signal)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+
+def bollinger(close: np.ndarray, period: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands (population standard deviation) and %B."""
+    close = np.asarray(close, dtype=np.float64)
+    middle = sma(close, period)
+    std = np.full(len(close), np.nan)
+    if len(close) >= period:
+        std[period - 1:] = sliding_window_view(close, period).std(axis=1)
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_b = (close - lower) / (upper - lower)
+    return {"upper": upper, "middle": middle, "lower": lower, "percent_b": percent_b}
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range (Wilder)."""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    true_range = np.nanmax(np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)]), axis=0)
+    return rma(true_range, period)
+
+
+def vwap(
+    timestamps: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    anchor_ms: Optional[int] = DAY_MS,
+) -> np.ndarray:
+    """Volume-weighted average price, reset every ``anchor_ms`` (None: never)."""
+    typical = (np.asarray(high) + np.asarray(low) + np.asarray(close)) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    pv = np.cumsum(typical * volume)
+    vol = np.cumsum(volume)
+    if anchor_ms:
+        session = np.asarray(timestamps) // anchor_ms
+        starts = np.flatnonzero(np.diff(session, prepend=session[0] - 1))
+        # Subtract the running totals at the start of each session.
+        offset_pv = np.repeat(pv[starts] - (typical * volume)[starts], np.diff(np.append(starts, len(pv))))
+        offset_vol = np.repeat(vol[starts] - volume[starts], np.diff(np.append(starts, len(vol))))
+        pv = pv - offset_pv
+        vol = vol - offset_vol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(vol > 0, pv / vol, np.nan)
+
+
+def _fmt(value: float, precision: int = 4) -> str:
+    if value is None or np.isnan(value):
+        return "n/a (insufficient history)"
+    return f"{value:.{precision}f}"
+
+
+def indicator_snapshot(
+    candles: Candles,
+    interval: str,
+    format_time: Callable[[int], str],
+    window_start_ms: Optional[int] = None,
+    at_ms: Optional[int] = None,
+    intraday: bool = True,
+) -> List[Dict[str, str]]:
+    """Evaluate every indicator at one candle and return compact records.
+
+    Args:
+        candles: OHLCV columns (``open``, ``high``, ``low``, ``close``,
+            ``volume``) including any warm-up history.
+        interval: Interval label copied into each record.
+        format_time: Converts an epoch-millis timestamp to display text.
+        window_start_ms: Start of the analysed window; earlier candles are
+            only used as warm-up. Defaults to the first candle.
+        at_ms: Evaluate at the last candle at or before this time (e.g. the
+            trade time). Defaults to the last candle.
+        intraday: Anchor VWAP to each day rather than the whole window.
+
+    Returns:
+        List of dicts with ``indicator_name``, ``indicator_value``,
+        ``interval``, ``start_time`` and ``end_time`` keys.
+    """
+    timestamps = candles[TIMESTAMP]
+    if len(timestamps) == 0:
+        return []
+
+    idx = len(timestamps) - 1
+    if at_ms is not None:
+        idx = int(np.searchsorted(timestamps, at_ms, side="right")) - 1
+        if idx < 0:
+            return []
+    window_start_ms = timestamps[0] if window_start_ms is None else window_start_ms
+    first = min(int(np.searchsorted(timestamps, window_start_ms, side="left")), idx)
+
+    o, h, l, c, v = (candles[k] for k in ("open", "high", "low", "close", "volume"))
+    macd_values = macd(c)
+    bands = bollinger(c)
+    window = slice(first, idx + 1)
+    vwap_values = vwap(timestamps[window], h[window], l[window], c[window], v[window], DAY_MS if intraday else None)
+
+    values = [
+        ("SMA(20)", _fmt(sma(c, 20)[idx])),
+        ("SMA(50)", _fmt(sma(c, 50)[idx])),
+        ("EMA(12)", _fmt(ema(c, 12)[idx])),
+        ("EMA(26)", _fmt(ema(c, 26)[idx])),
+        ("RSI(14)", _fmt(rsi(c, 14)[idx], 2)),
+        (
+            "MACD(12,26,9)",
+            f"macd={_fmt(macd_values['macd'][idx])}, signal={_fmt(macd_values['signal'][idx])}, "
+            f"histogram={_fmt(macd_values['histogram'][idx])}",
+        ),
+        (
+            "Bollinger(20,2)",
+            f"upper={_fmt(bands['upper'][idx])}, middle={_fmt(bands['middle'][idx])}, "
+            f"lower={_fmt(bands['lower'][idx])}, percent_b={_fmt(bands['percent_b'][idx], 3)}",
+        ),
+        ("ATR(14)", _fmt(atr(h, l, c, 14)[idx])),
+        ("VWAP", _fmt(vwap_values[-1])),
+        ("Close", _fmt(c[idx])),
+        (
+            "Window range",
+            f"open={_fmt(o[first])}, high={_fmt(np.nanmax(h[window]))}, "
+            f"low={_fmt(np.nanmin(l[window]))}, close={_fmt(c[idx])}, "
+            f"change_pct={_fmt((c[idx] / o[first] - 1.0) * 100.0, 2)}",
+        ),
+    ]
+
+    start_time = format_time(int(timestamps[first]))
+    end_time = format_time(int(timestamps[idx]))
+    return [
+        {
+            "indicator_name": name,
+            "indicator_value": value,
+            "interval": interval,
+            "start_time": start_time,
+            "end_time": end_time,
+        }
+        for name, value in values
+    ]
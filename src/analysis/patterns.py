@@ -0,0 +1,162 @@
+"""Vectorised candlestick pattern detection over OHLCV arrays.
+
+Every pattern is a boolean mask computed with whole-array NumPy operations
+(shifted copies of the open/high/low/close columns), so scanning a
+multi-day 1m series is a single pass regardless of its length. A mask is
+``True`` at the candle that completes the pattern.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.store.candles import Candles, TIMESTAMP
+from .indicators import sma
+
+# Pattern name -> signal direction reported alongside each hit.
+PATTERN_SIGNALS = {
+    "doji": "neutral",
+    "hammer": "bullish",
+    "inverted_hammer": "bullish",
+    "hanging_man": "bearish",
+    "shooting_star": "bearish",
+    "bullish_engulfing": "bullish",
+    "bearish_engulfing": "bearish",
+    "bullish_harami": "bullish",
+    "bearish_harami": "bearish",
+    "piercing_line": "bullish",
+    "dark_cloud_cover": "bearish",
+    "morning_star": "bullish",
+    "evening_star": "bearish",
+    "three_white_soldiers": "bullish",
+    "three_black_crows": "bearish",
+}
+
+# Bars used to decide the prevailing trend and the "typical" body size.
+TREND_BARS = 5
+BODY_AVG_BARS = 10
+
+
+def _shift(values: np.ndarray, k: int) -> np.ndarray:
+    """Return ``values`` delayed by ``k`` bars (NaN-padded)."""
+    out = np.full(len(values), np.nan)
+    if k < len(values):
+        out[k:] = values[: len(values) - k]
+    return out
+
+
+def detect_patterns(candles: Candles) -> Dict[str, np.ndarray]:
+    """Return a boolean mask per pattern name for the whole series."""
+    o = np.asarray(candles["open"], dtype=np.float64)
+    h = np.asarray(candles["high"], dtype=np.float64)
+    l = np.asarray(candles["low"], dtype=np.float64)
+    c = np.asarray(candles["close"], dtype=np.float64)
+
+    body = np.abs(c - o)
+    rng = h - l
+    upper = h - np.maximum(o, c)
+    lower = np.minimum(o, c) - l
+    bull = c > o
+    bear = c < o
+    avg_body = sma(body, BODY_AVG_BARS)
+    long_body = body > avg_body
+    mid = (o + c) / 2.0
+
+    o1, c1, body1, mid1 = _shift(o, 1), _shift(c, 1), _shift(body, 1), _shift(mid, 1)
+    o2, c2, body2, mid2 = _shift(o, 2), _shift(c, 2), _shift(body, 2), _shift(mid, 2)
+    bull1, bear1 = o1 < c1, o1 > c1
+    bull2, bear2 = o2 < c2, o2 > c2
+    long1, long2 = _shift(long_body.astype(float), 1) == 1, _shift(long_body.astype(float), 2) == 1
+
+    with np.errstate(invalid="ignore"):
+        # Trend is judged on the closes *before* the pattern forms.
+        downtrend = _shift(c, 1) < _shift(c, 1 + TREND_BARS)
+        uptrend = _shift(c, 1) > _shift(c, 1 + TREND_BARS)
+
+        small_body = body <= 0.3 * rng
+        hammer_shape = (lower >= 2 * body) & (upper <= 0.25 * rng) & small_body & (rng > 0)
+        inverted_shape = (upper >= 2 * body) & (lower <= 0.25 * rng) & small_body & (rng > 0)
+
+        masks = {
+            "doji": (rng > 0) & (body <= 0.1 * rng),
+            "hammer": hammer_shape & downtrend,
+            "inverted_hammer": inverted_shape & downtrend,
+            "hanging_man": hammer_shape & uptrend,
+            "shooting_star": inverted_shape & uptrend,
+            "bullish_engulfing": bear1 & bull & (o <= c1) & (c >= o1) & (body > body1),
+            "bearish_engulfing": bull1 & bear & (o >= c1) & (c <= o1) & (body > body1),
+            "bullish_harami": bear1 & long1 & bull & (o >= c1) & (c <= o1) & (body < body1),
+            "bearish_harami": bull1 & long1 & bear & (o <= c1) & (c >= o1) & (body < body1),
+            "piercing_line": bear1 & long1 & bull & (o < c1) & (c > mid1) & (c < o1),
+            "dark_cloud_cover": bull1 & long1 & bear & (o > c1) & (c < mid1) & (c > o1),
+            "morning_star": (
+                bear2 & long2 & (body1 <= 0.3 * body2) & (np.maximum(o1, c1) <= c2)
+                & bull & (c > mid2)
+            ),
+            "evening_star": (
+                bull2 & long2 & (body1 <= 0.3 * body2) & (np.minimum(o1, c1) >= c2)
+                & bear & (c < mid2)
+            ),
+            "three_white_soldiers": (
+                bull2 & bull1 & bull & (c1 > c2) & (c > c1)
+                & (o1 > o2) & (o1 < c2) & (o > o1) & (o < c1)
+                & (upper <= 0.3 * body)
+            ),
+            "three_black_crows": (
+                bear2 & bear1 & bear & (c1 < c2) & (c < c1)
+                & (o1 < o2) & (o1 > c2) & (o < o1) & (o > c1)
+                & (lower <= 0.3 * body)
+            ),
+        }
+    return {name: np.asarray(mask, dtype=bool) for name, mask in masks.items()}
+
+
+def pattern_events(
+    candles: Candles,
+    format_time: Callable[[int], str],
+    window_start_ms: Optional[int] = None,
+    at_ms: Optional[int] = None,
+    window_bars: int = 24,
+    max_events: int = 40,
+) -> List[Dict[str, str]]:
+    """Return the patterns that fire near a point in time.
+
+    Args:
+        candles: OHLCV columns (``open``, ``high``, ``low``, ``close``).
+        format_time: Converts an epoch-millis timestamp to display text.
+        window_start_ms: Start of the analysed window; earlier candles only
+            provide trend context and are never reported.
+        at_ms: Centre of the reported window (e.g. the trade time). Defaults
+            to the last candle, in which case only earlier bars are used.
+        window_bars: Bars on each side of ``at_ms`` to report.
+        max_events: Cap on returned events, nearest to ``at_ms`` first.
+
+    Returns:
+        Chronological list of ``{"timestamp", "pattern", "signal"}`` dicts.
+    """
+    timestamps = candles[TIMESTAMP]
+    n = len(timestamps)
+    if n == 0:
+        return []
+
+    centre = n - 1
+    if at_ms is not None:
+        centre = max(int(np.searchsorted(timestamps, at_ms, side="right")) - 1, 0)
+    first = 0 if window_start_ms is None else int(np.searchsorted(timestamps, window_start_ms, side="left"))
+    lo, hi = max(centre - window_bars, first), min(centre + window_bars, n - 1)
+
+    hits = []
+    for name, mask in detect_patterns(candles).items():
+        for i in np.flatnonzero(mask[lo:hi + 1]) + lo:
+            hits.append((abs(int(i) - centre), int(i), name))
+    hits.sort()
+    hits = sorted(hits[:max_events], key=lambda hit: (hit[1], hit[2]))
+
+    return [
+        {
+            "timestamp": format_time(int(timestamps[i])),
+            "pattern": name,
+            "signal": PATTERN_SIGNALS[name],
+        }
+        for _, i, name in hits
+    ]
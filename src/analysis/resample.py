@@ -0,0 +1,82 @@
+"""Local OHLCV resampling.
+
+Builds coarser bars from a finer candle series so a multi-timeframe view
+needs only one upstream fetch. Aggregation is vectorised with
+``ufunc.reduceat`` over runs of equal bucket keys: open is the first open,
+high the max, low the min, close the last close and volume the sum.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.store.candles import Candles, TIMESTAMP
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def bucket_starts(
+    timestamps: np.ndarray,
+    bucket_ms: int,
+    origin_ms: int = 0,
+    within_day: bool = False,
+) -> np.ndarray:
+    """Return the start of the bucket each timestamp falls in.
+
+    Buckets are aligned to ``origin_ms`` (an offset from the epoch, or from
+    midnight when ``within_day`` is set). With ``within_day`` a bucket never
+    spans midnight, which keeps stock bars inside their trading session.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not within_day or bucket_ms >= DAY_MS:
+        return (timestamps - origin_ms) // bucket_ms * bucket_ms + origin_ms
+    day = timestamps // DAY_MS * DAY_MS
+    starts = day + origin_ms + (timestamps - day - origin_ms) // bucket_ms * bucket_ms
+    return np.maximum(starts, day)
+
+
+def resample(
+    candles: Candles,
+    bucket_ms: int,
+    origin_ms: int = 0,
+    within_day: bool = False,
+    session: Optional[Tuple[int, int]] = None,
+) -> Candles:
+    """Aggregate ``candles`` into ``bucket_ms`` bars.
+
+    Args:
+        candles: Sorted OHLCV columns (``open``, ``high``, ``low``, ``close``,
+            ``volume``).
+        bucket_ms: Target bar width in milliseconds.
+        origin_ms: Bucket alignment offset (see :func:`bucket_starts`).
+        within_day: Never let a bar span midnight.
+        session: Optional ``(start, end)`` offsets from midnight; only
+            candles with ``start <= time of day < end`` are aggregated (e.g.
+            the regular stock session for daily bars).
+
+    Returns:
+        Candles keyed by bucket start time.
+    """
+    timestamps = np.asarray(candles[TIMESTAMP], dtype=np.int64)
+    columns = {k: np.asarray(candles[k], dtype=np.float64) for k in ("open", "high", "low", "close", "volume")}
+    if session is not None:
+        time_of_day = timestamps % DAY_MS
+        keep = (time_of_day >= session[0]) & (time_of_day < session[1])
+        timestamps = timestamps[keep]
+        columns = {k: v[keep] for k, v in columns.items()}
+
+    if len(timestamps) == 0:
+        return {TIMESTAMP: timestamps, **{k: v[:0] for k, v in columns.items()}}
+
+    keys = bucket_starts(timestamps, bucket_ms, origin_ms, within_day)
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+    return {
+        TIMESTAMP: keys[starts],
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "volume": np.add.reduceat(columns["volume"], starts),
+    }
+
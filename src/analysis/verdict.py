@@ -0,0 +1,145 @@
+"""Deterministic Good/Bad trade verdicts.
+
+A trade is judged primarily by what the market did afterwards: the
+side-adjusted return from the entry price to the close ``horizon_ms`` later
+(or to the last candle available, if the horizon has not elapsed yet). A
+buy followed by a rise, or a sell followed by a fall, is "Good".
+
+When no candle exists after the trade (a trade made just now), the verdict
+falls back to the technical picture at entry: RSI, MACD histogram, close
+versus SMA(20) and Bollinger %B each vote for or against the trade's side.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.store.candles import Candles, TIMESTAMP
+from .indicators import bollinger, macd, rsi, sma
+
+HOUR_MS = 60 * 60 * 1000
+
+# Horizons reported as forward returns.
+FORWARD_HORIZONS = (("1h", HOUR_MS), ("4h", 4 * HOUR_MS), ("24h", 24 * HOUR_MS))
+
+
+def entry_index(candles: Candles, at_ms: int) -> int:
+    """Index of the last candle that opened at or before ``at_ms`` (-1 if none)."""
+    return int(np.searchsorted(candles[TIMESTAMP], at_ms, side="right")) - 1
+
+
+def forward_returns(candles: Candles, at_ms: int, side: str = "buy") -> List[Dict[str, Any]]:
+    """Side-adjusted percentage returns from the entry close to each horizon.
+
+    Horizons that reach beyond the data are measured to the last candle and
+    flagged ``complete=False``.
+    """
+    idx = entry_index(candles, at_ms)
+    timestamps, close = candles[TIMESTAMP], candles["close"]
+    if idx < 0 or idx >= len(timestamps) - 1:
+        return []
+    sign = -1.0 if side == "sell" else 1.0
+    entry = float(close[idx])
+    results = []
+    for label, horizon in FORWARD_HORIZONS:
+        target = min(entry_index(candles, int(timestamps[idx]) + horizon), len(timestamps) - 1)
+        results.append(
+            {
+                "horizon": label,
+                "return_pct": sign * (float(close[target]) / entry - 1.0) * 100.0,
+                "end_ms": int(timestamps[target]),
+                # Market closures leave gaps; the horizon is complete once any
+                # later data exists.
+                "complete": int(timestamps[-1]) >= int(timestamps[idx]) + horizon,
+            }
+        )
+    return results
+
+
+def excursions(candles: Candles, at_ms: int, horizon_ms: int, side: str = "buy") -> Optional[Tuple[float, float]]:
+    """Best and worst side-adjusted move (in %) within ``horizon_ms`` after entry."""
+    idx = entry_index(candles, at_ms)
+    timestamps = candles[TIMESTAMP]
+    if idx < 0 or idx >= len(timestamps) - 1:
+        return None
+    end = entry_index(candles, int(timestamps[idx]) + horizon_ms) + 1
+    entry = float(candles["close"][idx])
+    high = float(np.nanmax(candles["high"][idx + 1:end])) / entry - 1.0
+    low = float(np.nanmin(candles["low"][idx + 1:end])) / entry - 1.0
+    if side == "sell":
+        return -low * 100.0, -high * 100.0
+    return high * 100.0, low * 100.0
+
+
+def technical_votes(candles: Candles, at_ms: int, side: str = "buy") -> Dict[str, int]:
+    """+1 / -1 / 0 per indicator for whether it supported the trade at entry."""
+    idx = entry_index(candles, at_ms)
+    if idx < 0:
+        return {}
+    close = np.asarray(candles["close"], dtype=np.float64)
+    sign = -1 if side == "sell" else 1
+    rsi_value = rsi(close, 14)[idx]
+    histogram = macd(close)["histogram"][idx]
+    sma_value = sma(close, 20)[idx]
+    percent_b = bollinger(close)["percent_b"][idx]
+
+    def vote(bullish: bool, bearish: bool) -> int:
+        return sign * (1 if bullish else -1 if bearish else 0)
+
+    with np.errstate(invalid="ignore"):
+        return {
+            "RSI(14)": vote(rsi_value < 30, rsi_value > 70),
+            "MACD histogram": vote(histogram > 0, histogram < 0),
+            "Close vs SMA(20)": vote(close[idx] > sma_value, close[idx] < sma_value),
+            "Bollinger %B": vote(percent_b < 0, percent_b > 1),
+        }
+
+
+def decide(
+    candles: Candles,
+    at_ms: int,
+    side: str = "buy",
+    horizon_ms: int = 24 * HOUR_MS,
+    format_time: Callable[[int], str] = str,
+) -> Dict[str, Any]:
+    """Return the verdict and the facts it was based on.
+
+    Returns:
+        Dict with ``trade_decision`` ("Good"/"Bad"), ``basis``
+        ("forward_return" or "technical"), ``entry_price``,
+        ``entry_time``, ``forward_returns``, ``excursion_pct`` and
+        ``technical_votes``.
+    """
+    idx = entry_index(candles, at_ms)
+    if idx < 0:
+        raise ValueError("No price data at or before the trade time")
+
+    returns = forward_returns(candles, at_ms, side)
+    votes = technical_votes(candles, at_ms, side)
+    excursion = excursions(candles, at_ms, horizon_ms, side)
+
+    if returns:
+        target = min(entry_index(candles, int(candles[TIMESTAMP][idx]) + horizon_ms), len(candles[TIMESTAMP]) - 1)
+        outcome = float(candles["close"][target]) / float(candles["close"][idx]) - 1.0
+        outcome *= -1.0 if side == "sell" else 1.0
+        decision, basis = ("Good" if outcome > 0 else "Bad"), "forward_return"
+    else:
+        decision, basis = ("Good" if sum(votes.values()) >= 0 else "Bad"), "technical"
+
+    return {
+        "trade_decision": decision,
+        "basis": basis,
+        "entry_price": float(candles["close"][idx]),
+        "entry_time": format_time(int(candles[TIMESTAMP][idx])),
+        "forward_returns": [
+            {
+                "horizon": r["horizon"],
+                "return_pct": r["return_pct"],
+                "end_time": format_time(r["end_ms"]),
+                "complete": r["complete"],
+            }
+            for r in returns
+        ],
+        "excursion_pct": None if excursion is None else {"best": excursion[0], "worst": excursion[1]},
+        "technical_votes": votes,
+    }
@@ -0,0 +1,262 @@
+"""Batch trade analysis.
+
+Reads trades from a CSV or JSONL file, runs each one through the matching
+analysis agent with bounded concurrency and streams one JSONL result line
+per trade as soon as it finishes (in completion order, tagged with the
+input ``index``). A failing trade is reported as an ``"error"`` line and
+never aborts the run.
+
+When agent checkpoints are enabled (``DATABASE_URL``, see
+:mod:`src.store.checkpoints`) each analysis runs on a thread keyed by the
+trade, so re-running a batch after a crash or timeout resumes every
+unfinished analysis from its last completed step.
+
+With ``--mode fast`` each trade goes through the deterministic fast path
+(:mod:`src.agent.fast_path`): one data fetch and a single LLM call for the
+narrative instead of a multi-turn agent loop.
+
+``--metrics`` writes the run's tool, node, LLM, upstream and cache metrics
+in the Prometheus text format once the batch is done; ``SPAN_LOG`` enables
+structured span logs (see :mod:`src.utils.tracing`).
+
+Usage:
+    python -m src.batch trades.csv --output results.jsonl --concurrency 16
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Set, TextIO, Tuple, Union
+
+from langchain_core.messages import HumanMessage
+
+from src.config import config
+
+AGENT_CHOICES = ("auto", "stock", "coin")
+MODE_CHOICES = ("agent", "fast")
+
+# Checkpoint threads with a run in flight in this process.
+_active_threads: Set[str] = set()
+
+
+def load_trades(path: str) -> Iterator[Union[Dict[str, Any], ValueError]]:
+    """Yield trade dicts from a ``.csv`` file or a JSONL file (one object per line).
+
+    A JSONL line that is not a JSON object is yielded as a ``ValueError`` in
+    its place, so the caller can report it and carry on with the rest.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(handle):
+                yield {key.strip(): value.strip() for key, value in row.items() if key and value}
+            return
+        for line_no, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                trade = json.loads(line)
+            except ValueError as exc:
+                yield ValueError(f"{path}:{line_no}: invalid JSON: {exc}")
+                continue
+            if not isinstance(trade, dict):
+                yield ValueError(f"{path}:{line_no}: expected a JSON object per line")
+                continue
+            yield trade
+
+
+def select_agent(trade: Dict[str, Any], agent: str):
+    """Return the agent for ``trade``; ``auto`` picks by trading_stock/trading_coin."""
+    if agent == "auto":
+        if "trading_stock" in trade:
+            agent = "stock"
+        elif "trading_coin" in trade:
+            agent = "coin"
+        else:
+            raise ValueError("Trade has neither 'trading_stock' nor 'trading_coin'; pass --agent")
+    if agent == "stock":
+        from src.agent import stock_analysis_agent
+        return stock_analysis_agent
+    from src.agent import trade_analysis_agent
+    return trade_analysis_agent
+
+
+def final_output(result: Dict[str, Any]) -> Any:
+    """Prefer the agent's structured response, else the last message content."""
+    structured = result.get("structured_response")
+    if structured is not None:
+        return structured.model_dump() if hasattr(structured, "model_dump") else structured
+    messages = result.get("messages") or []
+    return messages[-1].content if messages else None
+
+
+def thread_id(trade: Dict[str, Any], runnable: Any) -> str:
+    """Checkpoint thread of ``trade``'s analysis by ``runnable``."""
+    digest = hashlib.sha256(json.dumps(trade, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{runnable.name}:{digest[:32]}"
+
+
+@asynccontextmanager
+async def analysis_run(trade: Dict[str, Any], runnable: Any) -> AsyncIterator[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+    """Yield the ``(input, config)`` to run ``runnable`` on ``trade`` with.
+
+    The input is ``None`` when the trade's thread holds an unfinished run,
+    which LangGraph then resumes from its last checkpoint; a finished run
+    is discarded and the analysis starts over. The thread is deleted once
+    the run succeeds, as checkpoints only matter for resuming.
+    """
+    inputs: Optional[Dict[str, Any]] = {
+        "messages": [HumanMessage(content=f"Analyze the trade details: {trade}")]
+    }
+    thread = thread_id(trade, runnable)
+    checkpointer = runnable.checkpointer
+    if thread in _active_threads:
+        # The same trade is already being analysed; never share its thread.
+        thread = f"{thread}:{uuid.uuid4().hex[:8]}"
+    run_config = {"configurable": {"thread_id": thread}}
+    if not checkpointer:
+        yield inputs, run_config
+        return
+    _active_threads.add(thread)
+    try:
+        state = await runnable.aget_state(run_config)
+        if state.next:
+            inputs = None
+        elif state.values:
+            await checkpointer.adelete_thread(thread)
+        yield inputs, run_config
+        await checkpointer.adelete_thread(thread)
+    finally:
+        _active_threads.discard(thread)
+
+
+async def analyse_trade(
+    trade: Dict[str, Any],
+    agent: str = "auto",
+    timeout: Optional[float] = None,
+    mode: str = "agent",
+) -> Any:
+    """Run one trade through its agent (or the fast path) and return the final output."""
+    if mode == "fast":
+        from src.agent import afast_trade_analysis
+        return await asyncio.wait_for(afast_trade_analysis(trade, agent), timeout)
+    runnable = select_agent(trade, agent)
+
+    async def run() -> Dict[str, Any]:
+        async with analysis_run(trade, runnable) as (inputs, run_config):
+            return await runnable.ainvoke(inputs, run_config)
+
+    return final_output(await asyncio.wait_for(run(), timeout))
+
+
+def describe_error(exc: BaseException) -> str:
+    """One-line description of a failed analysis for result records."""
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+
+
+async def run_batch(
+    trades: Iterator[Union[Dict[str, Any], Exception]],
+    output: TextIO,
+    concurrency: int = 8,
+    agent: str = "auto",
+    timeout: Optional[float] = None,
+    mode: str = "agent",
+) -> Tuple[int, int]:
+    """Analyse ``trades`` with at most ``concurrency`` in flight.
+
+    Trades are pulled lazily from the iterator through a bounded queue, so
+    memory stays flat for large inputs. Each result is written and flushed
+    to ``output`` as soon as it completes. An exception in place of a trade
+    (see :func:`load_trades`) is written as an ``"error"`` record.
+
+    Returns:
+        Tuple[int, int]: Number of succeeded and failed trades.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    counts = {"ok": 0, "error": 0}
+
+    async def produce() -> None:
+        # Items yielded so far, so a failure gets the index after them.
+        index = 0
+        try:
+            for trade in trades:
+                await queue.put((index, trade))
+                index += 1
+        except Exception as exc:
+            # The input could not be read any further; report it like a
+            # failed trade and finish the trades already queued.
+            await queue.put((index, exc))
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            index, trade = item
+            started = time.perf_counter()
+            if isinstance(trade, Exception):
+                # A line of the input that is not a trade.
+                record: Dict[str, Any] = {"index": index, "status": "error", "error": describe_error(trade)}
+            else:
+                record = {"index": index, "trade": trade}
+                try:
+                    record["result"] = await analyse_trade(trade, agent, timeout, mode)
+                    record["status"] = "ok"
+                except Exception as exc:
+                    record["status"] = "error"
+                    record["error"] = describe_error(exc)
+            record["elapsed_s"] = round(time.perf_counter() - started, 3)
+            counts[record["status"]] += 1
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            output.flush()
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    return counts["ok"], counts["error"]
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse a batch of trades and stream JSONL results.")
+    parser.add_argument("input", help="Trades as .csv (header row) or .jsonl (one object per line)")
+    parser.add_argument("--output", "-o", help="Result JSONL file (default: stdout)")
+    parser.add_argument("--concurrency", "-c", type=int, default=config["BATCH_CONCURRENCY"])
+    parser.add_argument("--agent", choices=AGENT_CHOICES, default="auto")
+    parser.add_argument("--mode", choices=MODE_CHOICES, default=config["ANALYSIS_MODE"])
+    parser.add_argument("--timeout", type=float, default=None, help="Per-trade timeout in seconds")
+    parser.add_argument("--metrics", help="Write Prometheus text metrics to this file when done")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    # Imported here so that importing src.batch stays cheap.
+    from src.utils import metrics
+    from src.utils.tracing import configure_span_log
+
+    configure_span_log(config["SPAN_LOG"])
+
+    started = time.perf_counter()
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        ok, failed = asyncio.run(
+            run_batch(load_trades(args.input), output, args.concurrency, args.agent, args.timeout, args.mode)
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as handle:
+                handle.write(metrics.render())
+    print(
+        f"Analysed {ok + failed} trades ({ok} ok, {failed} failed) in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
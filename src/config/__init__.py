@@ -1,3 +1,9 @@
 from .constant import config
-from .llm import llm
-from .db import *
+from src.utils.lazy import lazy_exports
+
+# Building the chat model and the database engine is deferred until used.
+__all__ = ["config"] + lazy_exports(__name__, {
+    "llm": ".llm",
+    "Base": ".db",
+    "get_engine": ".db",
+})
@@ -16,6 +16,28 @@ config = {
    "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
    "OPENAI_MODEL_ID": os.getenv("OPENAI_MODEL_ID"),
    "DATABASE_URL": os.getenv("DATABASE_URL"),
+   "LLM_CACHE_TTL_SECONDS": float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+   "LLM_CACHE_MAX_ENTRIES": int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+   "CHECKPOINTS_ENABLED": os.getenv("CHECKPOINTS_ENABLED", "true").lower() in ("1", "true", "yes"),
+   "CHECKPOINT_ZSTD_LEVEL": int(os.getenv("CHECKPOINT_ZSTD_LEVEL", "3")),
+   "CANDLE_STORE_DIR": os.getenv("CANDLE_STORE_DIR", "./data/candles"),
+   "SYMBOL_INDEX_PATH": os.getenv("SYMBOL_INDEX_PATH", "./data/listing_status.csv"),
+   "SYMBOL_INDEX_TTL_SECONDS": float(os.getenv("SYMBOL_INDEX_TTL_SECONDS", "86400")),
+   "NEWS_DB_PATH": os.getenv("NEWS_DB_PATH", "./data/news.db"),
+   "NEWS_FEEDS": [feed.strip() for feed in os.getenv(
+      "NEWS_FEEDS",
+      "https://www.coindesk.com/arc/outboundfeeds/rss/,https://cointelegraph.com/rss,https://decrypt.co/feed",
+   ).split(",") if feed.strip()],
+   "NEWS_REFRESH_SECONDS": float(os.getenv("NEWS_REFRESH_SECONDS", "900")),
+   "RESPONSE_CACHE_TTL_SECONDS": {
+      "OVERVIEW": float(os.getenv("OVERVIEW_CACHE_TTL_SECONDS", "604800")),
+      "TOP_GAINERS_LOSERS": float(os.getenv("TOP_GAINERS_LOSERS_CACHE_TTL_SECONDS", "300")),
+      "GLOBAL_QUOTE": float(os.getenv("GLOBAL_QUOTE_CACHE_TTL_SECONDS", "15")),
+   },
+   "RESPONSE_CACHE_STALE_RATIO": float(os.getenv("RESPONSE_CACHE_STALE_RATIO", "3")),
+   "RESPONSE_CACHE_MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+   "TOOL_OUTPUT_TOKEN_BUDGET": int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "2000")),
+   "CONTEXT_TOKEN_BUDGET": int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000")),
    "TRADE_ANALYSIS_PROMPT":  """
       You are a highly skilled trading analysis agent that helps users evaluate their trades on various cryptocurrencies. Your goal is to analyze the user’s trades based on:
 
@@ -35,6 +57,44 @@ config = {
          * `end_date: str`
          * `interval: str` (e.g., 1m, 5m, 1h, 1d)
 
+      2. **get\_coin\_price\_multi** – Fetch historical price data for a coin at several intervals in one call (the finest interval is fetched once and coarser bars are built locally).
+         **Parameters:**
+         * `coin: str` (e.g., "BTCUSDT")
+         * `start_date: str`
+         * `end_date: str`
+         * `intervals: list[str]` (optional, defaults to ["1m", "5m", "1h", "1d"])
+
+      3. **get\_coin\_indicators** – Compute technical indicators (SMA, EMA, RSI, MACD, Bollinger Bands, ATR, VWAP) for a coin.
+         **Parameters:**
+         * `coin: str` (e.g., "BTCUSDT")
+         * `start_date: str`
+         * `end_date: str`
+         * `interval: str` (e.g., 1m, 5m, 1h, 1d)
+         * `at_time: str` (optional, e.g. the trade time; defaults to the end of the window)
+
+      4. **get\_coin\_patterns** – Detect candlestick patterns (doji, hammer, engulfing, morning/evening star, etc.) near the trade time.
+         **Parameters:**
+         * `coin: str` (e.g., "BTCUSDT")
+         * `start_date: str`
+         * `end_date: str`
+         * `interval: str` (e.g., 1m, 5m, 1h, 1d)
+         * `at_time: str` (optional, e.g. the trade time; defaults to the end of the window)
+
+      5. **get\_coin\_news** – Fetch the most relevant news articles about a coin published in a date range.
+         **Parameters:**
+         * `coin: str` (e.g., "BTCUSDT" or "bitcoin")
+         * `start_date: str`
+         * `end_date: str`
+         * `query: str` (optional, words the articles must mention, e.g. "ETF approval")
+
+      6. **get\_coin\_quotes** – Fetch the latest price and 24h statistics for several coins in one call (e.g. every coin the user traded, or to compare a coin with BTC and ETH); use it instead of fetching price history just for the current price.
+         **Parameters:**
+         * `coins: list[str]` (e.g., ["BTCUSDT", "ETH"])
+
+      7. **recall\_tool\_output** – Return the full output of an earlier tool call. Tool results you have already read are shortened to a digest (`{"ref": ..., "digest": ...}`); only recall one when the digest lacks a detail you need.
+         **Parameters:**
+         * `ref: str` (the digest's `ref`)
+
       ---
 
       **Required Process**
@@ -45,12 +105,16 @@ config = {
 
       2. **Data collection:**
 
-         * Use `get_coin_price` to fetch price history for each traded coin at multiple intervals (1m, 5m, 1h, 1d).
+         * Use `get_coin_price_multi` to fetch price history for each traded coin at multiple intervals (1m, 5m, 1h, 1d) in a single call; use `get_coin_price` only when you need one extra interval.
+         * Use `get_coin_indicators` to compute technical indicators at the trade time for the same intervals.
+         * Use `get_coin_patterns` to detect candlestick patterns around the trade time for the same intervals.
+         * Use `get_coin_news` to find news about the coin in the same 2–4 day window.
+         * Use `get_coin_quotes` once for all traded coins when the current price matters (e.g. to judge an open position).
 
       3. **Analysis:**
 
-         * Identify and interpret candlestick patterns in each interval.
-         * Calculate and interpret technical indicators relevant to the trades.
+         * Interpret the candlestick patterns returned by `get_coin_patterns` for each interval.
+         * Interpret the technical indicators returned by `get_coin_indicators`; do not calculate them by hand from raw candles.
          * Correlate price movements and patterns with relevant news events.
 
       4. **Decision-making:**
@@ -90,6 +154,25 @@ config = {
       ]
    """,
    "ALPHA_VANTAGE": os.getenv("ALPHA_VANTAGE"),
+   "ALPHA_VANTAGE_URL": os.getenv("ALPHA_VANTAGE_URL", "https://www.alphavantage.co/query"),
+   "BINANCE_API_URL": os.getenv("BINANCE_API_URL", "https://api.binance.com/api/v3"),
+   "HTTP_TIMEOUT": float(os.getenv("HTTP_TIMEOUT", "20")),
+   "HTTP_MAX_RETRIES": int(os.getenv("HTTP_MAX_RETRIES", "3")),
+   "HTTP_POOL_SIZE": int(os.getenv("HTTP_POOL_SIZE", "32")),
+   "BATCH_CONCURRENCY": int(os.getenv("BATCH_CONCURRENCY", "8")),
+   "ANALYSIS_MODE": os.getenv("ANALYSIS_MODE", "agent"),
+   "HOST": os.getenv("HOST", "127.0.0.1"),
+   "PORT": int(os.getenv("PORT", "8000")),
+   "SERVICE_WORKERS": int(os.getenv("SERVICE_WORKERS", "4")),
+   "SERVICE_QUEUE_SIZE": int(os.getenv("SERVICE_QUEUE_SIZE", "32")),
+   "SERVICE_JOB_TIMEOUT": float(os.getenv("SERVICE_JOB_TIMEOUT", "600")),
+   "SERVICE_JOB_TTL_SECONDS": float(os.getenv("SERVICE_JOB_TTL_SECONDS", "3600")),
+   "METRICS_ENABLED": os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes"),
+   "SPAN_LOG": os.getenv("SPAN_LOG", ""),
+   "RATE_LIMITS_PER_MINUTE": {
+      "alphavantage": float(os.getenv("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", "5")),
+      "binance": float(os.getenv("BINANCE_REQUESTS_PER_MINUTE", "1200")),
+   },
    "STOCK_PROMPTS":{
       "STOCK_TECHNICAL_ANALYSIS":"""
          You are a stock trading analysis agent that helps users evaluate their trades on various stocks. Your goal is to analyze the user’s trades based on:
@@ -111,14 +194,47 @@ config = {
             * `function_type: str` (e.g., "TIME_SERIES_DAILY")
             * `interval: str` (e.g., "5min")
 
-         2. **get\_stock\_quote** – Fetch real-time quote data for a specific stock.
+         2. **get\_stock\_price\_multi** – Fetch historical price data for a stock at several intervals in one call (the finest interval is fetched once and coarser bars are built locally).
+            **Parameters:**
+            * `stock_symbol: str` (e.g., "AAPL", "MSFT")
+            * `start_date: str`
+            * `end_date: str`
+            * `intervals: list[str]` (optional, defaults to ["1min", "5min", "60min", "daily"])
+
+         3. **get\_stock\_indicators** – Compute technical indicators (SMA, EMA, RSI, MACD, Bollinger Bands, ATR, VWAP) for a specific stock.
+            **Parameters:**
+            * `stock_symbol: str` (e.g., "AAPL", "MSFT")
+            * `start_date: str`
+            * `end_date: str`
+            * `function_type: str` (e.g., "TIME_SERIES_DAILY")
+            * `interval: str` (e.g., "5min")
+            * `at_time: str` (optional, e.g. the trade time; defaults to the end of the window)
+
+         4. **get\_stock\_patterns** – Detect candlestick patterns (doji, hammer, engulfing, morning/evening star, etc.) near the trade time.
+            **Parameters:**
+            * `stock_symbol: str` (e.g., "AAPL", "MSFT")
+            * `start_date: str`
+            * `end_date: str`
+            * `function_type: str` (e.g., "TIME_SERIES_DAILY")
+            * `interval: str` (e.g., "5min")
+            * `at_time: str` (optional, e.g. the trade time; defaults to the end of the window)
+
+         5. **get\_stock\_quote** – Fetch real-time quote data for a specific stock.
             **Parameters:**
             * `stock_symbol: str` (e.g., "AAPL", "MSFT")
 
-         3. **search\_stocks** – Search for stock symbols and company information using keywords.
+         6. **get\_stock\_quotes** – Fetch quotes for several stocks in one call (e.g. a portfolio or watchlist); use it instead of repeated `get_stock_quote` calls.
+            **Parameters:**
+            * `stock_symbols: list[str]` (e.g., ["AAPL", "MSFT"])
+
+         7. **search\_stocks** – Search for stock symbols and company information using keywords.
             **Parameters:**
             * `keywords: str` (e.g., "Apple", "Microsoft")
 
+         8. **recall\_tool\_output** – Return the full output of an earlier tool call. Tool results you have already read are shortened to a digest (`{"ref": ..., "digest": ...}`); only recall one when the digest lacks a detail you need.
+            **Parameters:**
+            * `ref: str` (the digest's `ref`)
+
          ---
 
          **Required Process**
@@ -129,12 +245,14 @@ config = {
 
          2. **Data collection:**
 
-            * Use `get_stock_price` to fetch price history for each traded stock at multiple intervals (1m, 5m, 1h, 1d).
+            * Use `get_stock_price_multi` to fetch price history for each traded stock at multiple intervals (1m, 5m, 1h, 1d) in a single call; use `get_stock_price` only when you need a different series (e.g. weekly or adjusted data).
+            * Use `get_stock_indicators` to compute technical indicators at the trade time for the same intervals.
+            * Use `get_stock_patterns` to detect candlestick patterns around the trade time for the same intervals.
 
          3. **Analysis:**
 
-            * Identify and interpret candlestick patterns in each interval.
-            * Calculate and interpret technical indicators relevant to the trades.
+            * Interpret the candlestick patterns returned by `get_stock_patterns` for each interval.
+            * Interpret the technical indicators returned by `get_stock_indicators`; do not calculate them by hand from raw candles.
             * Correlate price movements and patterns with relevant news events.
 
          4. **Decision-making:**
@@ -0,0 +1,54 @@
+"""Database engine shared by the persistent stores.
+
+The engine is created lazily from ``DATABASE_URL`` so importing the config
+package never opens a connection. Tables register on :class:`Base` and are
+created by the store that owns them on first use.
+"""
+
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase
+
+from .constant import config
+
+__all__ = ["Base", "get_engine"]
+
+
+class Base(DeclarativeBase):
+    """Declarative base for every table persisted in ``DATABASE_URL``."""
+
+
+_engine: Optional[Engine] = None
+_engine_guard = threading.Lock()
+
+
+def _tune_sqlite(dbapi_connection, _record) -> None:
+    # WAL lets readers proceed while a writer commits; NORMAL sync is safe
+    # with WAL and avoids an fsync per transaction.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine for ``DATABASE_URL``.
+
+    Raises:
+        ValueError: If ``DATABASE_URL`` is not configured.
+    """
+    global _engine
+    with _engine_guard:
+        if _engine is None:
+            url = config["DATABASE_URL"]
+            if not url:
+                raise ValueError("DATABASE_URL is not configured")
+            if url.startswith("sqlite"):
+                _engine = create_engine(url, connect_args={"check_same_thread": False})
+                event.listen(_engine, "connect", _tune_sqlite)
+            else:
+                _engine = create_engine(url, pool_pre_ping=True)
+        return _engine
@@ -1,9 +1,11 @@
 from langchain_openai import ChatOpenAI
 from .constant import config
+from src.store.llm_cache import get_llm_cache
 
 llm = ChatOpenAI(
     model=config.get("OPENAI_MODEL_ID"),
     temperature=0.4,
     api_key=config["OPENAI_API_KEY"],
     max_tokens=10000,
+    cache=get_llm_cache(),
 )
@@ -0,0 +1,7 @@
+from src.utils.lazy import lazy_exports
+
+__all__ = lazy_exports(__name__, {
+    "app": ".api",
+    "AnalysisPool": ".pool",
+    "QueueFullError": ".pool",
+})
@@ -0,0 +1,170 @@
+"""HTTP API for the trade analysis agents.
+
+A resident service: both agents are compiled once at startup and every
+analysis runs on a fixed pool of workers fed by a bounded queue (see
+:mod:`src.service.pool`). When the queue is full, requests are rejected
+with ``429 Too Many Requests`` and a ``Retry-After`` header instead of
+piling up. ``GET /queue`` reports the queue depth for load balancers and
+autoscalers.
+
+Endpoints:
+
+* ``POST /analyze/{market}/stream`` – stream progress as Server-Sent Events
+  (``queued``, then the events of :mod:`src.service.events`)
+* ``POST /analyze/{market}`` – wait for and return the final result
+* ``POST /jobs/{market}`` – queue a job and return its id (202)
+* ``GET /jobs/{job_id}`` – status and, once finished, result of a job
+* ``GET /queue`` / ``GET /health`` – queue statistics
+* ``GET /metrics`` – tool, node, LLM, upstream and cache metrics in the
+  Prometheus text format (see :mod:`src.utils.metrics`)
+
+``market`` is ``stock`` or ``coin``. ``mode=fast`` selects the
+deterministic fast path, which has no intermediate steps to stream.
+
+Usage:
+    python -m src.service.api
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Literal
+
+from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from src.batch import MODE_CHOICES, select_agent
+from src.config import config
+from src.utils import metrics
+from src.utils.tracing import configure_span_log
+from .events import jsonable, sse
+from .pool import AnalysisPool, Job, QueueFullError
+
+Market = Literal["stock", "coin"]
+Mode = Literal[MODE_CHOICES]
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx-style proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+TRADE_EXAMPLE = {
+    "trading_stock": "AAPL",
+    "trading_amount": "500 $",
+    "trading_time": "9th April 2025, 19:00",
+    "trade_type": "buy",
+}
+
+pool = AnalysisPool(
+    workers=config["SERVICE_WORKERS"],
+    queue_size=config["SERVICE_QUEUE_SIZE"],
+    timeout=config["SERVICE_JOB_TIMEOUT"] or None,
+    result_ttl=config["SERVICE_JOB_TTL_SECONDS"],
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import and compile both agent graphs before accepting traffic.
+    for market in ("stock", "coin"):
+        select_agent({}, market)
+    await pool.start()
+    try:
+        yield
+    finally:
+        await pool.stop()
+
+
+app = FastAPI(title="Trading analysis agents", lifespan=lifespan)
+
+
+@app.exception_handler(QueueFullError)
+async def queue_full(request: Request, exc: QueueFullError) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), **pool.stats()},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    return {"status": "ok", **pool.stats()}
+
+
+@app.get("/queue")
+async def queue() -> Dict[str, Any]:
+    return pool.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+async def _stream(job: Job) -> AsyncIterator[str]:
+    yield sse("queued", {"job_id": job.id, "queue_depth": pool.depth})
+    try:
+        async for name, data in pool.events(job):
+            yield sse(name, data)
+    finally:
+        # The client went away; do not keep a worker busy for nobody.
+        pool.cancel(job)
+
+
+@app.post("/analyze/{market}/stream")
+async def analyze_stream(
+    market: Market,
+    trade: Dict[str, Any] = Body(..., examples=[TRADE_EXAMPLE]),
+    mode: Mode = config["ANALYSIS_MODE"],
+) -> StreamingResponse:
+    """Stream the analysis of ``trade`` as Server-Sent Events."""
+    job = pool.submit(trade, market, mode, stream=True)
+    return StreamingResponse(_stream(job), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/analyze/{market}")
+async def analyze(
+    market: Market,
+    trade: Dict[str, Any] = Body(..., examples=[TRADE_EXAMPLE]),
+    mode: Mode = config["ANALYSIS_MODE"],
+) -> Dict[str, Any]:
+    """Analyse ``trade`` and return the final structured result."""
+    job = pool.submit(trade, market, mode)
+    try:
+        await job.done.wait()
+    finally:
+        pool.cancel(job)
+    if job.status != "ok":
+        raise HTTPException(status_code=400 if isinstance(job.exception, ValueError) else 500, detail=job.error)
+    return jsonable(job.view())
+
+
+@app.post("/jobs/{market}", status_code=202)
+async def submit_job(
+    market: Market,
+    trade: Dict[str, Any] = Body(..., examples=[TRADE_EXAMPLE]),
+    mode: Mode = config["ANALYSIS_MODE"],
+) -> Dict[str, Any]:
+    """Queue ``trade`` for analysis; poll ``GET /jobs/{job_id}`` for the result."""
+    job = pool.submit(trade, market, mode)
+    return {**job.view(), "queue_depth": pool.depth}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    job = pool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job {job_id!r}")
+    return jsonable(job.view())
+
+
+def main() -> None:
+    import uvicorn
+
+    configure_span_log(config["SPAN_LOG"])
+    # A single process owns the queue; scale out with more nodes, not workers.
+    uvicorn.run(app, host=config["HOST"], port=config["PORT"])
+
+
+if __name__ == "__main__":
+    main()
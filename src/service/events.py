@@ -0,0 +1,87 @@
+"""Analysis progress events.
+
+Translates LangGraph's ``astream_events`` (v2) into the small event
+vocabulary the API streams to clients:
+
+* ``start`` – the analysis started running
+* ``step`` – a graph node (``agent``/``tools``) started
+* ``tool_start`` / ``tool_end`` – a tool call and its output
+* ``token`` – a partial token of the model's text response
+* ``result`` – the final structured result (same shape as ``src.batch``)
+* ``error`` – the run failed; no events follow it
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from src.batch import analyse_trade, analysis_run, final_output, select_agent
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def jsonable(value: Any) -> Any:
+    """Best-effort conversion of event payloads to JSON-serialisable data."""
+    if isinstance(value, BaseMessage):
+        return {"type": value.type, "content": value.content}
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {str(key): jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(jsonable(data), ensure_ascii=False)}\n\n"
+
+
+def _translate(event: Dict[str, Any]) -> Optional[Event]:
+    """Map an ``astream_events`` (v2) event onto an (name, data) pair."""
+    kind, name = event["event"], event.get("name")
+    data, metadata = event.get("data", {}), event.get("metadata", {})
+    if kind == "on_chat_model_stream":
+        content = data["chunk"].content
+        # Tool-call and structured-response chunks carry no text content.
+        return ("token", {"content": content}) if content else None
+    if kind == "on_tool_start":
+        return "tool_start", {"tool": name, "input": data.get("input")}
+    if kind == "on_tool_end":
+        output = data.get("output")
+        return "tool_end", {"tool": name, "output": getattr(output, "content", output)}
+    if kind == "on_chain_start" and name and name == metadata.get("langgraph_node"):
+        return "step", {"node": name, "step": metadata.get("langgraph_step")}
+    if kind == "on_chain_end" and not event.get("parent_ids"):
+        return "result", {"result": final_output(data.get("output") or {})}
+    return None
+
+
+async def analysis_events(trade: Dict[str, Any], market: str, mode: str = "agent") -> AsyncIterator[Event]:
+    """Run one trade analysis and yield its progress events.
+
+    Exceptions propagate to the caller; ``result`` is always the last event
+    of a successful run.
+    """
+    started = time.perf_counter()
+    yield "start", {"market": market, "mode": mode}
+    if mode == "fast":
+        result = await analyse_trade(trade, market, mode=mode)
+        yield "result", {"result": result, "elapsed_s": round(time.perf_counter() - started, 3)}
+        return
+    agent = select_agent(trade, market)
+    async with analysis_run(trade, agent) as (inputs, run_config):
+        async for event in agent.astream_events(inputs, run_config, version="v2"):
+            translated = _translate(event)
+            if translated is None:
+                continue
+            name, data = translated
+            if name == "result":
+                data["elapsed_s"] = round(time.perf_counter() - started, 3)
+            yield name, data
@@ -0,0 +1,219 @@
+"""Bounded work queue for the analysis service.
+
+Jobs wait in a fixed-size queue and are run by a fixed number of worker
+coroutines sharing the process's compiled agents. When the queue is full,
+:meth:`AnalysisPool.submit` raises :class:`QueueFullError` instead of
+buffering without limit, with a ``retry_after`` estimated from recent job
+durations. The API turns that into a 429 with a ``Retry-After`` header.
+"""
+
+import asyncio
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.batch import describe_error
+
+from .events import Event, analysis_events
+
+# Weight of the latest job in the moving average of job durations.
+DURATION_SMOOTHING = 0.2
+# Assumed job duration before any job has finished.
+DEFAULT_JOB_SECONDS = 30.0
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted to a full queue."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Analysis queue is full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    """One queued trade analysis."""
+    trade: Dict[str, Any]
+    market: str
+    mode: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"  # queued | running | ok | error | cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    exception: Optional[BaseException] = None
+    # Progress events for a streaming client; None marks the end.
+    events: Optional[asyncio.Queue] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.done.is_set()
+
+    def view(self) -> Dict[str, Any]:
+        view = {
+            "job_id": self.id,
+            "market": self.market,
+            "mode": self.mode,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "ok":
+            view["result"] = self.result
+        elif self.error:
+            view["error"] = self.error
+        return view
+
+
+class AnalysisPool:
+    """Fixed worker pool draining a bounded queue of analysis jobs."""
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        timeout: Optional[float] = None,
+        result_ttl: float = 3600.0,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: Dict[str, Job] = {}
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._avg_duration: Optional[float] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+        per_job = self._avg_duration or DEFAULT_JOB_SECONDS
+        return max(1, math.ceil(per_job / self.workers))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth,
+            "queue_capacity": self.queue_size,
+            "running": self._running,
+            "workers": self.workers,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_job_seconds": None if self._avg_duration is None else round(self._avg_duration, 3),
+        }
+
+    def submit(self, trade: Dict[str, Any], market: str, mode: str, stream: bool = False) -> Job:
+        """Queue a job without waiting.
+
+        Raises:
+            QueueFullError: If the queue has no free slot.
+        """
+        if self._queue is None:
+            raise RuntimeError("AnalysisPool.start() has not been awaited")
+        self._prune()
+        job = Job(trade=trade, market=market, mode=mode, events=asyncio.Queue() if stream else None)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise QueueFullError(self.retry_after())
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job: Job) -> None:
+        """Drop a queued job or interrupt a running one."""
+        if job.finished:
+            return
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, "cancelled")
+
+    async def events(self, job: Job) -> AsyncIterator[Event]:
+        """Yield a streaming job's events until it finishes."""
+        while (event := await job.events.get()) is not None:
+            yield event
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.finished:
+                # Cancelled while still queued.
+                continue
+            job.status, job.started_at = "running", time.time()
+            self._running += 1
+            job.task = asyncio.create_task(self._run(job))
+            try:
+                await asyncio.wait_for(asyncio.shield(job.task), self.timeout)
+                status = "ok"
+            except asyncio.CancelledError:
+                if not job.task.cancelled():
+                    # The worker itself is being stopped.
+                    job.task.cancel()
+                    self._finish(job, "cancelled")
+                    raise
+                status = "cancelled"
+            except Exception as exc:
+                if isinstance(exc, asyncio.TimeoutError):
+                    job.task.cancel()
+                job.exception, job.error = exc, describe_error(exc)
+                status = "error"
+                await self._emit(job, ("error", {"error": job.error}))
+            finally:
+                self._running -= 1
+            self._record_duration(time.time() - job.started_at)
+            self._finish(job, status)
+
+    async def _run(self, job: Job) -> None:
+        async for name, data in analysis_events(job.trade, job.market, job.mode):
+            if name == "result":
+                job.result = data["result"]
+            await self._emit(job, (name, data))
+
+    async def _emit(self, job: Job, event: Event) -> None:
+        if job.events is not None:
+            await job.events.put(event)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status, job.finished_at = status, time.time()
+        if job.events is not None:
+            job.events.put_nowait(None)
+        job.done.set()
+        self._completed += 1
+
+    def _record_duration(self, seconds: float) -> None:
+        if self._avg_duration is None:
+            self._avg_duration = seconds
+        else:
+            self._avg_duration += DURATION_SMOOTHING * (seconds - self._avg_duration)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than ``result_ttl``."""
+        cutoff = time.time() - self.result_ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
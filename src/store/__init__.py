@@ -0,0 +1,24 @@
+"""Local persistent stores used by the tools.
+
+These modules keep data fetched from upstream providers on disk so repeated
+analyses of the same symbols do not have to go back to the network.
+"""
+
+from src.utils.lazy import lazy_exports
+
+__all__ = lazy_exports(__name__, {
+    "CandleStore": ".candles",
+    "get_candle_store": ".candles",
+    "SQLAlchemyCheckpointer": ".checkpoints",
+    "get_checkpointer": ".checkpoints",
+    "SQLAlchemyLLMCache": ".llm_cache",
+    "get_llm_cache": ".llm_cache",
+    "NewsStore": ".news",
+    "get_news_store": ".news",
+    "ResponseCache": ".response_cache",
+    "get_response_cache": ".response_cache",
+    "SymbolIndex": ".symbols",
+    "get_symbol_directory": ".symbols",
+    "TradeStore": ".trades",
+    "get_trade_store": ".trades",
+})
@@ -0,0 +1,288 @@
+"""On-disk columnar OHLCV candle store.
+
+Candles are stored per (provider, symbol, series) key in their own
+directory. Each column lives in its own ``.npy`` file so reads can be served
+through ``numpy.load(..., mmap_mode="r")`` without loading whole series into
+memory. A small ``meta.json`` file records the time ranges that have already
+been fetched from upstream, which lets callers request only the missing gaps.
+
+Layout::
+
+    <root>/<provider>/<symbol>/<series>/meta.json
+    <root>/<provider>/<symbol>/<series>/g000001/timestamp.npy
+    <root>/<provider>/<symbol>/<series>/g000001/open.npy
+    ...
+
+Writes go to a fresh generation directory and ``meta.json`` is swapped
+atomically, so concurrent readers always see a consistent set of columns.
+"""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import config
+from src.utils.metrics import CACHE_REQUESTS
+
+# Column name -> array. Always contains "timestamp" (int64 epoch millis,
+# sorted ascending, unique); every other column is float64.
+Candles = Dict[str, np.ndarray]
+TimeRange = Tuple[int, int]
+
+# fetch(start_ms, end_ms) -> (candles, covered range or None)
+Fetcher = Callable[[int, int], Tuple[Candles, Optional[TimeRange]]]
+AsyncFetcher = Callable[[int, int], Awaitable[Tuple[Candles, Optional[TimeRange]]]]
+
+TIMESTAMP = "timestamp"
+_META_FILE = "meta.json"
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def empty_candles(columns: List[str]) -> Candles:
+    """Return an empty candle set with the given value columns."""
+    candles: Candles = {TIMESTAMP: np.empty(0, dtype=np.int64)}
+    for column in columns:
+        candles[column] = np.empty(0, dtype=np.float64)
+    return candles
+
+
+def merge_ranges(ranges: List[TimeRange]) -> List[TimeRange]:
+    """Merge overlapping or adjacent inclusive millisecond ranges."""
+    merged: List[TimeRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: int, end: int, covered: List[TimeRange]) -> List[TimeRange]:
+    """Return the parts of ``[start, end]`` not included in ``covered``."""
+    gaps: List[TimeRange] = []
+    cursor = start
+    for cov_start, cov_end in merge_ranges(covered):
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start - 1))
+        cursor = max(cursor, cov_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class CandleStore:
+    """Persistent candle cache with gap-only read-through fetching."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------ paths
+
+    def _key_dir(self, provider: str, symbol: str, series: str) -> str:
+        parts = [_UNSAFE_CHARS.sub("_", p) for p in (provider, symbol.upper(), series)]
+        return os.path.join(self.root, *parts)
+
+    def _lock(self, key_dir: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key_dir)
+            if lock is None:
+                lock = self._locks[key_dir] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _read_meta(key_dir: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(key_dir, _META_FILE), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    # ------------------------------------------------------------------ reads
+
+    def coverage(self, provider: str, symbol: str, series: str) -> List[TimeRange]:
+        """Return the time ranges already fetched for a key."""
+        meta = self._read_meta(self._key_dir(provider, symbol, series))
+        if not meta:
+            return []
+        return [tuple(r) for r in meta.get("coverage", [])]
+
+    def missing_ranges(self, provider: str, symbol: str, series: str, start_ms: int, end_ms: int) -> List[TimeRange]:
+        """Return the sub-ranges of ``[start_ms, end_ms]`` not yet fetched."""
+        return subtract_ranges(start_ms, end_ms, self.coverage(provider, symbol, series))
+
+    def read(self, provider: str, symbol: str, series: str, start_ms: int, end_ms: int) -> Candles:
+        """Return stored candles with timestamps in ``[start_ms, end_ms]``."""
+        key_dir = self._key_dir(provider, symbol, series)
+        meta = self._read_meta(key_dir)
+        if not meta:
+            return empty_candles([])
+
+        gen_dir = os.path.join(key_dir, meta["generation"])
+        timestamps = np.load(os.path.join(gen_dir, f"{TIMESTAMP}.npy"), mmap_mode="r")
+        lo = int(np.searchsorted(timestamps, start_ms, side="left"))
+        hi = int(np.searchsorted(timestamps, end_ms, side="right"))
+
+        candles: Candles = {TIMESTAMP: np.array(timestamps[lo:hi])}
+        for column in meta["columns"]:
+            values = np.load(os.path.join(gen_dir, f"{column}.npy"), mmap_mode="r")
+            candles[column] = np.array(values[lo:hi])
+        return candles
+
+    # ----------------------------------------------------------------- writes
+
+    def write(self, provider: str, symbol: str, series: str, candles: Candles, covered: Optional[TimeRange]) -> None:
+        """Merge ``candles`` into the store and mark ``covered`` as fetched.
+
+        Rows whose timestamp already exists are replaced by the new values so
+        provisional (still-forming) candles get refreshed on the next fetch.
+        """
+        key_dir = self._key_dir(provider, symbol, series)
+        with self._lock(key_dir):
+            self._write_locked(key_dir, candles, covered)
+
+    def _write_locked(self, key_dir: str, candles: Candles, covered: Optional[TimeRange]) -> None:
+        meta = self._read_meta(key_dir) or {"generation": None, "columns": [], "coverage": []}
+        old: Candles = empty_candles(meta["columns"])
+        if meta["generation"]:
+            old_dir = os.path.join(key_dir, meta["generation"])
+            old = {c: np.load(os.path.join(old_dir, f"{c}.npy")) for c in [TIMESTAMP, *meta["columns"]]}
+
+        columns = list(meta["columns"])
+        for column in candles:
+            if column != TIMESTAMP and column not in columns:
+                columns.append(column)
+
+        new_ts = np.asarray(candles.get(TIMESTAMP, np.empty(0)), dtype=np.int64)
+        timestamps = np.concatenate([old[TIMESTAMP], new_ts])
+        # Stable sort keeps old rows before new ones for equal timestamps;
+        # keeping the last row of each run lets new values win.
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        keep = np.append(timestamps[1:] != timestamps[:-1], True) if len(timestamps) else np.empty(0, dtype=bool)
+
+        merged: Candles = {TIMESTAMP: timestamps[keep]}
+        for column in columns:
+            old_values = old.get(column, np.full(len(old[TIMESTAMP]), np.nan))
+            new_values = np.asarray(candles.get(column, np.full(len(new_ts), np.nan)), dtype=np.float64)
+            merged[column] = np.concatenate([old_values, new_values])[order][keep]
+
+        coverage = [tuple(r) for r in meta["coverage"]]
+        if covered is not None and covered[0] <= covered[1]:
+            coverage.append((int(covered[0]), int(covered[1])))
+
+        previous = meta["generation"]
+        generation = f"g{int(previous[1:]) + 1 if previous else 1:06d}"
+        gen_dir = os.path.join(key_dir, generation)
+        os.makedirs(gen_dir, exist_ok=True)
+        for column, values in merged.items():
+            np.save(os.path.join(gen_dir, f"{column}.npy"), values)
+
+        new_meta = {
+            "generation": generation,
+            "columns": columns,
+            "coverage": [list(r) for r in merge_ranges(coverage)],
+        }
+        tmp_path = os.path.join(key_dir, f"{_META_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(new_meta, fh)
+        os.replace(tmp_path, os.path.join(key_dir, _META_FILE))
+
+        # Keep the previous generation around for readers that loaded the old
+        # meta.json just before the swap; anything older can go.
+        for entry in os.listdir(key_dir):
+            if entry.startswith("g") and entry not in (generation, previous):
+                shutil.rmtree(os.path.join(key_dir, entry), ignore_errors=True)
+
+    # ----------------------------------------------------------- read-through
+
+    def read_through(
+        self,
+        provider: str,
+        symbol: str,
+        series: str,
+        start_ms: int,
+        end_ms: int,
+        fetch: Fetcher,
+    ) -> Candles:
+        """Return candles for ``[start_ms, end_ms]``, fetching only the gaps.
+
+        ``fetch`` is called with the first missing range and must return
+        the candles it received plus the range it can vouch for (``None``
+        when nothing in the response is final yet). Gaps are recomputed after
+        every fetch, so one response that covers several gaps (or a truncated
+        response that covers part of one) is handled without extra requests.
+        Each distinct gap is attempted at most once per call.
+
+        The key lock is only held while merging, not while fetching, so
+        concurrent callers missing the same gap issue identical upstream
+        requests that the HTTP layer coalesces into one.
+        """
+        key_dir = self._key_dir(provider, symbol, series)
+        attempted = set()
+        while True:
+            meta = self._read_meta(key_dir)
+            covered = [tuple(r) for r in meta["coverage"]] if meta else []
+            gaps = [g for g in subtract_ranges(start_ms, end_ms, covered) if g not in attempted]
+            if not gaps:
+                break
+            attempted.add(gaps[0])
+            candles, fetched = fetch(*gaps[0])
+            with self._lock(key_dir):
+                self._write_locked(key_dir, candles, fetched)
+        CACHE_REQUESTS.labels("candles", "miss" if attempted else "hit").inc()
+        return self.read(provider, symbol, series, start_ms, end_ms)
+
+    async def aread_through(
+        self,
+        provider: str,
+        symbol: str,
+        series: str,
+        start_ms: int,
+        end_ms: int,
+        fetch: AsyncFetcher,
+    ) -> Candles:
+        """Async counterpart of :meth:`read_through`.
+
+        ``fetch`` is awaited on the event loop; merges run in a worker
+        thread so a large write never blocks other coroutines.
+        """
+        key_dir = self._key_dir(provider, symbol, series)
+        attempted = set()
+        while True:
+            meta = self._read_meta(key_dir)
+            covered = [tuple(r) for r in meta["coverage"]] if meta else []
+            gaps = [g for g in subtract_ranges(start_ms, end_ms, covered) if g not in attempted]
+            if not gaps:
+                break
+            attempted.add(gaps[0])
+            candles, fetched = await fetch(*gaps[0])
+            await asyncio.to_thread(self.write, provider, symbol, series, candles, fetched)
+        CACHE_REQUESTS.labels("candles", "miss" if attempted else "hit").inc()
+        return self.read(provider, symbol, series, start_ms, end_ms)
+
+
+_default_store: Optional[CandleStore] = None
+_default_store_guard = threading.Lock()
+
+
+def get_candle_store() -> CandleStore:
+    """Return the process-wide candle store rooted at ``CANDLE_STORE_DIR``."""
+    global _default_store
+    with _default_store_guard:
+        if _default_store is None:
+            _default_store = CandleStore(config["CANDLE_STORE_DIR"])
+        return _default_store
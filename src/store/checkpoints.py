@@ -0,0 +1,408 @@
+"""Durable LangGraph checkpoints on ``DATABASE_URL``.
+
+:class:`SQLAlchemyCheckpointer` is a ``BaseCheckpointSaver`` that lets the
+ReAct agents resume an interrupted analysis (crash, timeout, cancelled
+job) from its last completed step instead of redoing every upstream call
+and LLM turn. Its layout follows LangGraph's own savers:
+
+* ``checkpoints`` holds one row per step with the checkpoint minus its
+  channel values;
+* ``checkpoint_blobs`` holds each channel value once per version, so a step
+  that only appends a tool result does not rewrite the whole message
+  history;
+* ``checkpoint_writes`` holds the writes of tasks that finished inside a
+  step that did not, so those tasks are not run again on resume.
+
+Values are serialised with LangGraph's msgpack serializer (``ormsgpack``)
+and compressed with zstd by :class:`ZstdSerializer`.
+
+Usage::
+
+    agent = create_react_agent(..., checkpointer=get_checkpointer())
+    agent.invoke(inputs, {"configurable": {"thread_id": "..."}})
+"""
+
+import asyncio
+import random
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import zstandard
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import Integer, LargeBinary, String, delete, select, tuple_
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.config.constant import config
+from src.config.db import Base, get_engine
+
+# Serialised values shorter than this are stored uncompressed; zstd's frame
+# overhead outweighs any saving on them.
+COMPRESS_MIN_BYTES = 256
+ZSTD_SUFFIX = "+zstd"
+
+
+class ZstdSerializer(SerializerProtocol):
+    """Wraps a serializer and zstd-compresses its output.
+
+    Compressed values are tagged ``<type>+zstd`` (e.g. ``msgpack+zstd``);
+    untagged values are passed through, so uncompressed rows stay readable.
+    """
+
+    def __init__(self, serde: Optional[SerializerProtocol] = None, level: int = 3):
+        self.serde = serde or JsonPlusSerializer()
+        self.level = level
+        # zstd contexts must not be shared between threads.
+        self._local = threading.local()
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if len(data) < COMPRESS_MIN_BYTES:
+            return type_, data
+        return type_ + ZSTD_SUFFIX, self._compressor().compress(data)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith(ZSTD_SUFFIX):
+            self._compressor()
+            type_, payload = type_[:-len(ZSTD_SUFFIX)], self._local.decompressor.decompress(payload)
+        return self.serde.loads_typed((type_, payload))
+
+
+class CheckpointRow(Base):
+    __tablename__ = "checkpoints"
+
+    thread_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String(255), primary_key=True)
+    checkpoint_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    parent_checkpoint_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    type: Mapped[str] = mapped_column(String(32))
+    checkpoint: Mapped[bytes] = mapped_column(LargeBinary)
+    # ``metadata`` is reserved on declarative classes.
+    meta_type: Mapped[str] = mapped_column("metadata_type", String(32))
+    meta: Mapped[bytes] = mapped_column("metadata", LargeBinary)
+
+
+class CheckpointBlob(Base):
+    __tablename__ = "checkpoint_blobs"
+
+    thread_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String(255), primary_key=True)
+    channel: Mapped[str] = mapped_column(String(255), primary_key=True)
+    version: Mapped[str] = mapped_column(String(64), primary_key=True)
+    type: Mapped[str] = mapped_column(String(32))
+    blob: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+
+
+class CheckpointWrite(Base):
+    __tablename__ = "checkpoint_writes"
+
+    thread_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String(255), primary_key=True)
+    checkpoint_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    task_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    idx: Mapped[int] = mapped_column(Integer, primary_key=True)
+    channel: Mapped[str] = mapped_column(String(255))
+    type: Mapped[str] = mapped_column(String(32))
+    blob: Mapped[bytes] = mapped_column(LargeBinary)
+    task_path: Mapped[str] = mapped_column(String(255), default="")
+
+
+_TABLES = [CheckpointRow.__table__, CheckpointBlob.__table__, CheckpointWrite.__table__]
+
+
+def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+
+class SQLAlchemyCheckpointer(BaseCheckpointSaver[str]):
+    """LangGraph checkpoint saver on the shared SQLAlchemy engine.
+
+    Works on any database ``DATABASE_URL`` points at (SQLite, Postgres).
+    The async methods run the synchronous ones in a worker thread.
+
+    Args:
+        serde: Serializer for checkpoints, channel values and writes;
+            defaults to msgpack with zstd compression.
+    """
+
+    def __init__(self, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde or ZstdSerializer(level=config["CHECKPOINT_ZSTD_LEVEL"]))
+        self._ready = False
+        # Parallel tool calls write at once; queueing them here is much
+        # cheaper than SQLite's busy-wait back-off on the database lock.
+        self._write_lock = threading.Lock()
+
+    def _session(self) -> Session:
+        # Connect on first use so compiling the agents never touches the database.
+        engine = get_engine()
+        if not self._ready:
+            Base.metadata.create_all(engine, tables=_TABLES)
+            self._ready = True
+        return Session(engine)
+
+    # ------------------------------------------------------------ reads
+
+    def _tuple(self, session: Session, row: CheckpointRow) -> CheckpointTuple:
+        checkpoint: Checkpoint = self.serde.loads_typed((row.type, row.checkpoint))
+        versions = {channel: str(version) for channel, version in checkpoint["channel_versions"].items()}
+        values: Dict[str, Any] = {}
+        if versions:
+            blobs = session.scalars(
+                select(CheckpointBlob).where(
+                    CheckpointBlob.thread_id == row.thread_id,
+                    CheckpointBlob.checkpoint_ns == row.checkpoint_ns,
+                    tuple_(CheckpointBlob.channel, CheckpointBlob.version).in_(list(versions.items())),
+                )
+            )
+            values = {
+                blob.channel: self.serde.loads_typed((blob.type, blob.blob))
+                for blob in blobs
+                if blob.type != "empty"
+            }
+        writes = session.scalars(
+            select(CheckpointWrite)
+            .where(
+                CheckpointWrite.thread_id == row.thread_id,
+                CheckpointWrite.checkpoint_ns == row.checkpoint_ns,
+                CheckpointWrite.checkpoint_id == row.checkpoint_id,
+            )
+            .order_by(CheckpointWrite.task_id, CheckpointWrite.idx)
+        )
+        return CheckpointTuple(
+            config=_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((row.meta_type, row.meta)),
+            parent_config=(
+                _config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[(w.task_id, w.channel, self.serde.loads_typed((w.type, w.blob))) for w in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """The checkpoint ``config`` names, or the thread's latest one."""
+        configurable = config["configurable"]
+        query = select(CheckpointRow).where(
+            CheckpointRow.thread_id == configurable["thread_id"],
+            CheckpointRow.checkpoint_ns == configurable.get("checkpoint_ns", ""),
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(CheckpointRow.checkpoint_id == checkpoint_id)
+        else:
+            # Checkpoint ids are time-ordered (UUIDv6).
+            query = query.order_by(CheckpointRow.checkpoint_id.desc()).limit(1)
+        with self._session() as session:
+            row = session.scalars(query).first()
+            return self._tuple(session, row) if row is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Checkpoints matching ``config`` and ``filter``, newest first."""
+        query = select(CheckpointRow)
+        if config:
+            configurable = config["configurable"]
+            query = query.where(CheckpointRow.thread_id == configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                query = query.where(CheckpointRow.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(CheckpointRow.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(CheckpointRow.checkpoint_id < before_id)
+        query = query.order_by(CheckpointRow.thread_id, CheckpointRow.checkpoint_ns, CheckpointRow.checkpoint_id.desc())
+        if limit is not None and not filter:
+            query = query.limit(limit)
+        results: List[CheckpointTuple] = []
+        with self._session() as session:
+            for row in session.scalars(query):
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    # Metadata is stored serialised, so it is filtered here.
+                    metadata = self.serde.loads_typed((row.meta_type, row.meta))
+                    if any(metadata.get(key) != value for key, value in filter.items()):
+                        continue
+                results.append(self._tuple(session, row))
+        yield from results
+
+    # ----------------------------------------------------------- writes
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and the channel values that changed in it."""
+        configurable = config["configurable"]
+        thread_id, checkpoint_ns = configurable["thread_id"], configurable.get("checkpoint_ns", "")
+        stripped = dict(checkpoint)
+        values = stripped.pop("channel_values")
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(stripped)
+        meta_type, meta = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        with self._write_lock, self._session() as session:
+            # Versions are unique (see get_next_version), so blobs are only
+            # ever inserted.
+            for channel, version in new_versions.items():
+                type_, blob = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", None)
+                session.add(CheckpointBlob(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    channel=channel,
+                    version=str(version),
+                    type=type_,
+                    blob=blob,
+                ))
+            session.merge(CheckpointRow(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=configurable.get("checkpoint_id"),
+                type=checkpoint_type,
+                checkpoint=checkpoint_data,
+                meta_type=meta_type,
+                meta=meta,
+            ))
+            session.commit()
+        return _config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store the writes of a finished task for the checkpoint in ``config``.
+
+        Regular writes are kept from the first attempt; special writes
+        (errors, interrupts) are replaced by the latest one.
+        """
+        configurable = config["configurable"]
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": configurable["checkpoint_id"],
+            "task_id": task_id,
+        }
+        with self._write_lock, self._session() as session:
+            existing = set(session.scalars(
+                select(CheckpointWrite.idx).filter_by(**key)
+            ))
+            for n, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, n)
+                if idx >= 0 and idx in existing:
+                    continue
+                type_, blob = self.serde.dumps_typed(value)
+                row = CheckpointWrite(**key, idx=idx, channel=channel, type=type_, blob=blob, task_path=task_path)
+                if idx in existing:
+                    session.merge(row)
+                else:
+                    session.add(row)
+            session.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, channel value and write of a thread."""
+        with self._write_lock, self._session() as session:
+            for table in (CheckpointWrite, CheckpointBlob, CheckpointRow):
+                session.execute(delete(table).where(table.thread_id == thread_id))
+            session.commit()
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded so versions sort as strings; the random part keeps
+        # concurrent writers from producing the same version.
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------ async
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_default_checkpointer: Optional[SQLAlchemyCheckpointer] = None
+_default_checkpointer_guard = threading.Lock()
+
+
+def get_checkpointer() -> Optional[SQLAlchemyCheckpointer]:
+    """Return the process-wide checkpointer, or ``None`` when it is disabled.
+
+    Checkpointing is disabled when ``CHECKPOINTS_ENABLED`` is false or no
+    ``DATABASE_URL`` is configured.
+    """
+    global _default_checkpointer
+    if not config["CHECKPOINTS_ENABLED"] or not config["DATABASE_URL"]:
+        return None
+    with _default_checkpointer_guard:
+        if _default_checkpointer is None:
+            _default_checkpointer = SQLAlchemyCheckpointer()
+        return _default_checkpointer
@@ -0,0 +1,145 @@
+"""Persistent LLM response cache.
+
+Implements LangChain's ``BaseCache`` on top of the shared SQLAlchemy engine
+so identical model calls are answered from the database instead of the
+provider. LangChain builds the cache inputs itself: ``prompt`` is the
+serialised message list (system prompt, user input and every tool call and
+tool result so far) and ``llm_string`` captures the model name, sampling
+parameters and bound tools. Both are hashed into the primary key.
+
+Entries expire after a TTL, and the table is trimmed to a maximum number of
+rows by evicting the least recently used entries.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core._api import suppress_langchain_beta_warning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from sqlalchemy import Float, Integer, String, Text, delete, func, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.config.constant import config
+from src.config.db import Base, get_engine
+from src.utils.metrics import CACHE_REQUESTS
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(Text)
+    size: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[float] = mapped_column(Float)
+    expires_at: Mapped[float] = mapped_column(Float, index=True)
+    accessed_at: Mapped[float] = mapped_column(Float, index=True)
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class SQLAlchemyLLMCache(BaseCache):
+    """LLM cache stored in a SQL table with TTL and LRU size eviction.
+
+    Args:
+        ttl_seconds: Lifetime of an entry; ``0`` disables expiry.
+        max_entries: Rows kept after each write; ``0`` disables trimming.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._ready = False
+
+    def _session(self) -> Session:
+        # Connect on first use so building the model never touches the database.
+        engine = get_engine()
+        if not self._ready:
+            Base.metadata.create_all(engine, tables=[LLMCacheEntry.__table__])
+            self._ready = True
+        return Session(engine)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self._lookup(prompt, llm_string)
+        CACHE_REQUESTS.labels("llm", "miss" if value is None else "hit").inc()
+        return value
+
+    def _lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        with self._session() as session:
+            entry = session.get(LLMCacheEntry, key)
+            if entry is None:
+                return None
+            if entry.expires_at and entry.expires_at <= now:
+                session.delete(entry)
+                session.commit()
+                return None
+            value = entry.value
+            entry.accessed_at = now
+            session.commit()
+        try:
+            with suppress_langchain_beta_warning():
+                return loads(value)
+        except Exception:
+            # Written by an incompatible LangChain version; treat as a miss.
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        value = dumps(return_val)
+        now = time.time()
+        entry = LLMCacheEntry(
+            key=_cache_key(prompt, llm_string),
+            value=value,
+            size=len(value),
+            created_at=now,
+            expires_at=now + self.ttl_seconds if self.ttl_seconds else 0.0,
+            accessed_at=now,
+        )
+        with self._session() as session:
+            session.merge(entry)
+            self._evict(session, now)
+            session.commit()
+
+    def _evict(self, session: Session, now: float) -> None:
+        if self.ttl_seconds:
+            session.execute(
+                delete(LLMCacheEntry).where(LLMCacheEntry.expires_at > 0, LLMCacheEntry.expires_at <= now)
+            )
+        if self.max_entries:
+            session.flush()
+            excess = session.scalar(select(func.count()).select_from(LLMCacheEntry)) - self.max_entries
+            if excess > 0:
+                oldest = select(LLMCacheEntry.key).order_by(LLMCacheEntry.accessed_at).limit(excess)
+                session.execute(delete(LLMCacheEntry).where(LLMCacheEntry.key.in_(oldest.scalar_subquery())))
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._session() as session:
+            session.execute(delete(LLMCacheEntry))
+            session.commit()
+
+
+_default_cache: Optional[SQLAlchemyLLMCache] = None
+_default_cache_guard = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLAlchemyLLMCache]:
+    """Return the process-wide LLM cache, or ``None`` when it is disabled.
+
+    The cache is disabled when ``LLM_CACHE_TTL_SECONDS`` is negative or no
+    ``DATABASE_URL`` is configured.
+    """
+    global _default_cache
+    if config["LLM_CACHE_TTL_SECONDS"] < 0 or not config["DATABASE_URL"]:
+        return None
+    with _default_cache_guard:
+        if _default_cache is None:
+            _default_cache = SQLAlchemyLLMCache(
+                ttl_seconds=config["LLM_CACHE_TTL_SECONDS"],
+                max_entries=config["LLM_CACHE_MAX_ENTRIES"],
+            )
+        return _default_cache
@@ -0,0 +1,524 @@
+"""Local news archive with a full-text index.
+
+News feeds (RSS 2.0 or Atom) and JSONL exports are ingested into a SQLite
+file at ``NEWS_DB_PATH`` so ``get_coin_news`` answers from disk in
+milliseconds instead of calling a news API per analysis:
+
+* ``articles`` holds one row per URL (re-ingesting a feed is a no-op),
+  with ids that sort by publication time;
+* ``article_symbols`` maps each article to the coins it mentions, keyed on
+  ``(symbol, published_at, article_id)`` so a coin's news in a time window
+  is one index range scan;
+* ``articles_fts`` is an FTS5 index over titles and summaries that ranks
+  the window's articles with BM25 (title matches weigh more). Because ids
+  follow publication time, the window is a rowid range and only matches
+  inside it are scored: a few milliseconds on a 100k-article archive.
+
+Coins are tagged at ingestion from feed categories, coin names
+("bitcoin") and upper-case tickers ("BTC", "$SOL"). The configured
+``NEWS_FEEDS`` are re-read in a background thread once the last ingest is
+older than ``NEWS_REFRESH_SECONDS``; searches never wait for it.
+
+FTS5 ships with the SQLite bundled with CPython, which is why the archive
+lives in its own file rather than in ``DATABASE_URL``.
+
+Usage:
+    python -m src.store.news --refresh                   # ingest NEWS_FEEDS
+    python -m src.store.news feed.xml export.jsonl       # ingest files or URLs
+    python -m src.store.news --search BTC --start 2025-01-01 --end 2025-01-07 --query etf
+"""
+
+import argparse
+import html
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.config import config
+from src.utils.dates import format_epoch_ms, to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+# Articles returned per search and characters kept of each summary.
+DEFAULT_LIMIT = 10
+SUMMARY_CHARS = 280
+# Back-off before retrying a failed background refresh.
+REFRESH_RETRY_SECONDS = 300
+# Article ids are ``published_ms * IDS_PER_MS + n`` so that rowid order is
+# time order and a time window is a rowid range the FTS index can seek.
+IDS_PER_MS = 1000
+# BM25 weights of the indexed columns (title, summary).
+TITLE_WEIGHT, SUMMARY_WEIGHT = 4.0, 1.0
+
+# Ticker -> names it is written as in headlines. Only unambiguous words
+# are listed; short tickers that are also English words ("DOT", "NEAR")
+# are matched in upper case only.
+COIN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "BTC": ("bitcoin", "btc"),
+    "ETH": ("ethereum", "ether", "eth"),
+    "BNB": ("bnb", "binance coin"),
+    "SOL": ("solana",),
+    "XRP": ("xrp", "ripple"),
+    "ADA": ("cardano",),
+    "DOGE": ("dogecoin", "doge"),
+    "AVAX": ("avalanche", "avax"),
+    "DOT": ("polkadot",),
+    "LINK": ("chainlink",),
+    "MATIC": ("polygon", "matic"),
+    "LTC": ("litecoin", "ltc"),
+    "TRX": ("tron", "trx"),
+    "ATOM": ("cosmos",),
+    "UNI": ("uniswap",),
+    "XLM": ("stellar", "xlm"),
+    "ETC": ("ethereum classic",),
+    "FIL": ("filecoin",),
+    "APT": ("aptos",),
+    "NEAR": ("near protocol",),
+    "SHIB": ("shiba inu", "shib"),
+    "TON": ("toncoin",),
+    "USDT": ("tether", "usdt"),
+    "USDC": ("usdc",),
+}
+QUOTE_ASSETS = ("USDT", "USDC", "BUSD", "FDUSD", "USD")
+
+_NAME_TO_TICKER = {name: ticker for ticker, names in COIN_ALIASES.items() for name in names}
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+_TICKER = re.compile(r"(?<![A-Za-z0-9])\$?([A-Z]{2,6})(?![A-Za-z0-9])")
+_WORD = re.compile(r"[a-z0-9]+")
+_QUERY_TERM = re.compile(r"\w+")
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    source TEXT,
+    published_at INTEGER NOT NULL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_articles_published_at ON articles (published_at);
+CREATE TABLE IF NOT EXISTS article_symbols (
+    symbol TEXT NOT NULL,
+    published_at INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (symbol, published_at, article_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class Article(NamedTuple):
+    url: str
+    title: str
+    source: Optional[str]
+    published_ms: int
+    summary: str
+    symbols: Tuple[str, ...]
+
+
+# ------------------------------------------------------------------ helpers
+
+def clean_text(text: Optional[str]) -> str:
+    """Plain text from an HTML fragment, whitespace collapsed."""
+    if not text:
+        return ""
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", text))).strip()
+
+
+def truncate(text: str, limit: int = SUMMARY_CHARS) -> str:
+    """``text`` cut at a word boundary to at most ``limit`` characters."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    if " " in cut[limit // 2:]:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def coin_symbol(coin: str) -> str:
+    """The base ticker for a coin name, ticker or trading pair.
+
+    ``"bitcoin"``, ``"btc"`` and ``"BTCUSDT"`` all map to ``"BTC"``.
+    """
+    name = coin.strip().lstrip("$").lower()
+    if name in _NAME_TO_TICKER:
+        return _NAME_TO_TICKER[name]
+    symbol = name.upper()
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote) and symbol != quote:
+            return symbol[:-len(quote)]
+    return symbol
+
+
+def tag_symbols(text: str, categories: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Tickers of the coins an article mentions."""
+    found = set()
+    for category in categories:
+        symbol = coin_symbol(category)
+        if symbol in COIN_ALIASES:
+            found.add(symbol)
+    found.update(match for match in _TICKER.findall(text) if match in COIN_ALIASES)
+    words = _WORD.findall(text.lower())
+    # Single words and word pairs, so "ethereum classic" is seen as well.
+    for phrase in words + [f"{first} {second}" for first, second in zip(words, words[1:])]:
+        symbol = _NAME_TO_TICKER.get(phrase)
+        if symbol is not None:
+            found.add(symbol)
+    return tuple(sorted(found))
+
+
+def _article(url: Any, title: Any, source: Any, published: Any, summary: Any, categories: Iterable[str] = ()) -> Optional[Article]:
+    title, summary = clean_text(title), clean_text(summary)
+    if not url or not title or not published:
+        return None
+    try:
+        published_ms = to_epoch_ms(published)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    categories = list(categories)
+    return Article(str(url).strip(), title, source or None, published_ms, summary, tag_symbols(f"{title} {summary}", categories))
+
+
+def parse_feed(text: str, source: Optional[str] = None) -> List[Article]:
+    """Articles from an RSS 2.0 or Atom document; malformed items are skipped."""
+    root = ET.fromstring(text)
+    articles: List[Optional[Article]] = []
+    channel = root.find("channel")
+    if channel is not None:
+        source = source or clean_text(channel.findtext("title")) or None
+        for item in channel.iter("item"):
+            articles.append(_article(
+                item.findtext("link") or item.findtext("guid"),
+                item.findtext("title"),
+                source,
+                item.findtext("pubDate") or item.findtext("{http://purl.org/dc/elements/1.1/}date"),
+                item.findtext("description") or item.findtext(_CONTENT),
+                [c.text or "" for c in item.findall("category")],
+            ))
+    elif root.tag == f"{_ATOM}feed":
+        source = source or clean_text(root.findtext(f"{_ATOM}title")) or None
+        for entry in root.iter(f"{_ATOM}entry"):
+            link = entry.find(f"{_ATOM}link[@rel='alternate']")
+            if link is None:
+                link = entry.find(f"{_ATOM}link")
+            articles.append(_article(
+                link.get("href") if link is not None else entry.findtext(f"{_ATOM}id"),
+                entry.findtext(f"{_ATOM}title"),
+                source,
+                entry.findtext(f"{_ATOM}published") or entry.findtext(f"{_ATOM}updated"),
+                entry.findtext(f"{_ATOM}summary") or entry.findtext(f"{_ATOM}content"),
+                [c.get("term", "") for c in entry.findall(f"{_ATOM}category")],
+            ))
+    else:
+        raise ValueError(f"Not an RSS or Atom feed: <{root.tag}>")
+    return [article for article in articles if article is not None]
+
+
+def parse_records(records: Iterable[Dict[str, Any]]) -> List[Article]:
+    """Articles from JSON records (``title``, ``url``, ``published_at`` and
+    optionally ``source``, ``summary`` and ``symbols``/``categories``)."""
+    articles = []
+    for record in records:
+        tags = record.get("symbols") or record.get("categories") or []
+        if isinstance(tags, str):
+            tags = re.split(r"[|,]", tags)
+        article = _article(
+            record.get("url"),
+            record.get("title"),
+            record.get("source"),
+            record.get("published_at"),
+            record.get("summary") or record.get("body"),
+            tags,
+        )
+        if article is not None:
+            articles.append(article)
+    return articles
+
+
+def read_source(location: str) -> List[Article]:
+    """Articles from a feed URL, a feed file or a JSON/JSONL export."""
+    if location.startswith(("http://", "https://")):
+        from src.utils.http import get
+
+        return parse_feed(get("news", location).text)
+    with open(location, encoding="utf-8") as handle:
+        text = handle.read()
+    if location.lower().endswith(".jsonl"):
+        return parse_records(json.loads(line) for line in text.splitlines() if line.strip())
+    if location.lower().endswith(".json"):
+        data = json.loads(text)
+        return parse_records(data if isinstance(data, list) else data.get("articles", []))
+    return parse_feed(text)
+
+
+def _match_terms(terms: Sequence[str]) -> str:
+    """An FTS5 query OR-ing quoted terms, immune to query syntax."""
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+# -------------------------------------------------------------------- store
+
+class NewsStore:
+    """SQLite news archive: ingestion, refresh and ranked window search.
+
+    Args:
+        path: SQLite file; created with its schema on first use.
+        feeds: Feed URLs re-read by :meth:`refresh`.
+        refresh_seconds: Ingest age after which searches trigger a
+            background refresh; ``0`` disables it.
+    """
+
+    def __init__(self, path: str, feeds: Sequence[str] = (), refresh_seconds: float = 900):
+        self.path = path
+        self.feeds = list(feeds)
+        self.refresh_seconds = refresh_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ready = False
+        self._refreshing = False
+        self._retry_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets searches run during an ingest.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.executescript(_SCHEMA)
+                    self._ready = True
+        return conn
+
+    # ---------------------------------------------------------------- ingest
+
+    def ingest(self, articles: Iterable[Article]) -> int:
+        """Store new articles (known URLs are skipped); returns how many."""
+        conn = self._connect()
+        written = 0
+        with conn:
+            for article in articles:
+                if conn.execute("SELECT 1 FROM articles WHERE url = ?", (article.url,)).fetchone():
+                    continue
+                base = article.published_ms * IDS_PER_MS
+                last = conn.execute(
+                    "SELECT max(id) FROM articles WHERE id BETWEEN ? AND ?", (base, base + IDS_PER_MS - 1)
+                ).fetchone()[0]
+                article_id = base if last is None else last + 1
+                if article_id >= base + IDS_PER_MS:
+                    continue
+                conn.execute(
+                    "INSERT INTO articles (id, url, title, source, published_at, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                    (article_id, article.url, article.title, article.source, article.published_ms, article.summary),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_symbols (symbol, published_at, article_id) VALUES (?, ?, ?)",
+                    [(symbol, article.published_ms, article_id) for symbol in article.symbols],
+                )
+                written += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('ingested_at', ?)", (str(time.time()),)
+            )
+        return written
+
+    def ingested_at(self) -> float:
+        """Epoch seconds of the last ingest, ``0`` if there was none."""
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'ingested_at'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def refresh(self, wait: bool = True) -> int:
+        """Ingest every configured feed; returns the number of new articles.
+
+        With ``wait=False`` the feeds are read in a daemon thread and a
+        failing feed is retried after ``REFRESH_RETRY_SECONDS``. With
+        ``wait=True`` the first failing feed raises.
+        """
+        with self._lock:
+            if self._refreshing:
+                return 0
+            self._refreshing = True
+        if not wait:
+            threading.Thread(target=self._refresh, name="news-refresh", daemon=True).start()
+            return 0
+        return self._refresh(raise_errors=True)
+
+    def _refresh(self, raise_errors: bool = False) -> int:
+        written = 0
+        failed: Optional[Exception] = None
+        try:
+            for feed in self.feeds:
+                # A feed that is down must not keep the others from updating.
+                try:
+                    written += self.ingest(read_source(feed))
+                except Exception as exc:
+                    logger.warning("Could not read news feed %s: %s", feed, exc)
+                    failed = failed or exc
+        finally:
+            with self._lock:
+                self._refreshing = False
+        if failed is not None:
+            self._retry_at = time.time() + REFRESH_RETRY_SECONDS
+            if raise_errors:
+                raise failed
+        return written
+
+    def _maybe_refresh(self) -> None:
+        if not self.feeds or not self.refresh_seconds or time.time() < self._retry_at:
+            return
+        if time.time() - self.ingested_at() > self.refresh_seconds:
+            self.refresh(wait=False)
+
+    # ---------------------------------------------------------------- search
+
+    def search(
+        self,
+        coin: str,
+        start_ms: int,
+        end_ms: int,
+        query: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Dict[str, Any]:
+        """Best-ranked articles about ``coin`` published in ``[start_ms, end_ms]``.
+
+        Without ``query`` the coin's tagged articles are ranked by how
+        prominently they name it; with one, only articles matching every
+        query word are returned, best match first. Ties go to newer
+        articles. Summaries are truncated to ``SUMMARY_CHARS``.
+        """
+        self._maybe_refresh()
+        conn = self._connect()
+        symbol = coin_symbol(coin)
+        terms = _QUERY_TERM.findall(query or "")
+        match = " ".join(_match_terms([term]) for term in terms) if terms else _match_terms(
+            COIN_ALIASES.get(symbol, (symbol.lower(),))
+        )
+        if terms and symbol not in COIN_ALIASES:
+            match = f"{_match_terms([symbol.lower()])} AND {match}"
+        window = {
+            "symbol": symbol,
+            "start": start_ms,
+            "end": end_ms,
+            "first_id": start_ms * IDS_PER_MS,
+            "last_id": end_ms * IDS_PER_MS + IDS_PER_MS - 1,
+            "match": match,
+            "limit": limit,
+        }
+        # Ids are time-ordered, so FTS5 only scores matches inside the window.
+        matches = f"""
+            m AS MATERIALIZED (
+                SELECT rowid AS id, bm25(articles_fts, {TITLE_WEIGHT}, {SUMMARY_WEIGHT}) AS score
+                FROM articles_fts WHERE articles_fts MATCH :match AND rowid BETWEEN :first_id AND :last_id
+            )
+        """
+        tagged = "SELECT article_id FROM article_symbols WHERE symbol = :symbol AND published_at BETWEEN :start AND :end"
+        if symbol not in COIN_ALIASES:
+            # Coins that are never tagged are found by their ticker alone.
+            ranked, counted = "SELECT id, score FROM m", "SELECT count(*) FROM m"
+        elif terms:
+            # Scoring the matches once up front keeps SQLite from probing the
+            # FTS index per tagged article, which is an order of magnitude slower.
+            ranked = f"SELECT id, score FROM m WHERE id IN ({tagged})"
+            counted = f"SELECT count(*) FROM m WHERE id IN ({tagged})"
+        else:
+            # Every tagged article, those naming the coin most prominently first.
+            ranked = f"SELECT t.article_id AS id, m.score FROM ({tagged}) t LEFT JOIN m ON m.id = t.article_id"
+            counted = f"SELECT count(*) FROM ({tagged})"
+        rows = conn.execute(
+            f"""
+            WITH {matches}
+            SELECT a.title, a.source, a.published_at, a.url, a.summary
+            FROM ({ranked}) r JOIN articles a ON a.id = r.id
+            ORDER BY r.score IS NULL, r.score, r.id DESC LIMIT :limit
+            """,
+            window,
+        ).fetchall()
+        total = conn.execute(f"WITH {matches} {counted}", window).fetchone()[0]
+        return {
+            "symbol": symbol,
+            "total": total,
+            "articles": [
+                {
+                    "title": title,
+                    "source": source,
+                    "published_at": format_epoch_ms(published),
+                    "url": url,
+                    "summary": truncate(summary or ""),
+                }
+                for title, source, published, url, summary in rows
+            ],
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_default_store: Optional[NewsStore] = None
+_default_store_guard = threading.Lock()
+
+
+def get_news_store() -> NewsStore:
+    """Return the process-wide news archive at ``NEWS_DB_PATH``."""
+    global _default_store
+    with _default_store_guard:
+        if _default_store is None:
+            _default_store = NewsStore(config["NEWS_DB_PATH"], config["NEWS_FEEDS"], config["NEWS_REFRESH_SECONDS"])
+        return _default_store
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest news into the local archive and search it.")
+    parser.add_argument("sources", nargs="*", help="Feed URLs, RSS/Atom files or JSON/JSONL exports to ingest")
+    parser.add_argument("--refresh", action="store_true", help="Ingest the configured NEWS_FEEDS")
+    parser.add_argument("--search", metavar="COIN", help="Search the archive for a coin")
+    parser.add_argument("--start", help="Window start (ISO date or time)")
+    parser.add_argument("--end", help="Window end (ISO date or time)")
+    parser.add_argument("--query", help="Words every returned article must contain")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    store = NewsStore(config["NEWS_DB_PATH"], config["NEWS_FEEDS"], refresh_seconds=0)
+    if args.refresh:
+        print(f"{store.refresh()} new articles from {len(store.feeds)} feeds")
+    for source in args.sources:
+        print(f"{source}: {store.ingest(read_source(source))} new articles")
+    if args.search:
+        end_ms = to_epoch_ms(args.end) if args.end else int(time.time() * 1000)
+        start_ms = to_epoch_ms(args.start) if args.start else end_ms - 7 * 86_400_000
+        started = time.perf_counter()
+        result = store.search(args.search, start_ms, end_ms, args.query, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{result['symbol']}: {result['total']} articles, top {len(result['articles'])} in {elapsed:.1f} ms")
+        for article in result["articles"]:
+            print(f"  {article['published_at']}  {article['title']} ({article['source']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,355 @@
+"""Tiered cache for slow-changing upstream responses.
+
+Company fundamentals change quarterly, the market movers snapshot a few
+times an hour and quotes every few seconds, yet the tools used to fetch all
+of them on every call. :class:`ResponseCache` keeps validated responses per
+request with a TTL policy per Alpha Vantage endpoint (``function``):
+
+* an in-process LRU answers repeated calls without any I/O;
+* a ``response_cache`` table on ``DATABASE_URL`` (when configured) is shared
+  by every worker and process, so one fetch serves all of them;
+* an entry past its TTL is still served for a while (the stale window)
+  and refreshed in the background, so callers never wait on a refresh.
+  Only entries past the stale window, or missing, are fetched inline.
+
+Only what ``fetch`` returns is cached, so API errors and rate-limit notes
+(which the tools raise as ``ValueError``) are never stored. Cached values
+are shared between callers; treat them as read-only.
+
+Usage::
+
+    cache = get_response_cache()
+    data = cache.get_or_fetch(params, lambda: parse(get_json(..., params)))
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Float, String, Text, delete, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.config.constant import config
+from src.config.db import Base, get_engine
+from src.utils.metrics import CACHE_REQUESTS
+from src.utils.singleflight import request_key
+
+logger = logging.getLogger(__name__)
+
+# Parameters that do not change the response and must not split the cache.
+_IGNORED_PARAMS = {"apikey"}
+
+
+class CachePolicy(NamedTuple):
+    # Seconds an entry is fresh; 0 never expires.
+    ttl: float
+    # Further seconds an expired entry is served while it is refreshed.
+    stale: float
+
+    def state(self, age: float) -> str:
+        """``fresh``, ``stale`` or ``expired`` for an entry of ``age`` seconds."""
+        if not self.ttl or age < self.ttl:
+            return "fresh"
+        return "stale" if age < self.ttl + self.stale else "expired"
+
+
+def policy_for(endpoint: str) -> Optional[CachePolicy]:
+    """The configured policy of an endpoint, or ``None`` if it is not cached."""
+    ttl = config["RESPONSE_CACHE_TTL_SECONDS"].get(endpoint)
+    if ttl is None or ttl < 0:
+        return None
+    return CachePolicy(ttl, ttl * config["RESPONSE_CACHE_STALE_RATIO"])
+
+
+def cache_key(params: Mapping[str, Any]) -> str:
+    """Stable key of a request, shared across processes."""
+    provider_key = request_key("alphavantage", "", {k: v for k, v in params.items() if k not in _IGNORED_PARAMS})
+    return hashlib.sha256(repr(provider_key).encode("utf-8")).hexdigest()
+
+
+class _Entry(NamedTuple):
+    value: Any
+    fetched_at: float
+
+
+class ResponseCacheEntry(Base):
+    __tablename__ = "response_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    endpoint: Mapped[str] = mapped_column(String(64))
+    value: Mapped[str] = mapped_column(Text)
+    fetched_at: Mapped[float] = mapped_column(Float)
+    expires_at: Mapped[float] = mapped_column(Float, index=True)
+
+
+class ResponseCache:
+    """Two-tier (memory LRU, then database) cache with stale-while-revalidate.
+
+    Args:
+        max_entries: Responses kept in memory; ``0`` disables the memory tier.
+        shared: Also read and write the ``response_cache`` table.
+    """
+
+    def __init__(self, max_entries: int = 1024, shared: bool = False):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        # Strong references to background refresh tasks until they finish.
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._ready = False
+
+    # ------------------------------------------------------------ memory tier
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    # ---------------------------------------------------------- shared tier
+
+    def _session(self) -> Session:
+        engine = get_engine()
+        if not self._ready:
+            Base.metadata.create_all(engine, tables=[ResponseCacheEntry.__table__])
+            self._ready = True
+        return Session(engine)
+
+    def _load(self, keys: List[str]) -> Dict[str, _Entry]:
+        if not self.shared or not keys:
+            return {}
+        try:
+            with self._session() as session:
+                rows = session.scalars(select(ResponseCacheEntry).where(ResponseCacheEntry.key.in_(keys)))
+                return {row.key: _Entry(json.loads(row.value), row.fetched_at) for row in rows}
+        except Exception:
+            # An unreachable database degrades to the memory tier, not an error.
+            logger.warning("Could not read the shared response cache", exc_info=True)
+            return {}
+
+    def _store(self, items: List[Tuple[str, str, CachePolicy, _Entry]]) -> None:
+        if not self.shared or not items:
+            return
+        now = time.time()
+        with self._session() as session:
+            for key, endpoint, policy, entry in items:
+                session.merge(ResponseCacheEntry(
+                    key=key,
+                    endpoint=endpoint,
+                    value=json.dumps(entry.value, separators=(",", ":")),
+                    fetched_at=entry.fetched_at,
+                    expires_at=entry.fetched_at + policy.ttl + policy.stale if policy.ttl else 0.0,
+                ))
+            session.execute(
+                delete(ResponseCacheEntry).where(ResponseCacheEntry.expires_at > 0, ResponseCacheEntry.expires_at <= now)
+            )
+            session.commit()
+
+    def _lookup_many(self, keys: List[str], policies: List[CachePolicy]) -> List[Optional[_Entry]]:
+        """The newest usable entries from memory, falling back to the database."""
+        entries = [self._recall(key) for key in keys]
+        now = time.time()
+        # Another worker may have refreshed what is missing or stale here.
+        reload = [
+            key for key, entry, policy in zip(keys, entries, policies)
+            if entry is None or policy.state(now - entry.fetched_at) != "fresh"
+        ]
+        stored = self._load(reload)
+        for index, key in enumerate(keys):
+            entry, newer = entries[index], stored.get(key)
+            if newer is not None and (entry is None or newer.fetched_at > entry.fetched_at):
+                entries[index] = entry = newer
+                self._remember(key, entry)
+            if entry is not None and policies[index].state(time.time() - entry.fetched_at) == "expired":
+                entries[index] = None
+        return entries
+
+    def _lookup(self, key: str, policy: CachePolicy) -> Optional[_Entry]:
+        return self._lookup_many([key], [policy])[0]
+
+    def _save_many(self, items: List[Tuple[str, str, CachePolicy, Any]]) -> None:
+        now = time.time()
+        entries = [(key, endpoint, policy, _Entry(value, now)) for key, endpoint, policy, value in items]
+        for key, _, _, entry in entries:
+            self._remember(key, entry)
+        try:
+            self._store(entries)
+        except Exception:
+            # The memory tier still has them; the next write will try again.
+            logger.warning("Could not write to the shared response cache", exc_info=True)
+
+    def _save(self, key: str, endpoint: str, policy: CachePolicy, value: Any) -> None:
+        self._save_many([(key, endpoint, policy, value)])
+
+    def _claim(self, key: str) -> bool:
+        """Mark ``key`` as being refreshed; ``False`` if it already is."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    # ------------------------------------------------------------------ sync
+
+    def get_or_fetch(self, params: Mapping[str, Any], fetch: Callable[[], Any]) -> Any:
+        """Return the cached response for ``params``, calling ``fetch`` if needed.
+
+        ``params`` are the upstream request parameters; ``function`` selects
+        the policy, and endpoints without one are always fetched.
+        """
+        endpoint = str(params.get("function", ""))
+        policy = policy_for(endpoint)
+        if policy is None:
+            return fetch()
+        key = cache_key(params)
+        entry = self._lookup(key, policy)
+        if entry is None:
+            CACHE_REQUESTS.labels("response", "miss").inc()
+            value = fetch()
+            self._save(key, endpoint, policy, value)
+            return value
+        if policy.state(time.time() - entry.fetched_at) == "stale":
+            CACHE_REQUESTS.labels("response", "stale").inc()
+            if self._claim(key):
+                threading.Thread(
+                    target=self._refresh, args=(key, endpoint, policy, fetch), name=f"refresh-{endpoint}", daemon=True
+                ).start()
+        else:
+            CACHE_REQUESTS.labels("response", "hit").inc()
+        return entry.value
+
+    def _refresh(self, key: str, endpoint: str, policy: CachePolicy, fetch: Callable[[], Any]) -> None:
+        try:
+            self._save(key, endpoint, policy, fetch())
+        except Exception:
+            logger.warning("Background refresh of %s failed; serving the stale response", endpoint, exc_info=True)
+        finally:
+            self._release(key)
+
+    # ----------------------------------------------------------------- async
+
+    async def aget_or_fetch(self, params: Mapping[str, Any], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of :meth:`get_or_fetch`.
+
+        Memory hits never leave the event loop; database reads and writes run
+        in a worker thread and refreshes in a background task.
+        """
+        endpoint = str(params.get("function", ""))
+        policy = policy_for(endpoint)
+        if policy is None:
+            return await fetch()
+        key = cache_key(params)
+        entry = self._recall(key)
+        if self.shared and (entry is None or policy.state(time.time() - entry.fetched_at) != "fresh"):
+            entry = await asyncio.to_thread(self._lookup, key, policy)
+        elif entry is not None and policy.state(time.time() - entry.fetched_at) == "expired":
+            entry = None
+        if entry is None:
+            CACHE_REQUESTS.labels("response", "miss").inc()
+            value = await fetch()
+            await self._asave(key, endpoint, policy, value)
+            return value
+        if policy.state(time.time() - entry.fetched_at) == "stale":
+            CACHE_REQUESTS.labels("response", "stale").inc()
+            if self._claim(key):
+                task = asyncio.get_running_loop().create_task(self._arefresh(key, endpoint, policy, fetch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        else:
+            CACHE_REQUESTS.labels("response", "hit").inc()
+        return entry.value
+
+    async def _asave(self, key: str, endpoint: str, policy: CachePolicy, value: Any) -> None:
+        if self.shared:
+            await asyncio.to_thread(self._save, key, endpoint, policy, value)
+        else:
+            self._save(key, endpoint, policy, value)
+
+    async def _arefresh(self, key: str, endpoint: str, policy: CachePolicy, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._asave(key, endpoint, policy, await fetch())
+        except Exception:
+            logger.warning("Background refresh of %s failed; serving the stale response", endpoint, exc_info=True)
+        finally:
+            self._release(key)
+
+    # ------------------------------------------------------------------ bulk
+
+    def peek_many(self, requests: Sequence[Mapping[str, Any]]) -> List[Optional[Any]]:
+        """Fresh cached responses for several requests, ``None`` for the rest.
+
+        Never fetches: bulk callers use it to request only what is missing or
+        stale in one batched upstream call, then store the results with
+        :meth:`put_many`. Reads the database in one query.
+        """
+        slots = [(index, cache_key(params), policy_for(str(params.get("function", ""))))
+                 for index, params in enumerate(requests)]
+        slots = [slot for slot in slots if slot[2] is not None]
+        results: List[Optional[Any]] = [None] * len(requests)
+        entries = self._lookup_many([key for _, key, _ in slots], [policy for _, _, policy in slots])
+        now = time.time()
+        for (index, _, policy), entry in zip(slots, entries):
+            if entry is not None and policy.state(now - entry.fetched_at) == "fresh":
+                results[index] = entry.value
+        CACHE_REQUESTS.labels("response", "hit").inc(sum(value is not None for value in results))
+        CACHE_REQUESTS.labels("response", "miss").inc(sum(value is None for value in results))
+        return results
+
+    def put_many(self, requests: Sequence[Mapping[str, Any]], values: Sequence[Any]) -> None:
+        """Cache ``values`` as the responses to ``requests`` (one write)."""
+        items = []
+        for params, value in zip(requests, values):
+            endpoint = str(params.get("function", ""))
+            policy = policy_for(endpoint)
+            if policy is not None:
+                items.append((cache_key(params), endpoint, policy, value))
+        self._save_many(items)
+
+    def clear(self) -> None:
+        """Drop every cached response from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.shared:
+            with self._session() as session:
+                session.execute(delete(ResponseCacheEntry))
+                session.commit()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_guard = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache.
+
+    The database tier is used when ``DATABASE_URL`` is configured.
+    """
+    global _default_cache
+    with _default_cache_guard:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                max_entries=config["RESPONSE_CACHE_MAX_ENTRIES"],
+                shared=bool(config["DATABASE_URL"]),
+            )
+        return _default_cache
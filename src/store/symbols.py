@@ -0,0 +1,343 @@
+"""Local symbol index for stock search.
+
+Alpha Vantage's ``LISTING_STATUS`` dump (every active US listing, one CSV
+row each) is kept at ``SYMBOL_INDEX_PATH`` and loaded into a
+:class:`SymbolIndex` so that ``search_stocks`` resolves names and tickers
+without spending an upstream request. The dump is refreshed in a
+background thread once it is older than ``SYMBOL_INDEX_TTL_SECONDS``; the
+previous index keeps serving until the new one is built.
+
+Matching, best first:
+
+* exact ticker (punctuation ignored, so ``BRK.B`` finds ``BRK-B``);
+* ticker prefix and company name prefix;
+* name tokens: every query word is a prefix of a word of the name, in any
+  order (``"alphabet class a"``);
+* fuzzy: tickers and name words within a small edit distance of the query
+  (``"mircosoft"``), used only when nothing matches exactly.
+
+Prefix lookups bisect sorted key arrays (a flattened trie, much smaller
+than a node-per-character tree for ~12k listings), so exact and prefix
+queries take tens of microseconds and fuzzy ones well under a millisecond.
+
+Usage:
+    python -m src.store.symbols apple "micro soft" --refresh
+"""
+
+import argparse
+import bisect
+import csv
+import io
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.config import config
+
+LISTING_COLUMNS = ["symbol", "name", "exchange", "assetType", "ipoDate", "delistingDate", "status"]
+
+# Results per query, matching Alpha Vantage's SYMBOL_SEARCH.
+DEFAULT_LIMIT = 10
+# Prefix matches examined per key array; enough to rank short prefixes.
+PREFIX_SCAN = 200
+# Back-off before retrying a failed background refresh.
+REFRESH_RETRY_SECONDS = 300
+# Words too common in company names to narrow a search on their own.
+STOPWORDS = {"INC", "CORP", "CORPORATION", "CO", "COMPANY", "LTD", "PLC", "THE", "AND", "OF", "CLASS", "HOLDINGS"}
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+
+class Listing(NamedTuple):
+    symbol: str
+    name: str
+    exchange: str
+    asset_type: str
+
+
+def normalize(text: str) -> str:
+    """Upper-case ``text`` and reduce punctuation runs to single spaces."""
+    return _NON_ALNUM.sub(" ", text.upper()).strip()
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of ``a`` and ``b``, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _fuzzy_limit(token: str) -> int:
+    return 0 if len(token) < 4 else 1 if len(token) < 8 else 2
+
+
+def _prefix_range(keys: Sequence[Tuple[str, int]], prefix: str, limit: int = PREFIX_SCAN) -> Iterator[Tuple[str, int]]:
+    """Yield up to ``limit`` ``(key, id)`` pairs of a sorted array whose key starts with ``prefix``."""
+    position = bisect.bisect_left(keys, (prefix, -1))
+    for key, entry in keys[position:position + limit]:
+        if not key.startswith(prefix):
+            return
+        yield key, entry
+
+
+class SymbolIndex:
+    """In-memory search index over a list of listings."""
+
+    def __init__(self, listings: Iterable[Listing]):
+        self.listings: List[Listing] = list(listings)
+        self._symbols: List[Tuple[str, int]] = []
+        self._names: List[Tuple[str, int]] = []
+        self._name_chars: List[int] = []
+        self._name_tokens: List[Tuple[str, ...]] = []
+        token_ids: Dict[str, List[int]] = {}
+        for entry, listing in enumerate(self.listings):
+            self._symbols.append((normalize(listing.symbol).replace(" ", ""), entry))
+            name = normalize(listing.name)
+            self._names.append((name, entry))
+            self._name_chars.append(max(1, len(name.replace(" ", ""))))
+            self._name_tokens.append(tuple(set(name.split())))
+            for token in self._name_tokens[-1]:
+                token_ids.setdefault(token, []).append(entry)
+        self._symbols.sort()
+        self._names.sort()
+        self._tokens: List[Tuple[str, int]] = sorted((token, 0) for token in token_ids)
+        self._token_ids = token_ids
+        # Fuzzy candidates are bucketed by first character and length.
+        self._fuzzy: Dict[Tuple[str, int], List[Tuple[str, Optional[int]]]] = {}
+        for key, entry in self._symbols:
+            if key:
+                self._fuzzy.setdefault((key[0], len(key)), []).append((key, entry))
+        for token in token_ids:
+            if token not in STOPWORDS and len(token) >= 4:
+                self._fuzzy.setdefault((token[0], len(token)), []).append((token, None))
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    @classmethod
+    def from_csv(cls, text: str) -> "SymbolIndex":
+        """Build an index from a ``LISTING_STATUS`` CSV dump."""
+        reader = csv.DictReader(io.StringIO(text))
+        missing = set(LISTING_COLUMNS[:4]) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Listing dump is missing columns {sorted(missing)}")
+        return cls(
+            Listing(row["symbol"], row["name"] or row["symbol"], row["exchange"], row["assetType"])
+            for row in reader
+            if row.get("symbol") and (row.get("status") or "Active") == "Active"
+        )
+
+    def _token_matches(self, tokens: List[str]) -> Dict[int, float]:
+        """Listings whose name has a word starting with every query token."""
+        # Candidates come from the most selective (longest) token; the
+        # others are checked against each candidate's own words.
+        first, *rest = sorted(tokens, key=len, reverse=True)
+        if len(first) < 2:
+            # A lone letter is a prefix of thousands of words.
+            return {}
+        matched = set()
+        for name_token, _ in _prefix_range(self._tokens, first):
+            matched.update(self._token_ids[name_token])
+        for token in rest:
+            matched = {e for e in matched if any(word.startswith(token) for word in self._name_tokens[e])}
+        query_chars = sum(len(token) for token in tokens)
+        # Whole-word hits break ties, e.g. "class a" between share classes.
+        return {
+            entry: 0.4
+            + 0.25 * min(1.0, query_chars / self._name_chars[entry])
+            + 0.05 * sum(token in self._name_tokens[entry] for token in tokens) / len(tokens)
+            for entry in matched
+        }
+
+    def _fuzzy_matches(self, query: str, tokens: List[str]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for token in {query, *tokens}:
+            limit = _fuzzy_limit(token)
+            if not limit:
+                continue
+            chars = set(token)
+            for length in range(len(token) - limit, len(token) + limit + 1):
+                for key, entry in self._fuzzy.get((token[0], length), ()):
+                    # Each edit adds or removes at most two distinct characters.
+                    if len(chars.symmetric_difference(key)) > 2 * limit:
+                        continue
+                    distance = edit_distance(token, key, limit)
+                    if distance > limit:
+                        continue
+                    score = 0.3 * (1 - distance / max(len(token), len(key))) + 0.05
+                    entries = [entry] if entry is not None else self._token_ids[key]
+                    for matched in entries:
+                        scores[matched] = max(scores.get(matched, 0.0), score)
+        return scores
+
+    def search(self, keywords: str, limit: int = DEFAULT_LIMIT) -> List[Tuple[Listing, float]]:
+        """Return up to ``limit`` ``(listing, match_score)`` pairs, best first."""
+        query = normalize(keywords)
+        if not query:
+            return []
+        compact = query.replace(" ", "")
+        scores: Dict[int, float] = {}
+
+        def add(entry: int, score: float) -> None:
+            if score > scores.get(entry, 0.0):
+                scores[entry] = score
+
+        for key, entry in _prefix_range(self._symbols, compact):
+            add(entry, 1.0 if key == compact else 0.6 + 0.3 * len(compact) / len(key))
+        for key, entry in _prefix_range(self._names, query):
+            add(entry, 0.5 + 0.4 * len(query) / len(key))
+        tokens = [token for token in query.split() if token not in STOPWORDS] or query.split()
+        for entry, score in self._token_matches(tokens).items():
+            add(entry, score)
+        if not scores:
+            for entry, score in self._fuzzy_matches(compact, tokens).items():
+                add(entry, score)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(self.listings[item[0]].symbol), self.listings[item[0]].symbol))
+        return [(self.listings[entry], round(score, 4)) for entry, score in ranked[:limit]]
+
+
+def _download_listing() -> str:
+    """Fetch the current ``LISTING_STATUS`` CSV from Alpha Vantage."""
+    from src.utils.http import ALPHA_VANTAGE_URL, get
+
+    params = {"function": "LISTING_STATUS", "apikey": config["ALPHA_VANTAGE"]}
+    text = get("alphavantage", ALPHA_VANTAGE_URL, params).text
+    if not text.lstrip().startswith("symbol,"):
+        # Errors and rate-limit notes come back as JSON instead of CSV.
+        raise ValueError(f"Unexpected LISTING_STATUS response: {text[:200]!r}")
+    return text
+
+
+class SymbolDirectory:
+    """Owns the listing dump on disk and the index built from it.
+
+    Args:
+        path: CSV file holding the latest ``LISTING_STATUS`` dump.
+        ttl_seconds: Age after which the dump is refreshed; ``0`` never refreshes.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._index: Optional[SymbolIndex] = None
+        self._fetched_at = 0.0
+        self._retry_at = 0.0
+        self._loaded = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                self._index = SymbolIndex.from_csv(handle.read())
+            self._fetched_at = os.path.getmtime(self.path)
+        except (OSError, ValueError):
+            self._index = None
+
+    def index(self) -> Optional[SymbolIndex]:
+        """The current index, or ``None`` until a dump has been downloaded.
+
+        Never blocks on the network: a missing or stale dump is refreshed in
+        a background thread.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+        now = time.time()
+        stale = self._index is None or (self.ttl_seconds and now - self._fetched_at > self.ttl_seconds)
+        if stale and now >= self._retry_at:
+            self.refresh(wait=False)
+        return self._index
+
+    def refresh(self, wait: bool = True) -> Optional[SymbolIndex]:
+        """Download a fresh dump and swap in its index.
+
+        With ``wait=False`` the download runs in a daemon thread, failures
+        are retried after ``REFRESH_RETRY_SECONDS`` and at most one refresh
+        is in flight at a time. With ``wait=True`` failures are raised.
+        """
+        with self._lock:
+            if self._refreshing:
+                return self._index
+            self._refreshing = True
+        if not wait:
+            threading.Thread(target=self._refresh, name="symbol-index-refresh", daemon=True).start()
+            return self._index
+        self._refresh(raise_errors=True)
+        return self._index
+
+    def _refresh(self, raise_errors: bool = False) -> None:
+        try:
+            text = _download_listing()
+            index = SymbolIndex.from_csv(text)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8", newline="") as handle:
+                handle.write(text)
+            os.replace(temp_path, self.path)
+            self._index, self._fetched_at, self._loaded = index, time.time(), True
+        except Exception:
+            # Keep serving the previous index (or the network fallback).
+            self._retry_at = time.time() + REFRESH_RETRY_SECONDS
+            if raise_errors:
+                raise
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+_default_directory: Optional[SymbolDirectory] = None
+_default_directory_guard = threading.Lock()
+
+
+def get_symbol_directory() -> Optional[SymbolDirectory]:
+    """Return the process-wide symbol directory, or ``None`` when disabled.
+
+    The local index is disabled when ``SYMBOL_INDEX_TTL_SECONDS`` is negative.
+    """
+    global _default_directory
+    if config["SYMBOL_INDEX_TTL_SECONDS"] < 0:
+        return None
+    with _default_directory_guard:
+        if _default_directory is None:
+            _default_directory = SymbolDirectory(config["SYMBOL_INDEX_PATH"], config["SYMBOL_INDEX_TTL_SECONDS"])
+        return _default_directory
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the local symbol index.")
+    parser.add_argument("keywords", nargs="*", help="Queries to run against the index")
+    parser.add_argument("--refresh", action="store_true", help="Download a fresh listing dump first")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    directory = SymbolDirectory(config["SYMBOL_INDEX_PATH"], config["SYMBOL_INDEX_TTL_SECONDS"])
+    index = directory.refresh() if args.refresh else directory.index()
+    if index is None:
+        print(f"No listing dump at {directory.path}; run with --refresh")
+        return 1
+    print(f"{len(index)} listings from {directory.path}")
+    for keywords in args.keywords:
+        started = time.perf_counter()
+        matches = index.search(keywords, args.limit)
+        print(f"\n{keywords!r}: {len(matches)} matches in {(time.perf_counter() - started) * 1e6:.0f} us")
+        for listing, score in matches:
+            print(f"  {score:.4f}  {listing.symbol:<8} {listing.name} ({listing.exchange}, {listing.asset_type})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
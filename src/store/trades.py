@@ -0,0 +1,277 @@
+"""Trade history store.
+
+User fills live in the ``trades`` table of ``DATABASE_URL``, indexed on
+``(user_address, timestamp)`` for per-user history and ``(pair, timestamp)``
+for per-market scans. Timestamps are stored as UTC epoch milliseconds.
+
+Exchange exports are loaded in batches: PostgreSQL (psycopg2) uses
+``COPY FROM STDIN``; other databases use ``executemany`` inserts. Range
+queries stream rows with server-side cursors (``stream_results``) so a user
+with hundreds of thousands of fills is never materialised in memory.
+
+Usage:
+    python -m src.store.trades fills.csv [fills.jsonl ...] [--user ADDRESS]
+"""
+
+import argparse
+import csv
+import io
+import json
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from sqlalchemy import BigInteger, Float, Index, Integer, String, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.config.db import Base, get_engine
+from src.utils.dates import format_epoch_ms, to_epoch_ms
+
+TRADE_COLUMNS = ["user_address", "timestamp", "pair", "side", "price", "amount", "tx_hash"]
+
+# Alternative header names seen in exchange exports -> canonical column.
+FIELD_ALIASES = {
+    "user": "user_address",
+    "address": "user_address",
+    "wallet": "user_address",
+    "time": "timestamp",
+    "date": "timestamp",
+    "date(utc)": "timestamp",
+    "symbol": "pair",
+    "market": "pair",
+    "type": "side",
+    "qty": "amount",
+    "quantity": "amount",
+    "executed": "amount",
+    "size": "amount",
+    "txid": "tx_hash",
+    "trade_id": "tx_hash",
+}
+
+
+class Trade(Base):
+    __tablename__ = "trades"
+    __table_args__ = (
+        Index("ix_trades_user_timestamp", "user_address", "timestamp"),
+        Index("ix_trades_pair_timestamp", "pair", "timestamp"),
+    )
+
+    # SQLite only auto-increments INTEGER primary keys.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_address: Mapped[str] = mapped_column(String(128))
+    timestamp: Mapped[int] = mapped_column(BigInteger)
+    pair: Mapped[str] = mapped_column(String(32))
+    side: Mapped[str] = mapped_column(String(4))
+    price: Mapped[float] = mapped_column(Float)
+    amount: Mapped[float] = mapped_column(Float)
+    tx_hash: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+
+
+def normalize_trade(row: Mapping[str, Any], user_address: Optional[str] = None) -> Dict[str, Any]:
+    """Map one export row onto the ``trades`` columns.
+
+    Raises:
+        ValueError: If a required field is missing or malformed.
+    """
+    fields: Dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        name = key.strip().lower()
+        fields[FIELD_ALIASES.get(name, name)] = value
+    if user_address:
+        fields["user_address"] = user_address
+    missing = [c for c in TRADE_COLUMNS[:-1] if c not in fields]
+    if missing:
+        raise ValueError(f"Trade row is missing {missing}: {dict(row)}")
+
+    side = str(fields["side"]).strip().lower()
+    if side not in ("buy", "sell"):
+        raise ValueError(f"Unknown trade side {fields['side']!r}")
+    return {
+        "user_address": str(fields["user_address"]).strip(),
+        "timestamp": to_epoch_ms(fields["timestamp"]),
+        "pair": str(fields["pair"]).strip().upper(),
+        "side": side,
+        "price": float(fields["price"]),
+        "amount": float(fields["amount"]),
+        "tx_hash": str(fields["tx_hash"]).strip() if fields.get("tx_hash") else None,
+    }
+
+
+def read_export(path: str) -> Iterator[Mapping[str, Any]]:
+    """Yield raw rows from a CSV (header row) or JSONL export."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _row_dict(row: Any) -> Dict[str, Any]:
+    trade = dict(row._mapping)
+    trade["timestamp"] = format_epoch_ms(trade["timestamp"])
+    return trade
+
+
+class TradeStore:
+    """Bulk ingest and streaming range queries over the ``trades`` table."""
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self._engine = engine
+        self._ready = False
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            self._engine = get_engine()
+        if not self._ready:
+            Base.metadata.create_all(self._engine, tables=[Trade.__table__])
+            self._ready = True
+        return self._engine
+
+    def ingest(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        user_address: Optional[str] = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """Insert trades in batches and return how many were written.
+
+        ``rows`` may be raw export rows; each is passed through
+        :func:`normalize_trade`. Rows are consumed lazily, one batch at a
+        time, and each batch is committed on its own.
+        """
+        engine = self.engine
+        use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+        normalized = (normalize_trade(row, user_address) for row in rows)
+        written = 0
+        while batch := list(islice(normalized, batch_size)):
+            if use_copy:
+                self._copy_batch(batch)
+            else:
+                with engine.begin() as conn:
+                    conn.execute(insert(Trade), batch)
+            written += len(batch)
+        return written
+
+    def _copy_batch(self, batch: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for trade in batch:
+            writer.writerow([trade[c] if trade[c] is not None else "" for c in TRADE_COLUMNS])
+        buffer.seek(0)
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {Trade.__tablename__} ({', '.join(TRADE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+            raw.commit()
+        finally:
+            raw.close()
+
+    def _filters(self, user_address: str, start_ms: int, end_ms: int, pair: Optional[str]) -> list:
+        filters = [Trade.user_address == user_address, Trade.timestamp >= start_ms, Trade.timestamp <= end_ms]
+        if pair:
+            filters.append(Trade.pair == pair.upper())
+        return filters
+
+    def iter_trades(
+        self,
+        user_address: str,
+        start_ms: int,
+        end_ms: int,
+        pair: Optional[str] = None,
+        limit: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a user's trades in ``[start_ms, end_ms]``, oldest first.
+
+        Rows are fetched ``chunk_size`` at a time through a server-side
+        cursor; only the current chunk is held in memory. ``limit`` caps
+        the rows returned by the query itself.
+        """
+        columns = [getattr(Trade, c) for c in TRADE_COLUMNS]
+        query = (
+            select(*columns)
+            .where(*self._filters(user_address, start_ms, end_ms, pair))
+            .order_by(Trade.timestamp, Trade.id)
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for row in result:
+                yield _row_dict(row)
+
+    def summarize(
+        self,
+        user_address: str,
+        start_ms: int,
+        end_ms: int,
+        pair: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate a user's trades per pair and side inside the database."""
+        notional = func.sum(Trade.price * Trade.amount)
+        query = (
+            select(
+                Trade.pair,
+                Trade.side,
+                func.count().label("trades"),
+                func.sum(Trade.amount).label("amount"),
+                notional.label("notional"),
+                func.min(Trade.timestamp).label("first"),
+                func.max(Trade.timestamp).label("last"),
+            )
+            .where(*self._filters(user_address, start_ms, end_ms, pair))
+            .group_by(Trade.pair, Trade.side)
+            .order_by(Trade.pair, Trade.side)
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        return [
+            {
+                "pair": row.pair,
+                "side": row.side,
+                "trades": row.trades,
+                "amount": row.amount,
+                "avg_price": row.notional / row.amount if row.amount else None,
+                "first_trade": format_epoch_ms(row.first),
+                "last_trade": format_epoch_ms(row.last),
+            }
+            for row in rows
+        ]
+
+
+_default_store: Optional[TradeStore] = None
+_default_store_guard = threading.Lock()
+
+
+def get_trade_store() -> TradeStore:
+    """Return the process-wide trade store on ``DATABASE_URL``."""
+    global _default_store
+    with _default_store_guard:
+        if _default_store is None:
+            _default_store = TradeStore()
+        return _default_store
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import trade exports into the trades table.")
+    parser.add_argument("paths", nargs="+", help="CSV (header row) or JSONL export files")
+    parser.add_argument("--user", help="User address for exports that do not carry one")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    store = get_trade_store()
+    for path in args.paths:
+        written = store.ingest(read_export(path), user_address=args.user, batch_size=args.batch_size)
+        print(f"{path}: imported {written} trades")
+
+
+if __name__ == "__main__":
+    main()
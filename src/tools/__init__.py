@@ -1,5 +1,4 @@
-from .coin_news import get_coin_news
-from .coin_price import get_coin_price
-from .user_trade import get_user_trade
-from .stock import *
+from src.utils.lazy import lazy_exports
+from .registry import TOOL_MODULES, get_tool, get_tools, tool_names
 
+__all__ = ["get_tool", "get_tools", "tool_names"] + lazy_exports(__name__, TOOL_MODULES)
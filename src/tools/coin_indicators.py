@@ -0,0 +1,68 @@
+"""Technical indicator tool for crypto pairs.
+
+Computes indicators locally from Binance candles (read through the candle
+store) so the LLM receives a few values instead of raw OHLCV rows.
+"""
+
+from typing import List, Dict, Optional
+from langchain_core.tools import tool
+
+from src.analysis.indicators import WARMUP_BARS, indicator_snapshot
+from src.store.candles import Candles
+from src.utils.tooling import async_variant
+from .coin_price import (
+    INTERVAL_MS,
+    afetch_coin_candles,
+    fetch_coin_candles,
+    format_timestamp,
+    parse_at_time,
+    parse_date_range,
+)
+
+
+def _snapshot(candles: Candles, interval: str, start_ms: int, at_ms: Optional[int]) -> List[Dict[str, str]]:
+    step = INTERVAL_MS.get(interval, INTERVAL_MS["1d"])
+    return indicator_snapshot(
+        candles,
+        interval,
+        format_timestamp,
+        window_start_ms=start_ms,
+        at_ms=at_ms,
+        intraday=step < INTERVAL_MS["1d"],
+    )
+
+
+@tool
+def get_coin_indicators(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1h",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Return SMA, EMA, RSI, MACD, Bollinger, ATR and VWAP for a coin.
+
+    Inputs: coin (e.g., BTC or BTCUSDT), start_date, end_date (YYYY-MM-DD),
+    interval in {1m,5m,1h,1d}, optional at_time (ISO timestamp, e.g. the
+    trade time) to evaluate at instead of the window end. Warm-up history
+    before start_date is fetched automatically. Output is a short list of
+    TradingTechnicalIndicator records.
+    """
+    start_ms, _ = parse_date_range(start_date, end_date)
+    at_ms = parse_at_time(at_time)
+    candles = fetch_coin_candles(coin, start_date, end_date, interval, lookback_bars=WARMUP_BARS)
+    return _snapshot(candles, interval, start_ms, at_ms)
+
+
+@async_variant(get_coin_indicators)
+async def aget_coin_indicators(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1h",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    start_ms, _ = parse_date_range(start_date, end_date)
+    at_ms = parse_at_time(at_time)
+    candles = await afetch_coin_candles(coin, start_date, end_date, interval, lookback_bars=WARMUP_BARS)
+    return _snapshot(candles, interval, start_ms, at_ms)
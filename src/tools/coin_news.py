@@ -1,51 +1,70 @@
-"""Utilities for fetching cryptocurrency news.
+"""Cryptocurrency news from the local archive.
 
-This module provides helpers to obtain news articles for a given coin and
-date range. The actual implementation should call a news API (e.g. NewsAPI,
-CoinDesk, CryptoPanic) and normalize the results into a list of dictionaries.
+Articles are ingested from news feeds into the SQLite archive of
+:mod:`src.store.news` ahead of time (in the background, or with
+``python -m src.store.news --refresh``), so a call is an indexed query
+rather than a request to a news API. Results are ranked and their summaries
+truncated to keep the model's context small.
 """
 
-from typing import List, Dict, Optional
+import asyncio
+from typing import Dict, List, Optional
+
 from langchain_core.tools import tool
 
+from src.store import get_news_store
+from src.utils.dates import date_range_ms
+from src.utils.tooling import async_variant
+
+MAX_ARTICLES = 10
+
+
+def _coin_news(coin: str, start_date: str, end_date: str, query: Optional[str]) -> List[Dict[str, Optional[str]]]:
+    start_ms, end_ms = date_range_ms(start_date, end_date)
+    return get_news_store().search(coin, start_ms, end_ms, query, MAX_ARTICLES)["articles"]
+
+
 @tool
-def get_coin_news(coin: str, start_date: str, end_date: str) -> List[Dict[str, Optional[str]]]:
+def get_coin_news(coin: str, start_date: str, end_date: str, query: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
     """Fetch news articles for a cryptocurrency between two dates.
     Parameters
     ----------
     coin : str
-        Symbol or name of the cryptocurrency (e.g. "bitcoin" or "BTC").
+        Symbol, trading pair or name of the cryptocurrency (e.g. "BTC",
+        "BTCUSDT" or "bitcoin").
     start_date : str
-        Inclusive start date in ISO date format (YYYY-MM-DD).
+        Inclusive start date in ISO format (YYYY-MM-DD or a full timestamp).
     end_date : str
-        Inclusive end date in ISO date format (YYYY-MM-DD).
+        Inclusive end date in ISO format (YYYY-MM-DD or a full timestamp).
+    query : Optional[str]
+        Words every returned article must mention (e.g. "ETF approval").
 
     Returns
     -------
     List[Dict[str, Optional[str]]]
-        A list of article objects. Each article dict should contain at least:
+        Up to 10 articles, most relevant first (newest first among equally
+        relevant ones). Each article dict contains:
         - "title" (str): Article title
         - "source" (str): Source name
-        - "published_at" (str): ISO 8601 timestamp
+        - "published_at" (str): ISO 8601 timestamp (UTC)
         - "url" (str): Link to the article
-        - "summary" (Optional[str]): Short summary if available
+        - "summary" (Optional[str]): Summary, truncated to about 280 characters
+
+        An empty list means the archive has no matching articles.
 
     Raises
     ------
     ValueError
         If the provided dates are malformed or start_date > end_date.
-    requests.RequestException
-        If a network request to the news provider fails.
-
-    Notes
-    -----
-    This function is currently a stub (no network calls). Implementations
-    should validate dates, call the chosen news API, and map provider fields
-    to the shape described above.
 
     Example
     -------
     >>> get_coin_news("bitcoin", "2025-01-01", "2025-01-07")
     [{"title": "BTC rallies...", "source": "CoinDesk", "published_at": "2025-01-02T12:34:00Z", "url": "https://...", "summary": "..."}]
     """
-    pass
+    return _coin_news(coin, start_date, end_date, query)
+
+
+@async_variant(get_coin_news)
+async def aget_coin_news(coin: str, start_date: str, end_date: str, query: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    return await asyncio.to_thread(_coin_news, coin, start_date, end_date, query)
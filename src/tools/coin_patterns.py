@@ -0,0 +1,49 @@
+"""Candlestick pattern tool for crypto pairs.
+
+Scans Binance candles (read through the candle store) for classic
+candlestick patterns in one vectorised pass and returns only the hits near
+the trade time, instead of handing raw rows to the LLM.
+"""
+
+from typing import List, Dict, Optional
+from langchain_core.tools import tool
+
+from src.analysis.patterns import BODY_AVG_BARS, TREND_BARS, pattern_events
+from src.utils.tooling import async_variant
+from .coin_price import afetch_coin_candles, fetch_coin_candles, format_timestamp, parse_at_time, parse_date_range
+
+LOOKBACK_BARS = TREND_BARS + BODY_AVG_BARS
+
+@tool
+def get_coin_patterns(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1h",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Return candlestick patterns (doji, hammer, engulfing, stars, ...) for a coin.
+
+    Inputs: coin (e.g., BTC or BTCUSDT), start_date, end_date (YYYY-MM-DD),
+    interval in {1m,5m,1h,1d}, optional at_time (ISO timestamp, e.g. the
+    trade time). Only patterns within 24 bars of at_time (or the last 24
+    bars of the window) are returned, as {timestamp, pattern, signal}.
+    """
+    start_ms, _ = parse_date_range(start_date, end_date)
+    at_ms = parse_at_time(at_time)
+    candles = fetch_coin_candles(coin, start_date, end_date, interval, lookback_bars=LOOKBACK_BARS)
+    return pattern_events(candles, format_timestamp, window_start_ms=start_ms, at_ms=at_ms)
+
+
+@async_variant(get_coin_patterns)
+async def aget_coin_patterns(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1h",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    start_ms, _ = parse_date_range(start_date, end_date)
+    at_ms = parse_at_time(at_time)
+    candles = await afetch_coin_candles(coin, start_date, end_date, interval, lookback_bars=LOOKBACK_BARS)
+    return pattern_events(candles, format_timestamp, window_start_ms=start_ms, at_ms=at_ms)
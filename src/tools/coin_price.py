@@ -1,23 +1,63 @@
 """Minimal crypto OHLCV fetcher tool.
 
-Retrieves compact OHLCV series from Binance klines. Output is bounded and
-downsampled to keep LLM context small.
+Retrieves compact OHLCV series from Binance klines. Output is columnar and
+downsampled to a token budget to keep LLM context small. Candles are read through the local
+candle store so only time ranges that were never fetched before go upstream.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from langchain_core.tools import tool
+import asyncio
 import datetime
-import requests
-from math import ceil
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
-@tool
-def get_coin_price(coin: str, start_date: str, end_date: str, interval: str = "1d") -> List[Dict[str, Optional[Any]]]:
-    """Return compact OHLCV for a coin between two dates at an interval.
+from src.store import get_candle_store
+from src.store.candles import Candles, TimeRange, TIMESTAMP
+from src.utils.encoding import encode_candles
+from src.utils.http import BINANCE_API_URL, aget_json, get_json
+from src.utils.tooling import async_variant
 
-    Inputs: coin (e.g., BTC or BTCUSDT), start_date, end_date (YYYY-MM-DD),
-    interval in {1m,5m,1h,1d}. Output is downsampled to <=250 points.
-    """
-    # Validate inputs
+BINANCE_KLINES_URL = f"{BINANCE_API_URL}/klines"
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Binance returns at most 1000 klines per request; long ranges are paged.
+PAGE_LIMIT = 1000
+MAX_CONCURRENT_PAGES = 8
+
+# Candle duration per Binance interval. "1M" is calendar based; 31 days is
+# only used as an upper bound when deciding whether a candle is closed.
+INTERVAL_MS = {
+    "1s": 1_000,
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "2h": 2 * 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "6h": 6 * 60 * 60_000,
+    "8h": 8 * 60 * 60_000,
+    "12h": 12 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+    "3d": 3 * 24 * 60 * 60_000,
+    "1w": 7 * 24 * 60 * 60_000,
+    "1M": 31 * 24 * 60 * 60_000,
+}
+
+
+def normalize_coin_symbol(coin: str) -> str:
+    """Normalize a coin name to a Binance symbol (default to USDT quote)."""
+    symbol = coin.upper()
+    if len(symbol) <= 5 and not symbol.endswith(("USDT", "USD", "USDC", "BUSD")):
+        symbol = f"{symbol}USDT"
+    return symbol
+
+
+def parse_date_range(start_date: str, end_date: str) -> Tuple[int, int]:
+    """Validate ISO dates and return them as epoch milliseconds."""
     try:
         start_dt = datetime.datetime.fromisoformat(start_date)
         end_dt = datetime.datetime.fromisoformat(end_date)
@@ -25,55 +65,214 @@ def get_coin_price(coin: str, start_date: str, end_date: str, interval: str = "1
         raise ValueError(f"Invalid date(s): {ex}")
     if start_dt > end_dt:
         raise ValueError("start_date cannot be after end_date")
+    return int(start_dt.timestamp() * 1000), int(end_dt.timestamp() * 1000)
+
+
+def parse_at_time(at_time: Optional[str]) -> Optional[int]:
+    """Parse an optional ISO ``at_time`` (e.g. the trade time) to epoch milliseconds."""
+    if not at_time:
+        return None
+    try:
+        return int(datetime.datetime.fromisoformat(at_time).timestamp() * 1000)
+    except Exception as ex:
+        raise ValueError(f"Invalid at_time: {ex}")
+
+
+def _klines_to_candles(klines: List[List[Any]]) -> Candles:
+    rows = np.asarray([k[:6] for k in klines], dtype=np.float64).reshape(-1, 6)
+    candles: Candles = {TIMESTAMP: rows[:, 0].astype(np.int64)}
+    for i, column in enumerate(OHLCV_COLUMNS, start=1):
+        candles[column] = rows[:, i]
+    return candles
 
-    # Normalize symbol (default to USDT if no quote)
-    symbol = coin.upper()
-    if len(symbol) <= 5 and not symbol.endswith(("USDT", "USD", "USDC", "BUSD")):
-        symbol = f"{symbol}USDT"
 
-    url = "https://api.binance.com/api/v3/klines"
-    params = {
+def _klines_params(symbol: str, interval: str, start_ms: int, end_ms: int) -> Dict[str, Any]:
+    return {
         "symbol": symbol,
         "interval": interval,
-        "startTime": int(start_dt.timestamp() * 1000),
-        "endTime": int(end_dt.timestamp() * 1000),
-        "limit": 750,  # cap results
+        "startTime": start_ms,
+        "endTime": end_ms,
+        "limit": PAGE_LIMIT,
+    }
+
+
+def _request_klines(symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List[Any]]:
+    return get_json("binance", BINANCE_KLINES_URL, _klines_params(symbol, interval, start_ms, end_ms))
+
+
+async def _arequest_klines(symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List[Any]]:
+    return await aget_json("binance", BINANCE_KLINES_URL, _klines_params(symbol, interval, start_ms, end_ms))
+
+
+def _page_ranges(start_ms: int, end_ms: int, step: int) -> List[TimeRange]:
+    """Split a range into pages that each hold at most PAGE_LIMIT candles."""
+    span = PAGE_LIMIT * step
+    return [(page_start, min(page_start + span - 1, end_ms)) for page_start in range(start_ms, end_ms + 1, span)]
+
+
+def _is_paged(interval: str) -> bool:
+    """Fixed-width intervals can be split into concurrent pages; "1M" cannot."""
+    return interval in INTERVAL_MS and interval != "1M"
+
+
+def _assemble_klines(
+    pages: List[List[List[Any]]],
+    ranges: List[TimeRange],
+    start_ms: int,
+    covered_end: int,
+    step: int,
+) -> Tuple[Candles, Optional[TimeRange]]:
+    """Concatenate kline pages and work out which range they vouch for."""
+    for (_, page_end), page in zip(ranges, pages):
+        # A full page that stops short of its range means upstream
+        # truncated it; only vouch for what was actually returned.
+        if len(page) >= PAGE_LIMIT and int(page[-1][0]) + step <= page_end:
+            covered_end = min(covered_end, int(page[-1][0]))
+            break
+
+    klines = [k for page in pages for k in page]
+    candles = _klines_to_candles(klines)
+    # Drop duplicate open times where pages touch.
+    _, first = np.unique(candles[TIMESTAMP], return_index=True)
+    if len(first) != len(candles[TIMESTAMP]):
+        candles = {column: values[first] for column, values in candles.items()}
+
+    if covered_end < start_ms:
+        return candles, None
+    return candles, (start_ms, covered_end)
+
+
+def _fetch_klines(symbol: str, interval: str, start_ms: int, end_ms: int) -> Tuple[Candles, Optional[TimeRange]]:
+    """Fetch klines from Binance and report which range is now final.
+
+    Fixed-width intervals are split into pages that are requested
+    concurrently and reassembled in order. Calendar intervals ("1M") fall
+    back to sequential cursor paging.
+    """
+    step = INTERVAL_MS.get(interval, INTERVAL_MS["1d"])
+    covered_end = min(end_ms, int(time.time() * 1000) - step)
+
+    pages: List[List[List[Any]]] = []
+    ranges: List[TimeRange] = []
+    if _is_paged(interval):
+        ranges = _page_ranges(start_ms, end_ms, step)
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PAGES, len(ranges))) as pool:
+            pages = list(pool.map(lambda r: _request_klines(symbol, interval, *r), ranges))
+    else:
+        cursor = start_ms
+        while cursor <= end_ms:
+            page = _request_klines(symbol, interval, cursor, end_ms)
+            pages.append(page)
+            if len(page) < PAGE_LIMIT:
+                break
+            cursor = int(page[-1][0]) + 1
+
+    return _assemble_klines(pages, ranges, start_ms, covered_end, step)
+
+
+async def _afetch_klines(symbol: str, interval: str, start_ms: int, end_ms: int) -> Tuple[Candles, Optional[TimeRange]]:
+    """Async counterpart of :func:`_fetch_klines`."""
+    step = INTERVAL_MS.get(interval, INTERVAL_MS["1d"])
+    covered_end = min(end_ms, int(time.time() * 1000) - step)
+
+    pages: List[List[List[Any]]] = []
+    ranges: List[TimeRange] = []
+    if _is_paged(interval):
+        ranges = _page_ranges(start_ms, end_ms, step)
+        slots = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def request(page_range: TimeRange) -> List[List[Any]]:
+            async with slots:
+                return await _arequest_klines(symbol, interval, *page_range)
+
+        pages = list(await asyncio.gather(*(request(r) for r in ranges)))
+    else:
+        cursor = start_ms
+        while cursor <= end_ms:
+            page = await _arequest_klines(symbol, interval, cursor, end_ms)
+            pages.append(page)
+            if len(page) < PAGE_LIMIT:
+                break
+            cursor = int(page[-1][0]) + 1
+
+    return _assemble_klines(pages, ranges, start_ms, covered_end, step)
+
+
+def _candle_key(coin: str, start_date: str, end_date: str, interval: str, lookback_bars: int) -> Tuple[str, int, int]:
+    start_ms, end_ms = parse_date_range(start_date, end_date)
+    start_ms -= lookback_bars * INTERVAL_MS.get(interval, INTERVAL_MS["1d"])
+    return normalize_coin_symbol(coin), start_ms, end_ms
+
+
+def fetch_coin_candles(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1d",
+    lookback_bars: int = 0,
+) -> Candles:
+    """Return OHLCV candle columns for a coin, reading through the local store.
+
+    ``lookback_bars`` extends the range backwards, e.g. to warm up
+    indicators before ``start_date``.
+    """
+    symbol, start_ms, end_ms = _candle_key(coin, start_date, end_date, interval, lookback_bars)
+    return get_candle_store().read_through(
+        "binance",
+        symbol,
+        interval,
+        start_ms,
+        end_ms,
+        lambda gap_start, gap_end: _fetch_klines(symbol, interval, gap_start, gap_end),
+    )
+
+
+async def afetch_coin_candles(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "1d",
+    lookback_bars: int = 0,
+) -> Candles:
+    """Async counterpart of :func:`fetch_coin_candles`."""
+    symbol, start_ms, end_ms = _candle_key(coin, start_date, end_date, interval, lookback_bars)
+    return await get_candle_store().aread_through(
+        "binance",
+        symbol,
+        interval,
+        start_ms,
+        end_ms,
+        lambda gap_start, gap_end: _afetch_klines(symbol, interval, gap_start, gap_end),
+    )
+
+
+def format_timestamp(ms: int) -> str:
+    """Render an epoch-millis candle time the way the coin tools report it."""
+    return datetime.datetime.fromtimestamp(ms / 1000).isoformat()
+
+
+def _price_payload(coin: str, interval: str, candles: Candles) -> Dict[str, Any]:
+    return {
+        "symbol": normalize_coin_symbol(coin),
+        "interval": interval,
+        **encode_candles(candles, format_timestamp),
     }
 
-    resp = requests.get(url, params=params, timeout=20)
-    resp.raise_for_status()
-    klines = resp.json()
-
-    series: List[Dict[str, Optional[Any]]] = [
-        {
-            "timestamp": datetime.datetime.fromtimestamp(k[0] / 1000).isoformat(),
-            "open": float(k[1]),
-            "high": float(k[2]),
-            "low": float(k[3]),
-            "close": float(k[4]),
-            "volume": float(k[5]),
-        }
-        for k in klines
-    ]
-
-    # Downsample to reduce token usage
-    MAX_POINTS = 500
-    n = len(series)
-    if n > MAX_POINTS:
-        stride = ceil(n / MAX_POINTS)
-        series = series[::stride]
-        # ensure last point included
-        if klines:
-            last = klines[-1]
-            last_ts = datetime.datetime.fromtimestamp(last[0] / 1000).isoformat()
-            if series[-1]["timestamp"] != last_ts:
-                series[-1] = {
-                    "timestamp": last_ts,
-                    "open": float(last[1]),
-                    "high": float(last[2]),
-                    "low": float(last[3]),
-                    "close": float(last[4]),
-                    "volume": float(last[5]),
-                }
-
-    return series
+
+@tool
+def get_coin_price(coin: str, start_date: str, end_date: str, interval: str = "1d") -> Dict[str, Any]:
+    """Return compact OHLCV for a coin between two dates at an interval.
+
+    Inputs: coin (e.g., BTC or BTCUSDT), start_date, end_date (YYYY-MM-DD),
+    interval in {1m,5m,1h,1d}. Output is columnar ({"columns": {"timestamp":
+    [...], "open": [...], ...}}) and, when the series exceeds the token
+    budget, re-bucketed into wider candles that keep every high and low.
+    """
+    candles = fetch_coin_candles(coin, start_date, end_date, interval)
+    return _price_payload(coin, interval, candles)
+
+
+@async_variant(get_coin_price)
+async def aget_coin_price(coin: str, start_date: str, end_date: str, interval: str = "1d") -> Dict[str, Any]:
+    candles = await afetch_coin_candles(coin, start_date, end_date, interval)
+    return _price_payload(coin, interval, candles)
@@ -0,0 +1,73 @@
+"""Multi-interval crypto OHLCV tool.
+
+Fetches a coin's finest requested interval once (through the candle store)
+and builds every coarser interval locally, so one tool call and one
+upstream fetch replace a call per interval.
+"""
+
+from typing import List, Dict, Optional, Any
+from langchain_core.tools import tool
+
+from src.analysis.resample import resample
+from src.store.candles import Candles
+from src.utils.encoding import encode_series_within_budget
+from src.utils.tooling import async_variant
+from .coin_price import INTERVAL_MS, afetch_coin_candles, fetch_coin_candles, format_timestamp
+
+DEFAULT_INTERVALS = ["1m", "5m", "1h", "1d"]
+
+
+def _finest_interval(intervals: List[str]) -> str:
+    """Validate ``intervals`` for local resampling and return the finest one."""
+    unknown = [i for i in intervals if i not in INTERVAL_MS or i == "1M"]
+    if unknown:
+        raise ValueError(f"Unsupported interval(s) for local resampling: {unknown}")
+
+    finest = min(intervals, key=INTERVAL_MS.__getitem__)
+    misaligned = [i for i in intervals if INTERVAL_MS[i] % INTERVAL_MS[finest]]
+    if misaligned:
+        raise ValueError(f"Interval(s) {misaligned} are not multiples of {finest}")
+    return finest
+
+
+def _encode_intervals(base: Candles, intervals: List[str], finest: str) -> Dict[str, Dict[str, Any]]:
+    series = {
+        interval: base if interval == finest else resample(base, INTERVAL_MS[interval])
+        for interval in intervals
+    }
+    return encode_series_within_budget(series, format_timestamp)
+
+
+@tool
+def get_coin_price_multi(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    intervals: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Return compact OHLCV for a coin at several intervals in one call.
+
+    Inputs: coin (e.g., BTC or BTCUSDT), start_date, end_date (YYYY-MM-DD),
+    intervals (default ["1m", "5m", "1h", "1d"]). The finest interval is
+    fetched once and coarser bars are aggregated locally (UTC-aligned, like
+    Binance's own bars; bars at the window edges may be partial). Output
+    maps each interval to a columnar series; together they fit the tool
+    output token budget.
+    """
+    intervals = intervals or DEFAULT_INTERVALS
+    finest = _finest_interval(intervals)
+    base = fetch_coin_candles(coin, start_date, end_date, finest)
+    return _encode_intervals(base, intervals, finest)
+
+
+@async_variant(get_coin_price_multi)
+async def aget_coin_price_multi(
+    coin: str,
+    start_date: str,
+    end_date: str,
+    intervals: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    intervals = intervals or DEFAULT_INTERVALS
+    finest = _finest_interval(intervals)
+    base = await afetch_coin_candles(coin, start_date, end_date, finest)
+    return _encode_intervals(base, intervals, finest)
@@ -0,0 +1,140 @@
+"""Quotes for many coins from Binance's 24h ticker.
+
+All coins are requested with one ``/ticker/24hr?symbols=[...]`` call per 100
+symbols. Binance rejects the whole batch when one symbol is unknown, so a
+failed batch is retried as concurrent single-symbol requests and only the
+unknown coins are reported as errors. Quotes use the same keys as the stock
+quote tools.
+"""
+
+import asyncio
+import datetime
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from langchain_core.tools import tool
+
+from src.utils.http import BINANCE_API_URL, aget_json, get_json
+from src.utils.tooling import async_variant
+from .coin_price import normalize_coin_symbol
+
+BINANCE_TICKER_URL = f"{BINANCE_API_URL}/ticker/24hr"
+
+BATCH_LIMIT = 100
+MAX_CONCURRENT_QUOTES = 8
+
+
+def normalize_coins(coins: List[str]) -> List[str]:
+    """Binance symbols without blanks or duplicates, in input order."""
+    symbols = list(dict.fromkeys(normalize_coin_symbol(c.strip()) for c in coins if c and c.strip()))
+    if not symbols:
+        raise ValueError("coins must contain at least one coin")
+    return symbols
+
+
+def _batch_params(symbols: List[str]) -> Dict[str, Any]:
+    return {"symbols": json.dumps(symbols, separators=(",", ":")), "type": "FULL"}
+
+
+def _normalize_ticker(ticker: Dict[str, Any]) -> Dict[str, Any]:
+    """A 24h ticker in the normalised quote shape."""
+    close_time = datetime.datetime.fromtimestamp(int(ticker.get("closeTime", 0)) / 1000, tz=datetime.timezone.utc)
+    return {
+        "symbol": ticker.get("symbol", ""),
+        "open": float(ticker.get("openPrice", 0)),
+        "high": float(ticker.get("highPrice", 0)),
+        "low": float(ticker.get("lowPrice", 0)),
+        "price": float(ticker.get("lastPrice", 0)),
+        "volume": float(ticker.get("volume", 0)),
+        "latest_trading_day": close_time.strftime("%Y-%m-%d"),
+        "previous_close": float(ticker.get("prevClosePrice", 0)),
+        "change": float(ticker.get("priceChange", 0)),
+        "change_percent": str(ticker.get("priceChangePercent", "0")),
+    }
+
+
+def _parse_batch(data: Any) -> Dict[str, Dict[str, Any]]:
+    if not isinstance(data, list):
+        raise ValueError(f"Unexpected ticker response: {data}")
+    return {ticker["symbol"]: _normalize_ticker(ticker) for ticker in data}
+
+
+def _parse_single(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict) or "symbol" not in data:
+        raise ValueError(f"Unexpected ticker response: {data}")
+    return _normalize_ticker(data)
+
+
+def _collect(symbols: List[str], quotes: Dict[str, Dict[str, Any]], errors: Dict[str, str]) -> List[Dict[str, Any]]:
+    return [quotes[s] if s in quotes else {"symbol": s, "error": errors.get(s, "No ticker data found")} for s in symbols]
+
+
+@tool
+def get_coin_quotes(coins: List[str]) -> List[Dict[str, Any]]:
+    """Get the latest price and 24h statistics for several coins at once.
+
+    Args:
+        coins (List[str]): Coin names or Binance symbols (e.g., ['BTC', 'ETHUSDT']);
+            bare names are quoted against USDT.
+
+    Returns:
+        List[Dict[str, Any]]: One quote per distinct symbol, in input order,
+            with keys 'symbol', 'open', 'high', 'low', 'price', 'volume',
+            'latest_trading_day', 'previous_close', 'change' and
+            'change_percent' over the last 24 hours. A coin that could not be
+            quoted is returned as ``{'symbol': ..., 'error': ...}``.
+
+    Raises:
+        ValueError: If no coin is given.
+    """
+    symbols = normalize_coins(coins)
+    quotes: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    retry: List[str] = []
+    for offset in range(0, len(symbols), BATCH_LIMIT):
+        batch = symbols[offset:offset + BATCH_LIMIT]
+        try:
+            quotes.update(_parse_batch(get_json("binance", BINANCE_TICKER_URL, _batch_params(batch))))
+        except Exception:
+            # One unknown symbol fails the batch; find it symbol by symbol.
+            retry.extend(batch)
+
+    if retry:
+        def fetch(symbol: str) -> None:
+            try:
+                quotes[symbol] = _parse_single(get_json("binance", BINANCE_TICKER_URL, {"symbol": symbol}))
+            except Exception as ex:
+                errors[symbol] = str(ex)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_QUOTES, len(retry))) as pool:
+            list(pool.map(fetch, retry))
+    return _collect(symbols, quotes, errors)
+
+
+@async_variant(get_coin_quotes)
+async def aget_coin_quotes(coins: List[str]) -> List[Dict[str, Any]]:
+    symbols = normalize_coins(coins)
+    quotes: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+
+    async def fetch_batch(batch: List[str]) -> List[str]:
+        try:
+            quotes.update(_parse_batch(await aget_json("binance", BINANCE_TICKER_URL, _batch_params(batch))))
+            return []
+        except Exception:
+            return batch
+
+    batches = [symbols[offset:offset + BATCH_LIMIT] for offset in range(0, len(symbols), BATCH_LIMIT)]
+    retry = [symbol for failed in await asyncio.gather(*map(fetch_batch, batches)) for symbol in failed]
+    slots = asyncio.Semaphore(MAX_CONCURRENT_QUOTES)
+
+    async def fetch(symbol: str) -> None:
+        async with slots:
+            try:
+                quotes[symbol] = _parse_single(await aget_json("binance", BINANCE_TICKER_URL, {"symbol": symbol}))
+            except Exception as ex:
+                errors[symbol] = str(ex)
+
+    await asyncio.gather(*(fetch(symbol) for symbol in retry))
+    return _collect(symbols, quotes, errors)
@@ -0,0 +1,34 @@
+"""Full outputs of earlier tool calls.
+
+The agents keep only a digest of tool results they have already read (see
+:mod:`src.agent.context`); this tool returns the original output behind a
+digest's ``ref`` from the agent state, without repeating the upstream call.
+"""
+
+from typing import Annotated, Any, Dict
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+
+
+@tool
+def recall_tool_output(ref: str, state: Annotated[Dict[str, Any], InjectedState]) -> str:
+    """Return the full output of an earlier tool call that is shown as a digest.
+
+    Args:
+        ref (str): The ``ref`` of the digest (the id of the original tool call).
+
+    Returns:
+        str: The tool's original output, exactly as it was first returned.
+
+    Raises:
+        ValueError: If no earlier tool call has that id.
+    """
+    outputs = state.get("tool_outputs") or {}
+    if ref in outputs:
+        return outputs[ref]
+    for message in state.get("messages", ()):
+        if isinstance(message, ToolMessage) and message.tool_call_id == ref:
+            return message.content if isinstance(message.content, str) else str(message.content)
+    raise ValueError(f"No tool output with ref {ref!r}")
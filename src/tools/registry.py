@@ -0,0 +1,76 @@
+"""Registry of the LangChain tools exposed to the agents.
+
+Tools are listed by name with the module that defines them and are only
+imported when first requested, so a process that uses the coin tools never
+loads pandas or the Alpha Vantage clients, and vice versa.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
+
+# Tool name -> defining module.
+TOOL_MODULES: Dict[str, str] = {
+    "get_coin_news": "src.tools.coin_news",
+    "get_coin_price": "src.tools.coin_price",
+    "get_coin_price_multi": "src.tools.coin_price_multi",
+    "get_coin_indicators": "src.tools.coin_indicators",
+    "get_coin_patterns": "src.tools.coin_patterns",
+    "get_coin_quotes": "src.tools.coin_quotes",
+    "get_user_trade": "src.tools.user_trade",
+    "recall_tool_output": "src.tools.recall",
+    "get_stock_price": "src.tools.stock.get_stock_price",
+    "get_stock_price_multi": "src.tools.stock.get_stock_price_multi",
+    "get_stock_indicators": "src.tools.stock.get_stock_indicators",
+    "get_stock_patterns": "src.tools.stock.get_stock_patterns",
+    "get_stock_quote": "src.tools.stock.get_stock_quote",
+    "get_stock_quotes": "src.tools.stock.get_stock_quotes",
+    "search_stocks": "src.tools.stock.search_stocks",
+    "get_company_overview": "src.tools.stock.get_company_overview",
+    "get_top_gainers_losers": "src.tools.stock.get_top_gainers_losers",
+}
+
+COIN_AGENT_TOOLS = (
+    "get_coin_price",
+    "get_coin_price_multi",
+    "get_coin_indicators",
+    "get_coin_patterns",
+    "get_coin_news",
+    "get_coin_quotes",
+    "recall_tool_output",
+)
+STOCK_AGENT_TOOLS = (
+    "get_stock_price",
+    "get_stock_price_multi",
+    "get_stock_indicators",
+    "get_stock_patterns",
+    "get_stock_quote",
+    "get_stock_quotes",
+    "search_stocks",
+    "recall_tool_output",
+)
+
+
+def tool_names() -> List[str]:
+    """Names of every registered tool, without importing any of them."""
+    return list(TOOL_MODULES)
+
+
+def get_tool(name: str) -> "BaseTool":
+    """Import and return the tool called ``name``.
+
+    Raises:
+        ValueError: If no tool of that name is registered.
+    """
+    try:
+        module = TOOL_MODULES[name]
+    except KeyError:
+        raise ValueError(f"Unknown tool {name!r}; expected one of {tool_names()}")
+    return getattr(importlib.import_module(module), name)
+
+
+def get_tools(names: Iterable[str]) -> List["BaseTool"]:
+    """Resolve several tools by name, in order."""
+    return [get_tool(name) for name in names]
@@ -4,16 +4,16 @@ This package contains various tools for interacting with stock market data
 using the Alpha Vantage API.
 """
 
-from .get_stock_price import get_stock_price
-from .get_stock_quote import get_stock_quote
-from .search_stocks import search_stocks
-from .get_company_overview import get_company_overview
-from .get_top_gainers_losers import get_top_gainers_losers
+from src.utils.lazy import lazy_exports
 
-__all__ = [
-    'get_stock_price',
-    'get_stock_quote', 
-    'search_stocks',
-    'get_company_overview',
-    'get_top_gainers_losers'
-]
+__all__ = lazy_exports(__name__, {
+    "get_stock_price": ".get_stock_price",
+    "get_stock_price_multi": ".get_stock_price_multi",
+    "get_stock_indicators": ".get_stock_indicators",
+    "get_stock_patterns": ".get_stock_patterns",
+    "get_stock_quote": ".get_stock_quote",
+    "get_stock_quotes": ".get_stock_quotes",
+    "search_stocks": ".search_stocks",
+    "get_company_overview": ".get_company_overview",
+    "get_top_gainers_losers": ".get_top_gainers_losers",
+})
@@ -1,15 +1,42 @@
-import requests
 from typing import Dict, Any
 from langchain_core.tools import tool
 
 from src.config import config
+from src.store.response_cache import get_response_cache
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
 
-@tool 
+
+def _request_params(stock_symbol: str) -> Dict[str, Any]:
+    return {
+        "function": "OVERVIEW",
+        "symbol": stock_symbol,
+        "apikey": config["ALPHA_VANTAGE"]  # Use the API key from config
+    }
+
+
+def _parse_response(data: Dict[str, Any], stock_symbol: str) -> Dict[str, Any]:
+    # Check for API errors
+    if "Error Message" in data:
+        raise ValueError(f"API Error: {data['Error Message']}")
+    
+    if "Note" in data:
+        raise ValueError(f"API Rate Limit: {data['Note']}")
+    
+    if not data or data.get('Symbol') is None:
+        raise ValueError(f"No company data found for symbol: {stock_symbol}")
+    
+    return data
+
+
+@tool
 def get_company_overview(stock_symbol: str) -> Dict[str, Any]:
     """Get comprehensive company information and financial metrics.
     
     This function uses the Alpha Vantage OVERVIEW endpoint to retrieve
     detailed company information, financial ratios, and key metrics.
+    Overviews change quarterly, so they are served from the response cache
+    for ``OVERVIEW_CACHE_TTL_SECONDS`` (a week by default).
     
     Args:
         stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT').
@@ -44,24 +71,17 @@ def get_company_overview(stock_symbol: str) -> Dict[str, Any]:
         >>> print(f"Sector: {overview['Sector']}")
         >>> print(f"Market Cap: ${overview['MarketCapitalization']}")
     """
-    params = {
-        "function": "OVERVIEW",
-        "symbol": stock_symbol,
-        "apikey": config["ALPHA_VANTAGE"]  # Use the API key from config
-    }
-    
-    response = requests.get("https://www.alphavantage.co/query", params=params)
-    response.raise_for_status()
-    data = response.json()
-    
-    # Check for API errors
-    if "Error Message" in data:
-        raise ValueError(f"API Error: {data['Error Message']}")
-    
-    if "Note" in data:
-        raise ValueError(f"API Rate Limit: {data['Note']}")
-    
-    if not data or data.get('Symbol') is None:
-        raise ValueError(f"No company data found for symbol: {stock_symbol}")
-    
-    return data
+    params = _request_params(stock_symbol)
+    return get_response_cache().get_or_fetch(
+        params, lambda: _parse_response(get_json("alphavantage", ALPHA_VANTAGE_URL, params), stock_symbol)
+    )
+
+
+@async_variant(get_company_overview)
+async def aget_company_overview(stock_symbol: str) -> Dict[str, Any]:
+    params = _request_params(stock_symbol)
+
+    async def fetch() -> Dict[str, Any]:
+        return _parse_response(await aget_json("alphavantage", ALPHA_VANTAGE_URL, params), stock_symbol)
+
+    return await get_response_cache().aget_or_fetch(params, fetch)
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+import pandas as pd
+from langchain_core.tools import tool
+
+from src.analysis.indicators import WARMUP_BARS, indicator_snapshot
+from src.utils.tooling import async_variant
+from .get_stock_price import afetch_stock_candles, fetch_stock_candles, format_timestamp, frame_to_ohlcv, to_ms
+
+
+def _snapshot(
+    frame: pd.DataFrame,
+    start_date: str,
+    function_type: str,
+    interval: str,
+    at_time: Optional[str],
+) -> List[Dict[str, str]]:
+    intraday = function_type == "TIME_SERIES_INTRADAY"
+    return indicator_snapshot(
+        frame_to_ohlcv(frame),
+        interval if intraday else function_type.replace("TIME_SERIES_", "").lower(),
+        format_timestamp,
+        window_start_ms=to_ms(start_date),
+        at_ms=to_ms(at_time) if at_time else None,
+        intraday=intraday,
+    )
+
+
+@tool
+def get_stock_indicators(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Compute technical indicators for a stock from its OHLCV history.
+
+    Indicators are computed locally (vectorised) from the same data that
+    get_stock_price returns, so only a handful of values reach the model
+    instead of the raw candles. Warm-up history before start_date is fetched
+    automatically so the values are defined from the start of the window.
+
+    Args:
+        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT').
+        start_date (str): Start date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        end_date (str): End date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        function_type (str, optional): Alpha Vantage time series function, as
+            for get_stock_price. Defaults to 'TIME_SERIES_DAILY'.
+        interval (str, optional): Intraday interval ('1min', '5min', '15min',
+            '30min', '60min'); ignored for daily/weekly/monthly data.
+            Defaults to '5min'.
+        at_time (str, optional): Evaluate at the last bar at or before this
+            time (e.g. the trade time) instead of the end of the window.
+
+    Returns:
+        List[Dict[str, str]]: TradingTechnicalIndicator records with keys
+            'indicator_name', 'indicator_value', 'interval', 'start_time' and
+            'end_time' for SMA(20/50), EMA(12/26), RSI(14), MACD(12,26,9),
+            Bollinger(20,2), ATR(14), VWAP, Close and the window range.
+
+    Raises:
+        ValueError: If the API key is missing, symbol is invalid, or API returns an error.
+        requests.RequestException: If the HTTP request to Alpha Vantage fails.
+
+    Example:
+        >>> get_stock_indicators('AAPL', '2025-04-07', '2025-04-10',
+        ...                      'TIME_SERIES_INTRADAY', '60min', at_time='2025-04-09 15:00')
+    """
+    frame = fetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        lookback_bars=WARMUP_BARS,
+    )
+    return _snapshot(frame, start_date, function_type, interval, at_time)
+
+
+@async_variant(get_stock_indicators)
+async def aget_stock_indicators(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    frame = await afetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        lookback_bars=WARMUP_BARS,
+    )
+    return _snapshot(frame, start_date, function_type, interval, at_time)
@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional
+from langchain_core.tools import tool
+
+from src.analysis.patterns import BODY_AVG_BARS, TREND_BARS, pattern_events
+from src.utils.tooling import async_variant
+from .get_stock_price import afetch_stock_candles, fetch_stock_candles, format_timestamp, frame_to_ohlcv, to_ms
+
+LOOKBACK_BARS = TREND_BARS + BODY_AVG_BARS
+
+@tool
+def get_stock_patterns(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Detect candlestick patterns in a stock's OHLCV history.
+
+    Scans the whole series in one vectorised pass for doji, hammer,
+    inverted hammer, hanging man, shooting star, bullish/bearish engulfing,
+    harami, piercing line, dark cloud cover, morning/evening star and three
+    white soldiers / black crows, and returns only the hits near the trade
+    time.
+
+    Args:
+        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT').
+        start_date (str): Start date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        end_date (str): End date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        function_type (str, optional): Alpha Vantage time series function, as
+            for get_stock_price. Defaults to 'TIME_SERIES_DAILY'.
+        interval (str, optional): Intraday interval ('1min', '5min', '15min',
+            '30min', '60min'); ignored for daily/weekly/monthly data.
+            Defaults to '5min'.
+        at_time (str, optional): Report patterns within 24 bars of this time
+            (e.g. the trade time). Defaults to the last 24 bars of the window.
+
+    Returns:
+        List[Dict[str, str]]: Chronological hits, each with keys:
+            - 'timestamp': Bar that completes the pattern
+            - 'pattern': Pattern name (e.g. 'bullish_engulfing')
+            - 'signal': 'bullish', 'bearish' or 'neutral'
+
+    Raises:
+        ValueError: If the API key is missing, symbol is invalid, or API returns an error.
+        requests.RequestException: If the HTTP request to Alpha Vantage fails.
+
+    Example:
+        >>> get_stock_patterns('AAPL', '2025-04-07', '2025-04-10',
+        ...                    'TIME_SERIES_INTRADAY', '60min', at_time='2025-04-09 15:00')
+    """
+    frame = fetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        lookback_bars=LOOKBACK_BARS,
+    )
+    return pattern_events(
+        frame_to_ohlcv(frame),
+        format_timestamp,
+        window_start_ms=to_ms(start_date),
+        at_ms=to_ms(at_time) if at_time else None,
+    )
+
+
+@async_variant(get_stock_patterns)
+async def aget_stock_patterns(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    at_time: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    frame = await afetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        lookback_bars=LOOKBACK_BARS,
+    )
+    return pattern_events(
+        frame_to_ohlcv(frame),
+        format_timestamp,
+        window_start_ms=to_ms(start_date),
+        at_ms=to_ms(at_time) if at_time else None,
+    )
@@ -1,96 +1,45 @@
-import requests
+import asyncio
+import datetime
+import numpy as np
 import pandas as pd
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from langchain_core.tools import tool
 
 from src.config import config
+from src.store import get_candle_store
+from src.store.candles import Candles, TimeRange, TIMESTAMP
+from src.utils.encoding import encode_candles
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
 
-@tool
-def get_stock_price(
-    stock_symbol: str, 
-    start_date: str, 
-    end_date: str, 
-    function_type: str = "TIME_SERIES_DAILY", 
-    interval: str = "5min",
-    outputsize: str = "full",
-    adjusted: bool = True,
-    extended_hours: bool = True,
+DAY_MS = 24 * 60 * 60 * 1000
+
+# outputsize="compact" returns the latest 100 bars; intraday requests
+# without ``month`` return (roughly) the trailing 30 days.
+COMPACT_BARS = 100
+INTRADAY_FULL_DAYS = 30
+MAX_CONCURRENT_MONTHS = 4
+
+# Alpha Vantage labels US equity bars in exchange local time.
+EXCHANGE_TZ = "America/New_York"
+
+
+class PlannedRequest(NamedTuple):
+    outputsize: str
     month: Optional[str] = None
-) -> pd.DataFrame:
-    """Retrieve stock price data from Alpha Vantage API with flexible time frames.
-    
-    Fetches OHLCV (Open, High, Low, Close, Volume) time series data for a given
-    stock symbol within the specified date range. Supports multiple time frames
-    from intraday to monthly data based on the function_type parameter.
-    
-    Args:
-        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT', 'GOOGL').
-        start_date (str): Start date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
-        end_date (str): End date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
-        function_type (str, optional): Alpha Vantage API function type. Options:
-            - 'TIME_SERIES_INTRADAY': Intraday data (requires interval parameter)
-            - 'TIME_SERIES_DAILY': Daily data (raw, as-traded)
-            - 'TIME_SERIES_DAILY_ADJUSTED': Daily data with adjustments
-            - 'TIME_SERIES_WEEKLY': Weekly data (raw)
-            - 'TIME_SERIES_WEEKLY_ADJUSTED': Weekly data with adjustments
-            - 'TIME_SERIES_MONTHLY': Monthly data (raw)
-            - 'TIME_SERIES_MONTHLY_ADJUSTED': Monthly data with adjustments
-            Defaults to 'TIME_SERIES_DAILY'.
-        interval (str, optional): Time interval for intraday data only. 
-            Valid when function_type='TIME_SERIES_INTRADAY':
-            '1min', '5min', '15min', '30min', '60min'. 
-            Ignored for daily/weekly/monthly data. Defaults to '5min'.
-        outputsize (str, optional): 'compact' returns latest 100 data points,
-            'full' returns complete historical data. Defaults to 'full'.
-        adjusted (bool, optional): For intraday data, whether to return adjusted prices.
-            Defaults to True.
-        extended_hours (bool, optional): For intraday data, whether to include 
-            pre-market and post-market hours. Defaults to True.
-        month (str, optional): For intraday data, specify month in YYYY-MM format
-            to get historical intraday data for that month.
-    
-    Returns:
-        pd.DataFrame: A pandas DataFrame containing price data with columns:
-            - 'Open': Opening price (float)
-            - 'High': Highest price during period (float)
-            - 'Low': Lowest price during period (float)
-            - 'Close': Closing price (float)
-            - 'Volume': Trading volume (float)
-            - 'Adjusted_Close': Adjusted closing price (float, if applicable)
-            - 'Dividend_Amount': Dividend amount (float, if applicable)
-            - 'Split_Coefficient': Split coefficient (float, if applicable)
-            
-            Index is datetime, sorted chronologically from oldest to newest.
-            Data is filtered to the specified date range.
-    
-    Raises:
-        ValueError: If the API key is missing, symbol is invalid, or API returns an error.
-        requests.RequestException: If the HTTP request to Alpha Vantage fails.
-    
-    Examples:
-        >>> # Get daily data
-        >>> daily_data = get_stock_price('AAPL', '2025-08-01', '2025-08-20', 'TIME_SERIES_DAILY')
-        >>> 
-        >>> # Get 5-minute intraday data
-        >>> intraday_data = get_stock_price('AAPL', '2025-08-19', '2025-08-20', 'TIME_SERIES_INTRADAY', '5min')
-        >>> 
-        >>> # Get weekly adjusted data
-        >>> weekly_data = get_stock_price('AAPL', '2025-01-01', '2025-08-20', 'TIME_SERIES_WEEKLY_ADJUSTED')
-        >>>
-        >>> # Get historical intraday data for specific month
-        >>> historical_intraday = get_stock_price('AAPL', '2024-01-01', '2024-01-31', 
-        ...                                       'TIME_SERIES_INTRADAY', '1min', month='2024-01')
-    
-    Note:
-        - Alpha Vantage has rate limits - avoid excessive requests
-        - For intraday data, the interval parameter determines granularity
-        - For daily/weekly/monthly data, the interval parameter is ignored
-        - Intraday data is typically available for the last 30 days unless month is specified
-        - Adjusted data includes split and dividend adjustments
-        - Extended hours include pre-market (4:00am) and post-market (8:00pm) trading
-    """
+
+
+def _time_series_params(
+    stock_symbol: str,
+    function_type: str,
+    interval: str,
+    outputsize: str,
+    adjusted: bool,
+    extended_hours: bool,
+    month: Optional[str],
+) -> Dict[str, Any]:
     # Build URL with appropriate parameters based on function type
-    base_url = "https://www.alphavantage.co/query"
     params = {
         "function": function_type,
         "symbol": stock_symbol,
@@ -105,11 +54,11 @@ def get_stock_price(
         params["extended_hours"] = "true" if extended_hours else "false"
         if month:
             params["month"] = month
-    
-    response = requests.get(base_url, params=params)
-    response.raise_for_status()  # Raise an exception for bad status codes
-    stock_trade_data = response.json()
-    
+    return params
+
+
+def _parse_time_series(stock_trade_data: Dict[str, Any], function_type: str) -> pd.DataFrame:
+    """Parse one Alpha Vantage time series response into a DataFrame."""
     # Check for API errors
     if "Error Message" in stock_trade_data:
         raise ValueError(f"API Error: {stock_trade_data['Error Message']}")
@@ -165,12 +114,436 @@ def get_stock_price(
     
     time_series_df.index = pd.to_datetime(time_series_df.index)
     time_series_df = time_series_df.sort_index()
+    return time_series_df
+
+
+def _fetch_time_series(
+    stock_symbol: str,
+    function_type: str,
+    interval: str,
+    outputsize: str,
+    adjusted: bool,
+    extended_hours: bool,
+    month: Optional[str],
+) -> pd.DataFrame:
+    """Request one Alpha Vantage time series and parse it into a DataFrame."""
+    params = _time_series_params(stock_symbol, function_type, interval, outputsize, adjusted, extended_hours, month)
+    return _parse_time_series(get_json("alphavantage", ALPHA_VANTAGE_URL, params), function_type)
+
+
+async def _afetch_time_series(
+    stock_symbol: str,
+    function_type: str,
+    interval: str,
+    outputsize: str,
+    adjusted: bool,
+    extended_hours: bool,
+    month: Optional[str],
+) -> pd.DataFrame:
+    """Async counterpart of :func:`_fetch_time_series`."""
+    params = _time_series_params(stock_symbol, function_type, interval, outputsize, adjusted, extended_hours, month)
+    return _parse_time_series(await aget_json("alphavantage", ALPHA_VANTAGE_URL, params), function_type)
+
+
+def exchange_now_ms() -> int:
+    """Current exchange local time as naive epoch millis (see :func:`to_ms`)."""
+    return int(pd.Timestamp.now(tz=EXCHANGE_TZ).tz_localize(None).value // 1_000_000)
+
+
+def _month_range(month: str) -> TimeRange:
+    first = pd.Timestamp(f"{month}-01")
+    return int(first.value // 1_000_000), int((first + pd.offsets.MonthBegin(1)).value // 1_000_000) - 1
+
+
+def plan_requests(
+    function_type: str,
+    interval: str,
+    gap_start: int,
+    gap_end: int,
+    outputsize: Optional[str] = None,
+    month: Optional[str] = None,
+    now_ms: Optional[int] = None,
+) -> List[PlannedRequest]:
+    """Return the cheapest Alpha Vantage requests that cover ``[gap_start, gap_end]``.
+
+    An explicit ``outputsize`` or ``month`` is honoured as one request.
+    Otherwise ``compact`` is used whenever the latest 100 bars necessarily
+    hold the whole gap. Longer intraday gaps are served either by one
+    trailing-30-day ``full`` request (only if the gap starts inside that
+    window) or by one ``month=YYYY-MM`` request per calendar month; the
+    option with fewer requests wins, then the one spanning fewer days.
+    """
+    if outputsize is not None or month is not None:
+        return [PlannedRequest(outputsize or "full", month)]
+    if function_type.startswith(("TIME_SERIES_WEEKLY", "TIME_SERIES_MONTHLY")):
+        # Always the whole history; outputsize does not apply.
+        return [PlannedRequest("full")]
+
+    now_ms = now_ms if now_ms is not None else exchange_now_ms()
+    # There is at most one bar per bar_ms, so a gap shorter than 99 bars
+    # cannot hold more than the latest 100.
+    if now_ms - gap_start < (COMPACT_BARS - 1) * bar_ms(function_type, interval):
+        return [PlannedRequest("compact")]
+    if function_type != "TIME_SERIES_INTRADAY":
+        return [PlannedRequest("full")]
+
+    months = pd.period_range(
+        pd.Timestamp(gap_start, unit="ms"), pd.Timestamp(max(gap_start, min(gap_end, now_ms)), unit="ms"), freq="M"
+    )
+    by_month = [PlannedRequest("full", str(m)) for m in months]
+    spans = [_month_range(r.month) for r in by_month]
+    options = [(len(by_month), sum(min(end, now_ms) - start for start, end in spans), by_month)]
+    # Keep a day of slack for the edge of the trailing window.
+    full_days = INTRADAY_FULL_DAYS - 1
+    if now_ms - gap_start <= full_days * DAY_MS:
+        options.append((1, INTRADAY_FULL_DAYS * DAY_MS, [PlannedRequest("full")]))
+    return min(options, key=lambda option: option[:2])[2]
+
+
+def _series_key(function_type: str, interval: str, adjusted: bool, extended_hours: bool) -> str:
+    """Name the stored series so differently shaped responses never mix."""
+    if function_type == "TIME_SERIES_INTRADAY":
+        return f"{function_type}_{interval}_adj{int(adjusted)}_ext{int(extended_hours)}"
+    return function_type
+
+
+def to_ms(value: str) -> int:
+    """Parse a date/time string into naive epoch millis (exchange local time)."""
+    timestamp = pd.Timestamp(pd.to_datetime(value))
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return int(timestamp.value // 1_000_000)
+
+
+def _frame_to_candles(frame: pd.DataFrame) -> Candles:
+    candles: Candles = {TIMESTAMP: frame.index.values.astype("datetime64[ms]").astype(np.int64)}
+    for column in frame.select_dtypes("number").columns:
+        candles[column] = frame[column].to_numpy(dtype=np.float64)
+    return candles
+
+
+def frame_to_ohlcv(frame: pd.DataFrame) -> Candles:
+    """Convert a stock price DataFrame into lower-case OHLCV candle columns."""
+    candles = _frame_to_candles(frame)
+    ohlcv: Candles = {TIMESTAMP: candles[TIMESTAMP]}
+    for column in ("Open", "High", "Low", "Close", "Volume"):
+        if column in candles:
+            ohlcv[column.lower()] = candles[column]
+    return ohlcv
+
+
+def format_timestamp(ms: int) -> str:
+    """Render a stored bar time the way Alpha Vantage labels it."""
+    return pd.Timestamp(ms, unit="ms").isoformat()
+
+
+def _candles_to_frame(candles: Candles) -> pd.DataFrame:
+    index = pd.to_datetime(candles[TIMESTAMP], unit="ms")
+    columns = {c: v for c, v in candles.items() if c != TIMESTAMP}
+    return pd.DataFrame(columns, index=index)
+
+
+def _covered_range(
+    frame: pd.DataFrame,
+    gap_start: int,
+    function_type: str,
+    outputsize: str,
+    month: Optional[str],
+) -> Optional[TimeRange]:
+    """Return the range an Alpha Vantage response is authoritative for.
+
+    The newest bar of a live series may still be forming, so it is stored
+    but not marked as covered. A ``full`` daily/weekly/monthly response holds
+    the whole history, so nothing before its first bar exists upstream, and
+    a ``full`` response for a ``month`` holds that month from its start (all
+    of it for a past month).
+    """
+    historical_month = month is not None and month < datetime.date.today().strftime("%Y-%m")
+    if historical_month and outputsize == "full":
+        # A past month is complete, including the nights around its bars.
+        return _month_range(month)
+    if frame.empty:
+        return None
+    timestamps = _frame_to_candles(frame)[TIMESTAMP]
+    start = int(timestamps[0])
+    if outputsize == "full" and month is not None:
+        # Nothing of the current month precedes its first bar either.
+        start = _month_range(month)[0]
+    elif outputsize == "full" and function_type != "TIME_SERIES_INTRADAY":
+        start = min(start, gap_start)
+    if historical_month:
+        end = int(timestamps[-1])
+    elif len(timestamps) > 1:
+        end = int(timestamps[-2])
+    else:
+        return None
+    return (start, end) if start <= end else None
+
+
+def bar_ms(function_type: str, interval: str) -> int:
+    """Return the nominal duration of one bar for a series."""
+    if function_type == "TIME_SERIES_INTRADAY":
+        return int(interval.replace("min", "")) * 60_000
+    if function_type.startswith("TIME_SERIES_WEEKLY"):
+        return 7 * DAY_MS
+    if function_type.startswith("TIME_SERIES_MONTHLY"):
+        return 31 * DAY_MS
+    return DAY_MS
+
+
+def _merge_planned(
+    frames: List[pd.DataFrame],
+    plan: List[PlannedRequest],
+    gap_start: int,
+    function_type: str,
+) -> Tuple[Candles, Optional[TimeRange]]:
+    """Combine the responses of a plan (in chronological order) into one fetch result.
+
+    The covered range is the contiguous run of covered ranges from the
+    first response on.
+    """
+    frame = frames[0] if len(frames) == 1 else pd.concat(frames)
+    if len(frames) > 1:
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    covered: Optional[TimeRange] = None
+    for part, planned in zip(frames, plan):
+        span = _covered_range(part, gap_start, function_type, planned.outputsize, planned.month)
+        if span is None or (covered is not None and span[0] > covered[1] + 1):
+            break
+        covered = span if covered is None else (covered[0], max(covered[1], span[1]))
+    return _frame_to_candles(frame), covered
+
+
+def _lookback_ms(function_type: str, interval: str, bars: int) -> int:
+    """Calendar time that holds ``bars`` trading bars, with slack for
+    nights, weekends and holidays."""
+    if bars <= 0:
+        return 0
+    if function_type == "TIME_SERIES_INTRADAY":
+        # ~16 trading hours a day with extended hours, 5 days a week.
+        return int(bars * bar_ms(function_type, interval) * 24 / 16 * 7 / 5) + 3 * DAY_MS
+    return int(bars * bar_ms(function_type, interval) * 7 / 5) + 5 * DAY_MS
+
+
+def _stock_range(start_date: str, end_date: str, function_type: str, interval: str, lookback_bars: int) -> TimeRange:
+    start_ms, end_ms = to_ms(start_date), to_ms(end_date)
+    return start_ms - _lookback_ms(function_type, interval, lookback_bars), end_ms
+
+
+def fetch_stock_candles(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    outputsize: Optional[str] = None,
+    adjusted: bool = True,
+    extended_hours: bool = True,
+    month: Optional[str] = None,
+    lookback_bars: int = 0,
+) -> pd.DataFrame:
+    """Return stock OHLCV between two dates, reading through the local store.
+
+    ``lookback_bars`` extends the range backwards by roughly that many
+    trading bars, e.g. to warm up indicators before ``start_date``. Missing
+    ranges are fetched with the requests chosen by :func:`plan_requests`;
+    pass ``outputsize`` or ``month`` to force a single request instead.
+    """
+    start_ms, end_ms = _stock_range(start_date, end_date, function_type, interval, lookback_bars)
+
+    def request(planned: PlannedRequest) -> pd.DataFrame:
+        return _fetch_time_series(
+            stock_symbol, function_type, interval, planned.outputsize, adjusted, extended_hours, planned.month
+        )
+
+    def fetch(gap_start: int, gap_end: int) -> Tuple[Candles, Optional[TimeRange]]:
+        plan = plan_requests(function_type, interval, gap_start, gap_end, outputsize, month)
+        if len(plan) == 1:
+            frames = [request(plan[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_MONTHS, len(plan))) as pool:
+                frames = list(pool.map(request, plan))
+        return _merge_planned(frames, plan, gap_start, function_type)
+
+    candles = get_candle_store().read_through(
+        "alphavantage",
+        stock_symbol,
+        _series_key(function_type, interval, adjusted, extended_hours),
+        start_ms,
+        end_ms,
+        fetch,
+    )
+    return _candles_to_frame(candles)
+
+
+async def afetch_stock_candles(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    outputsize: Optional[str] = None,
+    adjusted: bool = True,
+    extended_hours: bool = True,
+    month: Optional[str] = None,
+    lookback_bars: int = 0,
+) -> pd.DataFrame:
+    """Async counterpart of :func:`fetch_stock_candles`."""
+    start_ms, end_ms = _stock_range(start_date, end_date, function_type, interval, lookback_bars)
+
+    slots = asyncio.Semaphore(MAX_CONCURRENT_MONTHS)
+
+    async def request(planned: PlannedRequest) -> pd.DataFrame:
+        async with slots:
+            return await _afetch_time_series(
+                stock_symbol, function_type, interval, planned.outputsize, adjusted, extended_hours, planned.month
+            )
+
+    async def fetch(gap_start: int, gap_end: int) -> Tuple[Candles, Optional[TimeRange]]:
+        plan = plan_requests(function_type, interval, gap_start, gap_end, outputsize, month)
+        frames = list(await asyncio.gather(*(request(planned) for planned in plan)))
+        return _merge_planned(frames, plan, gap_start, function_type)
+
+    candles = await get_candle_store().aread_through(
+        "alphavantage",
+        stock_symbol,
+        _series_key(function_type, interval, adjusted, extended_hours),
+        start_ms,
+        end_ms,
+        fetch,
+    )
+    return _candles_to_frame(candles)
+
+
+@tool
+def get_stock_price(
+    stock_symbol: str, 
+    start_date: str, 
+    end_date: str, 
+    function_type: str = "TIME_SERIES_DAILY", 
+    interval: str = "5min",
+    outputsize: Optional[str] = None,
+    adjusted: bool = True,
+    extended_hours: bool = True,
+    month: Optional[str] = None
+) -> Dict[str, Any]:
+    """Retrieve stock price data from Alpha Vantage API with flexible time frames.
+    
+    Fetches OHLCV (Open, High, Low, Close, Volume) time series data for a given
+    stock symbol within the specified date range. Supports multiple time frames
+    from intraday to monthly data based on the function_type parameter.
+    
+    Args:
+        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT', 'GOOGL').
+        start_date (str): Start date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        end_date (str): End date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        function_type (str, optional): Alpha Vantage API function type. Options:
+            - 'TIME_SERIES_INTRADAY': Intraday data (requires interval parameter)
+            - 'TIME_SERIES_DAILY': Daily data (raw, as-traded)
+            - 'TIME_SERIES_DAILY_ADJUSTED': Daily data with adjustments
+            - 'TIME_SERIES_WEEKLY': Weekly data (raw)
+            - 'TIME_SERIES_WEEKLY_ADJUSTED': Weekly data with adjustments
+            - 'TIME_SERIES_MONTHLY': Monthly data (raw)
+            - 'TIME_SERIES_MONTHLY_ADJUSTED': Monthly data with adjustments
+            Defaults to 'TIME_SERIES_DAILY'.
+        interval (str, optional): Time interval for intraday data only. 
+            Valid when function_type='TIME_SERIES_INTRADAY':
+            '1min', '5min', '15min', '30min', '60min'. 
+            Ignored for daily/weekly/monthly data. Defaults to '5min'.
+        outputsize (str, optional): 'compact' returns latest 100 data points,
+            'full' returns complete historical data. By default the smallest
+            requests covering the range are chosen: 'compact' when the latest
+            100 bars hold it, otherwise 'full', with intraday ranges older
+            than 30 days fetched month by month.
+        adjusted (bool, optional): For intraday data, whether to return adjusted prices.
+            Defaults to True.
+        extended_hours (bool, optional): For intraday data, whether to include 
+            pre-market and post-market hours. Defaults to True.
+        month (str, optional): For intraday data, specify month in YYYY-MM format
+            to get historical intraday data for that month. Not needed for
+            historical ranges, which are split into monthly requests automatically.
+    
+    Returns:
+        Dict[str, Any]: A columnar payload with keys:
+            - 'rows': Number of bars returned
+            - 'source_rows': Number of bars in the requested range
+            - 'downsampling': 'none', or the method used to fit the token budget
+            - 'columns': Lists keyed by column name, chronological:
+                - 'timestamp': Bar time (ISO format)
+                - 'Open', 'High', 'Low', 'Close': Prices (float)
+                - 'Volume': Trading volume (float)
+                - 'Adjusted_Close': Adjusted closing price (float, if applicable)
+                - 'Dividend_Amount': Dividend amount (float, if applicable)
+                - 'Split_Coefficient': Split coefficient (float, if applicable)
+
+            Data is filtered to the specified date range. Ranges larger than
+            the tool output token budget are re-bucketed into wider bars
+            that keep every high and low.
+
+    Raises:
+        ValueError: If the API key is missing, symbol is invalid, or API returns an error.
+        requests.RequestException: If the HTTP request to Alpha Vantage fails.
     
-    # Step 3: Filter by date range
-    start_datetime = pd.to_datetime(start_date)
-    end_datetime = pd.to_datetime(end_date)
+    Examples:
+        >>> # Get daily data
+        >>> daily_data = get_stock_price('AAPL', '2025-08-01', '2025-08-20', 'TIME_SERIES_DAILY')
+        >>> 
+        >>> # Get 5-minute intraday data
+        >>> intraday_data = get_stock_price('AAPL', '2025-08-19', '2025-08-20', 'TIME_SERIES_INTRADAY', '5min')
+        >>> 
+        >>> # Get weekly adjusted data
+        >>> weekly_data = get_stock_price('AAPL', '2025-01-01', '2025-08-20', 'TIME_SERIES_WEEKLY_ADJUSTED')
+        >>>
+        >>> # Get historical intraday data for specific month
+        >>> historical_intraday = get_stock_price('AAPL', '2024-01-01', '2024-01-31', 
+        ...                                       'TIME_SERIES_INTRADAY', '1min', month='2024-01')
+    
+    Note:
+        - Alpha Vantage has rate limits - avoid excessive requests
+        - For intraday data, the interval parameter determines granularity
+        - For daily/weekly/monthly data, the interval parameter is ignored
+        - Without month, intraday ranges older than 30 days are fetched one
+          month per request, concurrently
+        - Adjusted data includes split and dividend adjustments
+        - Extended hours include pre-market (4:00am) and post-market (8:00pm) trading
+        - Ranges fetched before are served from the local candle store; only
+          missing ranges trigger an upstream request
+    """
+    frame = fetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        outputsize=outputsize,
+        adjusted=adjusted,
+        extended_hours=extended_hours,
+        month=month,
+    )
+    return encode_candles(_frame_to_candles(frame), format_timestamp)
 
-    mask = (time_series_df.index >= start_datetime) & (time_series_df.index <= end_datetime)
-    filtered_df = time_series_df.loc[mask]
 
-    return filtered_df
+@async_variant(get_stock_price)
+async def aget_stock_price(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    function_type: str = "TIME_SERIES_DAILY",
+    interval: str = "5min",
+    outputsize: Optional[str] = None,
+    adjusted: bool = True,
+    extended_hours: bool = True,
+    month: Optional[str] = None
+) -> Dict[str, Any]:
+    frame = await afetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type=function_type,
+        interval=interval,
+        outputsize=outputsize,
+        adjusted=adjusted,
+        extended_hours=extended_hours,
+        month=month,
+    )
+    return encode_candles(_frame_to_candles(frame), format_timestamp)
@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Optional
+from langchain_core.tools import tool
+import pandas as pd
+
+from src.analysis.resample import DAY_MS, resample
+from src.utils.encoding import encode_series_within_budget
+from src.utils.tooling import async_variant
+from .get_stock_price import afetch_stock_candles, fetch_stock_candles, format_timestamp, frame_to_ohlcv
+
+INTRADAY_MINUTES = {"1min": 1, "5min": 5, "15min": 15, "30min": 30, "60min": 60}
+DEFAULT_INTERVALS = ["1min", "5min", "60min", "daily"]
+
+# Regular US session (exchange local time) used for daily bars.
+REGULAR_SESSION = (int(9.5 * 60 * 60 * 1000), 16 * 60 * 60 * 1000)
+
+
+def _finest_interval(intervals: List[str]) -> str:
+    """Validate ``intervals`` for local resampling and return the finest intraday one."""
+    unknown = [i for i in intervals if i not in INTRADAY_MINUTES and i != "daily"]
+    if unknown:
+        raise ValueError(f"Unsupported interval(s): {unknown}")
+
+    intraday = [i for i in intervals if i in INTRADAY_MINUTES]
+    finest = min(intraday or ["1min"], key=INTRADAY_MINUTES.__getitem__)
+    misaligned = [i for i in intraday if INTRADAY_MINUTES[i] % INTRADAY_MINUTES[finest]]
+    if misaligned:
+        raise ValueError(f"Interval(s) {misaligned} are not multiples of {finest}")
+    return finest
+
+
+def _encode_intervals(frame: pd.DataFrame, intervals: List[str], finest: str) -> Dict[str, Dict[str, Any]]:
+    base = frame_to_ohlcv(frame)
+    series = {}
+    for interval in intervals:
+        if interval == "daily":
+            candles = resample(base, DAY_MS, session=REGULAR_SESSION)
+        elif interval == finest:
+            candles = base
+        else:
+            candles = resample(base, INTRADAY_MINUTES[interval] * 60_000, within_day=True)
+        series[interval] = candles
+    return encode_series_within_budget(series, format_timestamp)
+
+
+@tool
+def get_stock_price_multi(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    intervals: Optional[List[str]] = None,
+    extended_hours: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """Retrieve stock OHLCV at several intervals with a single upstream fetch.
+
+    Fetches intraday data once at the finest requested interval and builds
+    the coarser bars locally. Aggregation is session-aware: intraday bars
+    never span midnight, and daily bars are built from the regular session
+    (09:30-16:00 exchange time) only, so pre/post-market trades do not
+    distort the daily open/close.
+
+    Args:
+        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT').
+        start_date (str): Start date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        end_date (str): End date in YYYY-MM-DD or YYYY-MM-DD HH:MM:SS format.
+        intervals (List[str], optional): Any of '1min', '5min', '15min',
+            '30min', '60min' and 'daily'. Defaults to
+            ['1min', '5min', '60min', 'daily'].
+        extended_hours (bool, optional): Include pre-market and post-market
+            bars in the intraday series. Defaults to True.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Interval -> columnar series with
+            'rows', 'source_rows', 'downsampling' and 'columns' (lists for
+            'timestamp', 'open', 'high', 'low', 'close', 'volume'). Together
+            the series fit the tool output token budget; oversized series
+            are re-bucketed into wider bars that keep every high and low.
+
+    Raises:
+        ValueError: If an interval is unsupported, the API key is missing,
+            the symbol is invalid, or the API returns an error.
+        requests.RequestException: If the HTTP request to Alpha Vantage fails.
+
+    Example:
+        >>> bars = get_stock_price_multi('AAPL', '2025-04-07', '2025-04-10')
+        >>> bars['60min']['columns']['close']
+    """
+    intervals = intervals or DEFAULT_INTERVALS
+    finest = _finest_interval(intervals)
+    frame = fetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type="TIME_SERIES_INTRADAY",
+        interval=finest,
+        extended_hours=extended_hours,
+    )
+    return _encode_intervals(frame, intervals, finest)
+
+
+@async_variant(get_stock_price_multi)
+async def aget_stock_price_multi(
+    stock_symbol: str,
+    start_date: str,
+    end_date: str,
+    intervals: Optional[List[str]] = None,
+    extended_hours: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    intervals = intervals or DEFAULT_INTERVALS
+    finest = _finest_interval(intervals)
+    frame = await afetch_stock_candles(
+        stock_symbol,
+        start_date,
+        end_date,
+        function_type="TIME_SERIES_INTRADAY",
+        interval=finest,
+        extended_hours=extended_hours,
+    )
+    return _encode_intervals(frame, intervals, finest)
@@ -1,50 +1,21 @@
-import requests
 from typing import Dict, Any
 from langchain_core.tools import tool
 
 from src.config import config
+from src.store.response_cache import get_response_cache
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
 
-@tool
-def get_stock_quote(stock_symbol: str) -> Dict[str, Any]:
-    """Get the latest price and volume information for a stock ticker.
-    
-    This function uses the Alpha Vantage GLOBAL_QUOTE endpoint to retrieve
-    real-time or end-of-day quote data for a given stock symbol.
-    
-    Args:
-        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT', 'GOOGL').
-    
-    Returns:
-        Dict[str, Any]: A dictionary containing quote information with keys:
-            - 'symbol': Stock symbol
-            - 'open': Opening price
-            - 'high': Day's high price
-            - 'low': Day's low price
-            - 'price': Current/latest price
-            - 'volume': Trading volume
-            - 'latest_trading_day': Latest trading day
-            - 'previous_close': Previous day's closing price
-            - 'change': Price change
-            - 'change_percent': Percentage change
-    
-    Raises:
-        ValueError: If the API returns an error or no data is found.
-        requests.RequestException: If the HTTP request fails.
-    
-    Example:
-        >>> quote = get_stock_quote('AAPL')
-        >>> print(f"AAPL current price: ${quote['price']}")
-    """
-    params = {
+
+def quote_params(stock_symbol: str) -> Dict[str, Any]:
+    return {
         "function": "GLOBAL_QUOTE",
         "symbol": stock_symbol,
         "apikey": config["ALPHA_VANTAGE"]
     }
-    
-    response = requests.get("https://www.alphavantage.co/query", params=params)
-    response.raise_for_status()
-    data = response.json()
-    
+
+
+def _parse_response(data: Dict[str, Any]) -> Dict[str, Any]:
     # Check for API errors
     if "Error Message" in data:
         raise ValueError(f"API Error: {data['Error Message']}")
@@ -74,3 +45,61 @@ def get_stock_quote(stock_symbol: str) -> Dict[str, Any]:
     }
     
     return normalized_quote
+
+
+def fetch_quote(stock_symbol: str) -> Dict[str, Any]:
+    """Normalised GLOBAL_QUOTE for one symbol, through the response cache."""
+    params = quote_params(stock_symbol)
+    return get_response_cache().get_or_fetch(
+        params, lambda: _parse_response(get_json("alphavantage", ALPHA_VANTAGE_URL, params))
+    )
+
+
+async def afetch_quote(stock_symbol: str) -> Dict[str, Any]:
+    params = quote_params(stock_symbol)
+
+    async def fetch() -> Dict[str, Any]:
+        return _parse_response(await aget_json("alphavantage", ALPHA_VANTAGE_URL, params))
+
+    return await get_response_cache().aget_or_fetch(params, fetch)
+
+
+@tool
+def get_stock_quote(stock_symbol: str) -> Dict[str, Any]:
+    """Get the latest price and volume information for a stock ticker.
+    
+    This function uses the Alpha Vantage GLOBAL_QUOTE endpoint to retrieve
+    real-time or end-of-day quote data for a given stock symbol. Quotes are
+    served from the response cache for ``GLOBAL_QUOTE_CACHE_TTL_SECONDS``
+    (15 seconds by default).
+    
+    Args:
+        stock_symbol (str): The stock ticker symbol (e.g., 'AAPL', 'MSFT', 'GOOGL').
+    
+    Returns:
+        Dict[str, Any]: A dictionary containing quote information with keys:
+            - 'symbol': Stock symbol
+            - 'open': Opening price
+            - 'high': Day's high price
+            - 'low': Day's low price
+            - 'price': Current/latest price
+            - 'volume': Trading volume
+            - 'latest_trading_day': Latest trading day
+            - 'previous_close': Previous day's closing price
+            - 'change': Price change
+            - 'change_percent': Percentage change
+    
+    Raises:
+        ValueError: If the API returns an error or no data is found.
+        requests.RequestException: If the HTTP request fails.
+    
+    Example:
+        >>> quote = get_stock_quote('AAPL')
+        >>> print(f"AAPL current price: ${quote['price']}")
+    """
+    return fetch_quote(stock_symbol)
+
+
+@async_variant(get_stock_quote)
+async def aget_stock_quote(stock_symbol: str) -> Dict[str, Any]:
+    return await afetch_quote(stock_symbol)
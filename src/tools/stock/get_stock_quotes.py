@@ -0,0 +1,205 @@
+"""Quotes for many stock symbols in as few upstream requests as possible.
+
+Symbols with a fresh quote in the response cache are answered from it. The
+rest are requested up to 100 at a time from Alpha Vantage's
+``REALTIME_BULK_QUOTES`` endpoint, and whatever that does not return (every
+symbol when the API key has no access to the endpoint) is fetched with
+concurrent ``GLOBAL_QUOTE`` requests. Every quote fetched is cached under
+its ``GLOBAL_QUOTE`` key, so ``get_stock_quote`` reuses it.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import tool
+
+from src.config import config
+from src.store.response_cache import get_response_cache
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
+from .get_stock_quote import afetch_quote, fetch_quote, quote_params
+
+logger = logging.getLogger(__name__)
+
+BULK_LIMIT = 100
+MAX_CONCURRENT_QUOTES = 8
+
+# Upstream notices: only the premium-endpoint one means the key can never
+# use bulk quotes; the rate-limit ones mention the premium plans as well.
+PREMIUM_NOTICE = "premium endpoint"
+RATE_LIMIT_MARKERS = ("rate limit", "requests per")
+
+# Set once upstream says the API key has no access to bulk quotes, so later
+# calls go straight to per-symbol requests.
+_bulk_available = True
+
+
+def normalize_symbols(stock_symbols: List[str]) -> List[str]:
+    """Upper-cased symbols without blanks or duplicates, in input order."""
+    symbols = list(dict.fromkeys(s.strip().upper() for s in stock_symbols if s and s.strip()))
+    if not symbols:
+        raise ValueError("stock_symbols must contain at least one symbol")
+    return symbols
+
+
+def _bulk_params(symbols: List[str]) -> Dict[str, Any]:
+    return {
+        "function": "REALTIME_BULK_QUOTES",
+        "symbol": ",".join(symbols),
+        "apikey": config["ALPHA_VANTAGE"],
+    }
+
+
+def _number(value: Any, cast=float) -> Any:
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def _normalize_bulk_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """A bulk quote row in the shape ``get_stock_quote`` returns."""
+    return {
+        'symbol': str(row.get('symbol', '')).upper(),
+        'open': _number(row.get('open')),
+        'high': _number(row.get('high')),
+        'low': _number(row.get('low')),
+        'price': _number(row.get('close')),
+        'volume': _number(row.get('volume'), int),
+        'latest_trading_day': str(row.get('timestamp', ''))[:10],
+        'previous_close': _number(row.get('previous_close')),
+        'change': _number(row.get('change')),
+        'change_percent': str(row.get('change_percent', '0')).replace('%', ''),
+    }
+
+
+def _parse_bulk(data: Dict[str, Any], symbols: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Quotes by symbol, or ``None`` when the key cannot use the endpoint."""
+    global _bulk_available
+    if "Error Message" in data:
+        raise ValueError(f"API Error: {data['Error Message']}")
+    if "Note" in data:
+        raise ValueError(f"API Rate Limit: {data['Note']}")
+    message = str(data.get("Information") or data.get("message") or "")
+    if any(marker in message.lower() for marker in RATE_LIMIT_MARKERS):
+        # Transient, so raise like "Note" and try bulk again next call.
+        raise ValueError(f"API Rate Limit: {message}")
+    if PREMIUM_NOTICE in message.lower():
+        logger.info("Bulk quotes are unavailable for this API key; using per-symbol quotes")
+        _bulk_available = False
+        return None
+    if not isinstance(data.get("data"), list):
+        raise ValueError(f"Unexpected bulk quote response: {message or sorted(data)}")
+    wanted = set(symbols)
+    quotes = (_normalize_bulk_row(row) for row in data["data"] if isinstance(row, dict))
+    return {quote["symbol"]: quote for quote in quotes if quote["symbol"] in wanted}
+
+
+def _collect(symbols: List[str], quotes: Dict[str, Dict[str, Any]], errors: Dict[str, str]) -> List[Dict[str, Any]]:
+    return [quotes[s] if s in quotes else {"symbol": s, "error": errors.get(s, "No quote data found")} for s in symbols]
+
+
+@tool
+def get_stock_quotes(stock_symbols: List[str]) -> List[Dict[str, Any]]:
+    """Get the latest price and volume information for several stock tickers at once.
+
+    Use this instead of calling ``get_stock_quote`` repeatedly for a portfolio
+    or watchlist: symbols are batched into bulk requests where the API key
+    allows it and fetched concurrently otherwise, and recent quotes are served
+    from the response cache.
+
+    Args:
+        stock_symbols (List[str]): Stock ticker symbols (e.g., ['AAPL', 'MSFT']).
+
+    Returns:
+        List[Dict[str, Any]]: One quote per distinct symbol, in input order,
+            with the same keys as ``get_stock_quote`` ('symbol', 'open',
+            'high', 'low', 'price', 'volume', 'latest_trading_day',
+            'previous_close', 'change', 'change_percent'). A symbol that could
+            not be quoted is returned as ``{'symbol': ..., 'error': ...}``
+            instead of failing the whole call.
+
+    Raises:
+        ValueError: If no symbol is given.
+
+    Example:
+        >>> quotes = get_stock_quotes(['AAPL', 'MSFT', 'NVDA'])
+        >>> for quote in quotes:
+        ...     print(f"{quote['symbol']}: ${quote['price']}")
+    """
+    symbols = normalize_symbols(stock_symbols)
+    cache = get_response_cache()
+    requests = [quote_params(symbol) for symbol in symbols]
+    quotes = {s: q for s, q in zip(symbols, cache.peek_many(requests)) if q is not None}
+    errors: Dict[str, str] = {}
+
+    missing = [s for s in symbols if s not in quotes]
+    for offset in range(0, len(missing), BULK_LIMIT):
+        if not _bulk_available:
+            break
+        batch = missing[offset:offset + BULK_LIMIT]
+        try:
+            found = _parse_bulk(get_json("alphavantage", ALPHA_VANTAGE_URL, _bulk_params(batch)), batch)
+        except Exception as ex:
+            logger.warning("Bulk quote request failed; using per-symbol quotes: %s", ex)
+            break
+        if found is None:
+            break
+        cache.put_many([quote_params(s) for s in found], list(found.values()))
+        quotes.update(found)
+
+    missing = [s for s in symbols if s not in quotes]
+    if missing:
+        def fetch(symbol: str) -> None:
+            try:
+                quotes[symbol] = fetch_quote(symbol)
+            except Exception as ex:
+                errors[symbol] = str(ex)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_QUOTES, len(missing))) as pool:
+            list(pool.map(fetch, missing))
+    return _collect(symbols, quotes, errors)
+
+
+@async_variant(get_stock_quotes)
+async def aget_stock_quotes(stock_symbols: List[str]) -> List[Dict[str, Any]]:
+    symbols = normalize_symbols(stock_symbols)
+    cache = get_response_cache()
+    requests = [quote_params(symbol) for symbol in symbols]
+    cached = await asyncio.to_thread(cache.peek_many, requests) if cache.shared else cache.peek_many(requests)
+    quotes = {s: q for s, q in zip(symbols, cached) if q is not None}
+    errors: Dict[str, str] = {}
+
+    missing = [s for s in symbols if s not in quotes]
+    for offset in range(0, len(missing), BULK_LIMIT):
+        if not _bulk_available:
+            break
+        batch = missing[offset:offset + BULK_LIMIT]
+        try:
+            found = _parse_bulk(await aget_json("alphavantage", ALPHA_VANTAGE_URL, _bulk_params(batch)), batch)
+        except Exception as ex:
+            logger.warning("Bulk quote request failed; using per-symbol quotes: %s", ex)
+            break
+        if found is None:
+            break
+        store = ([quote_params(s) for s in found], list(found.values()))
+        if cache.shared:
+            await asyncio.to_thread(cache.put_many, *store)
+        else:
+            cache.put_many(*store)
+        quotes.update(found)
+
+    missing = [s for s in symbols if s not in quotes]
+    slots = asyncio.Semaphore(MAX_CONCURRENT_QUOTES)
+
+    async def fetch(symbol: str) -> None:
+        async with slots:
+            try:
+                quotes[symbol] = await afetch_quote(symbol)
+            except Exception as ex:
+                errors[symbol] = str(ex)
+
+    await asyncio.gather(*(fetch(symbol) for symbol in missing))
+    return _collect(symbols, quotes, errors)
@@ -1,15 +1,38 @@
-import requests
 from typing import Dict, Any
 from langchain_core.tools import tool
 
 from src.config import config
+from src.store.response_cache import get_response_cache
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
+
+
+def _request_params() -> Dict[str, Any]:
+    return {
+        "function": "TOP_GAINERS_LOSERS", 
+        "apikey":config["ALPHA_VANTAGE"]
+    }
+
+
+def _parse_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Check for API errors
+    if "Error Message" in data:
+        raise ValueError(f"API Error: {data['Error Message']}")
+    
+    if "Note" in data:
+        raise ValueError(f"API Rate Limit: {data['Note']}")
+    
+    return data
+
 
 @tool
 def get_top_gainers_losers() -> Dict[str, Any]:
     """Get the top gainers, losers, and most actively traded stocks in the US market.
     
     This function uses the Alpha Vantage TOP_GAINERS_LOSERS endpoint to retrieve
-    the top 20 gainers, losers, and most active stocks.
+    the top 20 gainers, losers, and most active stocks. The snapshot only
+    updates periodically, so it is served from the response cache for
+    ``TOP_GAINERS_LOSERS_CACHE_TTL_SECONDS`` (five minutes by default).
     
     Returns:
         Dict[str, Any]: Dictionary containing three lists:
@@ -33,20 +56,17 @@ def get_top_gainers_losers() -> Dict[str, Any]:
         >>> for gainer in market_movers['top_gainers'][:5]:
         ...     print(f"{gainer['ticker']}: +{gainer['change_percentage']}")
     """
-    params = {
-        "function": "TOP_GAINERS_LOSERS", 
-        "apikey":config["ALPHA_VANTAGE"]
-    }
-    
-    response = requests.get("https://www.alphavantage.co/query", params=params)
-    response.raise_for_status()
-    data = response.json()
-    
-    # Check for API errors
-    if "Error Message" in data:
-        raise ValueError(f"API Error: {data['Error Message']}")
-    
-    if "Note" in data:
-        raise ValueError(f"API Rate Limit: {data['Note']}")
-    
-    return data
+    params = _request_params()
+    return get_response_cache().get_or_fetch(
+        params, lambda: _parse_response(get_json("alphavantage", ALPHA_VANTAGE_URL, params))
+    )
+
+
+@async_variant(get_top_gainers_losers)
+async def aget_top_gainers_losers() -> Dict[str, Any]:
+    params = _request_params()
+
+    async def fetch() -> Dict[str, Any]:
+        return _parse_response(await aget_json("alphavantage", ALPHA_VANTAGE_URL, params))
+
+    return await get_response_cache().aget_or_fetch(params, fetch)
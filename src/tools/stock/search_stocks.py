@@ -1,49 +1,22 @@
-import requests
+from typing import Any, Dict, Optional
 import pandas as pd
 from langchain_core.tools import tool
 
 from src.config import config
+from src.store.symbols import get_symbol_directory
+from src.utils.http import ALPHA_VANTAGE_URL, aget_json, get_json
+from src.utils.tooling import async_variant
 
-@tool
-def search_stocks(keywords: str) -> pd.DataFrame:
-    """Search for stock symbols and company information using keywords.
-    
-    This function uses the Alpha Vantage SYMBOL_SEARCH endpoint to find
-    stock symbols, company names, and market information based on search keywords.
-    
-    Args:
-        keywords (str): Search keywords (e.g., company name, ticker symbol).
-    
-    Returns:
-        pd.DataFrame: DataFrame containing search results with columns:
-            - 'symbol': Stock symbol
-            - 'name': Company name
-            - 'type': Security type (e.g., Equity, ETF)
-            - 'region': Trading region/country
-            - 'market_open': Market open time
-            - 'market_close': Market close time
-            - 'timezone': Market timezone
-            - 'currency': Trading currency
-            - 'match_score': Relevance score (0-1)
-    
-    Raises:
-        ValueError: If the API returns an error or no results are found.
-        requests.RequestException: If the HTTP request fails.
-    
-    Example:
-        >>> results = search_stocks('Apple')
-        >>> print(results[['symbol', 'name', 'match_score']].head())
-    """
-    params = {
+
+def _request_params(keywords: str) -> Dict[str, Any]:
+    return {
         "function": "SYMBOL_SEARCH",
         "keywords": keywords,
         "apikey": config["ALPHA_VANTAGE"]
     }
-    
-    response = requests.get("https://www.alphavantage.co/query", params=params)
-    response.raise_for_status()
-    data = response.json()
-    
+
+
+def _parse_response(data: Dict[str, Any]) -> pd.DataFrame:
     # Check for API errors
     if "Error Message" in data:
         raise ValueError(f"API Error: {data['Error Message']}")
@@ -82,3 +55,82 @@ def search_stocks(keywords: str) -> pd.DataFrame:
         df['match_score'] = pd.to_numeric(df['match_score'], errors='coerce')
     
     return df
+
+
+# LISTING_STATUS only covers US exchanges, so local matches share these.
+US_LISTING = {
+    "region": "United States",
+    "market_open": "09:30",
+    "market_close": "16:00",
+    "timezone": "UTC-04",
+    "currency": "USD",
+}
+
+
+def _search_local(keywords: str) -> Optional[pd.DataFrame]:
+    """Search the local symbol index; ``None`` when it is unavailable or has no match."""
+    directory = get_symbol_directory()
+    index = directory.index() if directory is not None else None
+    matches = index.search(keywords) if index is not None else []
+    if not matches:
+        return None
+    return pd.DataFrame(
+        [
+            {
+                "symbol": listing.symbol,
+                "name": listing.name,
+                "type": "Equity" if listing.asset_type == "Stock" else listing.asset_type,
+                **US_LISTING,
+                "match_score": score,
+            }
+            for listing, score in matches
+        ]
+    )
+
+
+@tool
+def search_stocks(keywords: str) -> pd.DataFrame:
+    """Search for stock symbols and company information using keywords.
+    
+    Searches the local symbol index built from Alpha Vantage's listing dump
+    (ticker, prefix, name word and fuzzy matches) and only calls the
+    SYMBOL_SEARCH endpoint when nothing matches locally, e.g. for non-US
+    listings.
+    
+    Args:
+        keywords (str): Search keywords (e.g., company name, ticker symbol).
+    
+    Returns:
+        pd.DataFrame: DataFrame containing search results with columns:
+            - 'symbol': Stock symbol
+            - 'name': Company name
+            - 'type': Security type (e.g., Equity, ETF)
+            - 'region': Trading region/country
+            - 'market_open': Market open time
+            - 'market_close': Market close time
+            - 'timezone': Market timezone
+            - 'currency': Trading currency
+            - 'match_score': Relevance score (0-1)
+    
+    Raises:
+        ValueError: If the API returns an error or no results are found.
+        requests.RequestException: If the HTTP request fails.
+    
+    Example:
+        >>> results = search_stocks('Apple')
+        >>> print(results[['symbol', 'name', 'match_score']].head())
+    """
+    local = _search_local(keywords)
+    if local is not None:
+        return local
+    data = get_json("alphavantage", ALPHA_VANTAGE_URL, _request_params(keywords))
+    return _parse_response(data)
+
+
+@async_variant(search_stocks)
+async def asearch_stocks(keywords: str) -> pd.DataFrame:
+    local = _search_local(keywords)
+    if local is not None:
+        return local
+    data = await aget_json("alphavantage", ALPHA_VANTAGE_URL, _request_params(keywords))
+    return _parse_response(data)
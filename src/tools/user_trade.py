@@ -1,15 +1,45 @@
 """Helpers to obtain user trade history.
 
-The functions in this module should interface with your trade data store
-or blockchain indexer to return structured trade events for a given user
-and date range.
+Trades are read from the indexed ``trades`` table (see
+:mod:`src.store.trades`). Queries stream from the database and aggregate
+there, so only a bounded slice of a large history reaches the model.
 """
 
-from typing import List, Dict, Optional, Any
+import asyncio
+from typing import Dict, Optional, Any
 from langchain_core.tools import tool
 
+from src.store import get_trade_store
+from src.utils.dates import date_range_ms
+from src.utils.tooling import async_variant
+
+# Most individual trades returned per call; the per-pair summary always
+# covers the whole range.
+MAX_TRADES = 200
+
+
+def _user_trades(user_public_address: str, start_date: str, end_date: str, pair: Optional[str]) -> Dict[str, Any]:
+    start_ms, end_ms = date_range_ms(start_date, end_date)
+    store = get_trade_store()
+    summary = store.summarize(user_public_address, start_ms, end_ms, pair)
+    total = sum(row["trades"] for row in summary)
+    trades = list(store.iter_trades(user_public_address, start_ms, end_ms, pair, limit=MAX_TRADES))
+    return {
+        "total_trades": total,
+        "returned_trades": len(trades),
+        "truncated": total > len(trades),
+        "summary": summary,
+        "trades": trades,
+    }
+
+
 @tool
-def get_user_trade(user_public_address: str, start_date: str, end_date: str) -> List[Dict[str, Optional[Any]]]:
+def get_user_trade(
+    user_public_address: str,
+    start_date: str,
+    end_date: str,
+    pair: Optional[str] = None,
+) -> Dict[str, Any]:
     """Return trades for a user between two dates.
 
     Parameters
@@ -20,28 +50,37 @@ def get_user_trade(user_public_address: str, start_date: str, end_date: str) ->
         Inclusive start date in ISO format (YYYY-MM-DD).
     end_date : str
         Inclusive end date in ISO format (YYYY-MM-DD).
+    pair : Optional[str]
+        Restrict to one trading pair, e.g. 'BTCUSDT'.
 
     Returns
     -------
-    List[Dict[str, Optional[Any]]]
-        A list of trade records. Each record should include at least:
-        - 'timestamp' (str): ISO timestamp of the trade
-        - 'pair' (str): Trading pair, e.g. 'BTC/USD'
-        - 'side' (str): 'buy' or 'sell'
-        - 'price' (float)
-        - 'amount' (float)
-        - 'tx_hash' (Optional[str]): Transaction hash if available
+    Dict[str, Any]
+        - 'total_trades' (int): Trades in the range
+        - 'returned_trades' (int): Trades listed under 'trades'
+        - 'truncated' (bool): True when only the oldest 200 trades are listed;
+          narrow the dates or pass a pair to see the rest
+        - 'summary' (List[Dict]): Per pair and side: 'trades', 'amount',
+          'avg_price', 'first_trade', 'last_trade'
+        - 'trades' (List[Dict]): Chronological records with 'user_address',
+          'timestamp' (ISO, UTC), 'pair', 'side', 'price', 'amount' and
+          'tx_hash' (Optional[str])
 
     Raises
     ------
     ValueError
         If dates are invalid or start_date > end_date.
-    RuntimeError
-        If the data store or indexer cannot be reached.
-
-    Notes
-    -----
-    This is a stub. Implementations should query the project's database,
-    a third-party indexer, or the blockchain directly.
+    sqlalchemy.exc.SQLAlchemyError
+        If the trade database cannot be reached.
     """
-    pass
+    return _user_trades(user_public_address, start_date, end_date, pair)
+
+
+@async_variant(get_user_trade)
+async def aget_user_trade(
+    user_public_address: str,
+    start_date: str,
+    end_date: str,
+    pair: Optional[str] = None,
+) -> Dict[str, Any]:
+    return await asyncio.to_thread(_user_trades, user_public_address, start_date, end_date, pair)
@@ -0,0 +1 @@
+"""Shared infrastructure helpers used across tools and stores."""
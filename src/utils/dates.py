@@ -0,0 +1,51 @@
+"""UTC epoch-millisecond helpers shared by the stores and their tools."""
+
+import datetime
+import email.utils
+from typing import Any, Tuple
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def to_epoch_ms(value: Any) -> int:
+    """Parse an ISO 8601 / RFC 822 date or epoch seconds/ms to UTC epoch ms.
+
+    Dates without a timezone are taken to be UTC.
+    """
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().lstrip("-").isdigit()):
+        number = int(float(value))
+        # Anything below ~2001-09-09 in ms is taken to be seconds.
+        return number if abs(number) >= 10**12 else number * 1000
+    text = str(value).strip()
+    try:
+        parsed = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def format_epoch_ms(ms: int) -> str:
+    """Render epoch milliseconds as an ISO 8601 UTC timestamp."""
+    return datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc).isoformat()
+
+
+def date_range_ms(start_date: str, end_date: str) -> Tuple[int, int]:
+    """Validate a tool's date range and return it as UTC epoch ms.
+
+    A bare ``YYYY-MM-DD`` end date is inclusive of the whole day.
+
+    Raises:
+        ValueError: If a date cannot be parsed or the range is reversed.
+    """
+    try:
+        start_ms = to_epoch_ms(start_date)
+        end_ms = to_epoch_ms(end_date)
+    except Exception as ex:
+        raise ValueError(f"Invalid date(s): {ex}")
+    if len(end_date.strip()) == 10:
+        end_ms += DAY_MS - 1
+    if start_ms > end_ms:
+        raise ValueError("start_date cannot be after end_date")
+    return start_ms, end_ms
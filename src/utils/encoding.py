@@ -0,0 +1,198 @@
+"""Token-budgeted, columnar encoding of candle series for tool outputs.
+
+Tool results end up verbatim in the LLM message history, so their size
+drives both prompt cost and latency. Instead of a list of row dicts (which
+repeats every key name per row) or a stringified DataFrame, series are
+emitted column by column with fixed significant-digit precision, and
+downsampled until the payload fits a token budget.
+
+Downsampling is shape preserving:
+
+* ``"ohlc"`` re-buckets consecutive candles into wider ones (first open,
+  max high, min low, last close, summed volume), so spikes and extremes
+  survive;
+* ``"lttb"`` (Largest-Triangle-Three-Buckets) keeps the rows that best
+  preserve the visual shape of the close series.
+"""
+
+import json
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+from src.config import config
+from src.store.candles import Candles, TIMESTAMP
+
+# Rough characters-per-token ratio for JSON made of numbers and short keys.
+CHARS_PER_TOKEN = 3.5
+
+# Rows formatted up front to estimate the per-row cost of a series.
+SAMPLE_ROWS = 64
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Estimate the LLM token count of a JSON-serialisable payload."""
+    text = json.dumps(payload, separators=(",", ":"), default=str)
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round a column to ``digits`` significant digits of its largest value."""
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.abs(values[np.isfinite(values)])
+    if finite.size == 0 or finite.max() == 0:
+        return values
+    decimals = max(0, digits - 1 - int(np.floor(np.log10(finite.max()))))
+    return np.round(values, decimals)
+
+
+def _aggregate(name: str, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Combine runs of rows for one column according to its meaning."""
+    key = name.lower()
+    if key == "open":
+        return values[starts]
+    if key == "high":
+        return np.fmax.reduceat(values, starts)
+    if key == "low":
+        return np.fmin.reduceat(values, starts)
+    if key in ("volume", "dividend_amount"):
+        return np.add.reduceat(np.nan_to_num(values), starts)
+    if key == "split_coefficient":
+        return np.multiply.reduceat(np.nan_to_num(values, nan=1.0), starts)
+    return values[ends]
+
+
+def rebucket(candles: Candles, n_out: int) -> Candles:
+    """Merge consecutive candles into ``n_out`` OHLC-preserving buckets."""
+    n = len(candles[TIMESTAMP])
+    if n <= n_out or n_out <= 0:
+        return candles
+    starts = np.unique(np.linspace(0, n, n_out, endpoint=False).astype(np.int64))
+    ends = np.append(starts[1:], n) - 1
+    out: Candles = {TIMESTAMP: candles[TIMESTAMP][starts]}
+    for name, values in candles.items():
+        if name != TIMESTAMP:
+            out[name] = _aggregate(name, np.asarray(values, dtype=np.float64), starts, ends)
+    return out
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Row indices chosen by Largest-Triangle-Three-Buckets over ``y``.
+
+    The first and last rows are always kept; each bucket in between
+    contributes the row forming the largest triangle with the previously
+    kept row and the mean of the next bucket. Row positions are the x axis.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)[: max(n_out, 0)]
+
+    every = (n - 2) / (n_out - 2)
+    chosen = [0]
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_lo, nxt_hi = hi, min(int((i + 2) * every) + 1, n)
+        avg_x = (nxt_lo + nxt_hi - 1) / 2.0
+        avg_y = np.nanmean(y[nxt_lo:nxt_hi])
+        a = chosen[-1]
+        xs = np.arange(lo, hi)
+        area = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        chosen.append(int(lo + np.nanargmax(area)) if np.isfinite(area).any() else lo)
+    chosen.append(n - 1)
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def _downsample(candles: Candles, n_out: int, method: str) -> Candles:
+    if method == "lttb":
+        close = next((v for k, v in candles.items() if k.lower() == "close"), None)
+        if close is not None:
+            idx = lttb_indices(close, n_out)
+            return {k: np.asarray(v)[idx] for k, v in candles.items()}
+    return rebucket(candles, n_out)
+
+
+def _columnar(candles: Candles, format_time: Callable[[int], str], digits: int) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {TIMESTAMP: [format_time(int(t)) for t in candles[TIMESTAMP]]}
+    for name, values in candles.items():
+        if name == TIMESTAMP:
+            continue
+        rounded = round_significant(values, digits)
+        payload[name] = [None if not np.isfinite(v) else (int(v) if float(v).is_integer() else float(v)) for v in rounded]
+    return payload
+
+
+def encode_candles(
+    candles: Candles,
+    format_time: Callable[[int], str],
+    token_budget: Optional[int] = None,
+    method: str = "ohlc",
+    digits: int = 6,
+) -> Dict[str, Any]:
+    """Encode a candle set as a compact columnar payload within a token budget.
+
+    Args:
+        candles: Columns keyed by name, including ``timestamp`` (epoch ms).
+        format_time: Converts an epoch-millis timestamp to display text.
+        token_budget: Approximate maximum tokens for the payload. Defaults
+            to ``TOOL_OUTPUT_TOKEN_BUDGET``.
+        method: ``"ohlc"`` (re-bucket, default) or ``"lttb"``.
+        digits: Significant digits kept per column.
+
+    Returns:
+        ``{"rows", "source_rows", "downsampling", "columns": {...}}`` where
+        ``columns`` maps each column name to a list of values.
+    """
+    budget = token_budget if token_budget is not None else config["TOOL_OUTPUT_TOKEN_BUDGET"]
+    n = len(candles[TIMESTAMP])
+
+    current = candles
+    used = "none"
+    # Price the payload from a sample first so long series are downsampled
+    # before paying to format every row.
+    if n > SAMPLE_ROWS:
+        sample = {k: np.asarray(v)[:SAMPLE_ROWS] for k, v in candles.items()}
+        estimated = estimate_tokens(_columnar(sample, format_time, digits)) * n / SAMPLE_ROWS
+        if estimated > budget:
+            current = _downsample(candles, max(2, int(n * budget / estimated * 0.95)), method)
+            used = method
+    columns = _columnar(current, format_time, digits)
+    # Shrink proportionally to the overshoot; a few passes absorb the
+    # non-linear cost of timestamps and digits.
+    for _ in range(4):
+        tokens = estimate_tokens(columns)
+        rows = len(current[TIMESTAMP])
+        if tokens <= budget or rows <= 2:
+            break
+        target = max(2, min(rows - 1, int(rows * budget / tokens * 0.95)))
+        current = _downsample(candles, target, method)
+        columns = _columnar(current, format_time, digits)
+        used = method
+
+    return {
+        "rows": len(current[TIMESTAMP]),
+        "source_rows": n,
+        "downsampling": used,
+        "columns": columns,
+    }
+
+
+def encode_series_within_budget(
+    series: Mapping[str, Candles],
+    format_time: Callable[[int], str],
+    token_budget: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Encode several candle sets so that together they fit one token budget.
+
+    The shortest series are encoded first and any budget they leave unused
+    is handed to the longer ones. Keys keep the order of ``series``.
+    """
+    budget = token_budget if token_budget is not None else config["TOOL_OUTPUT_TOKEN_BUDGET"]
+    encoded: Dict[str, Dict[str, Any]] = {}
+    by_length = sorted(series, key=lambda name: len(series[name][TIMESTAMP]))
+    for remaining, name in zip(range(len(by_length), 0, -1), by_length):
+        encoded[name] = encode_candles(series[name], format_time, token_budget=budget // remaining)
+        budget -= estimate_tokens(encoded[name])
+    return {name: encoded[name] for name in series}
@@ -0,0 +1,294 @@
+"""Shared HTTP layer for upstream data providers.
+
+Every tool talks to Binance and Alpha Vantage through this module instead of
+bare ``requests.get`` calls so that:
+
+* connections are pooled and kept alive (one ``requests.Session`` for sync
+  callers, one ``httpx.AsyncClient`` per event loop for async callers);
+* every request has a timeout;
+* transient failures (connection errors, timeouts, 429 and 5xx responses)
+  are retried with jittered exponential backoff via ``tenacity``;
+* each provider has a token bucket so we stay under its request quota
+  instead of tripping its rate-limit error path;
+* identical concurrent JSON requests are coalesced into one upstream call
+  whose parsed body is shared by every caller (treat it as read-only);
+* every attempt is counted by status code, timed and sized in
+  :mod:`src.utils.metrics` and logged as an ``upstream`` span.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from src.config import config
+from .metrics import RATE_LIMIT_HITS, RATE_LIMIT_WAIT_SECONDS, UPSTREAM_BYTES, UPSTREAM_REQUESTS, UPSTREAM_SECONDS
+from .singleflight import SingleFlight, request_key
+from .tracing import current_run_id, log_span
+
+# Overridable so benchmarks and staging can point at stand-in servers.
+ALPHA_VANTAGE_URL = config["ALPHA_VANTAGE_URL"]
+BINANCE_API_URL = config["BINANCE_API_URL"].rstrip("/")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_inflight = SingleFlight()
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by sync and async callers.
+
+    Callers reserve a token and are told how long to wait for it, so the
+    lock is never held while sleeping.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 60.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_buckets: Dict[str, TokenBucket] = {
+    provider: TokenBucket(rate)
+    for provider, rate in config["RATE_LIMITS_PER_MINUTE"].items()
+    if rate > 0
+}
+
+
+def get_rate_limiter(provider: str) -> Optional[TokenBucket]:
+    """Return the token bucket for a provider, if one is configured."""
+    return _buckets.get(provider)
+
+
+class RetryableHTTPError(Exception):
+    """Raised for responses whose status code is worth retrying."""
+
+    def __init__(self, status_code: int, url: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(headers: Any) -> Optional[float]:
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    return isinstance(
+        exc,
+        (
+            RetryableHTTPError,
+            requests.ConnectionError,
+            requests.Timeout,
+            httpx.TransportError,
+        ),
+    )
+
+
+def _record(provider: str, status: Any, started: float, waited: float, size: Optional[int] = None) -> None:
+    """Account for one upstream attempt in the metrics and span log."""
+    elapsed = time.perf_counter() - started
+    UPSTREAM_REQUESTS.labels(provider, status).inc()
+    UPSTREAM_SECONDS.labels(provider).observe(elapsed)
+    if size is not None:
+        UPSTREAM_BYTES.labels(provider).observe(size)
+    if waited > 0:
+        RATE_LIMIT_HITS.labels(provider, "throttle").inc()
+        RATE_LIMIT_WAIT_SECONDS.labels(provider).inc(waited)
+    if status == 429:
+        RATE_LIMIT_HITS.labels(provider, "upstream").inc()
+    log_span(
+        "upstream",
+        provider,
+        elapsed,
+        "ok" if isinstance(status, int) and status < 400 else "error",
+        parent_id=current_run_id(),
+        http_status=status,
+        bytes=size,
+        throttled_ms=round(waited * 1000, 3) if waited > 0 else None,
+    )
+
+
+_jitter = wait_random_exponential(multiplier=0.5, max=10)
+
+
+def _wait(retry_state) -> float:
+    """Honour Retry-After when the server sends it, else jittered backoff."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, RetryableHTTPError) and exc.retry_after is not None:
+        return exc.retry_after
+    return _jitter(retry_state)
+
+
+def _retry_kwargs() -> Dict[str, Any]:
+    return {
+        "stop": stop_after_attempt(config["HTTP_MAX_RETRIES"] + 1),
+        "wait": _wait,
+        "retry": retry_if_exception(_is_transient),
+        "reraise": True,
+    }
+
+
+# ---------------------------------------------------------------------- sync
+
+_session: Optional[requests.Session] = None
+_session_guard = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled ``requests.Session``."""
+    global _session
+    with _session_guard:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=config["HTTP_POOL_SIZE"])
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get(provider: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> requests.Response:
+    """GET ``url`` with pooling, rate limiting and retries.
+
+    Raises ``requests.HTTPError`` for non-retryable error statuses and the
+    last transient error once retries are exhausted.
+    """
+    bucket = get_rate_limiter(provider)
+    timeout = timeout if timeout is not None else config["HTTP_TIMEOUT"]
+
+    for attempt in Retrying(**_retry_kwargs()):
+        with attempt:
+            waited = bucket.acquire() if bucket is not None else 0.0
+            started = time.perf_counter()
+            try:
+                response = get_session().get(url, params=params, timeout=timeout)
+            except Exception as exc:
+                _record(provider, type(exc).__name__, started, waited)
+                raise
+            _record(provider, response.status_code, started, waited, len(response.content))
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableHTTPError(response.status_code, url, _retry_after(response.headers))
+            response.raise_for_status()
+    return response
+
+
+def get_json(provider: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+    """GET ``url`` through :func:`get` and decode the JSON body.
+
+    Concurrent calls with the same normalised parameters share one request.
+    """
+    return _inflight.do(
+        request_key(provider, url, params),
+        lambda: get(provider, url, params=params, timeout=timeout).json(),
+    )
+
+
+# --------------------------------------------------------------------- async
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled ``httpx.AsyncClient`` for the running event loop.
+
+    httpx connections are bound to the loop that opened them, so each loop
+    gets its own client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=config["HTTP_TIMEOUT"],
+            limits=httpx.Limits(
+                max_connections=config["HTTP_POOL_SIZE"],
+                max_keepalive_connections=config["HTTP_POOL_SIZE"],
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aget(provider: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> httpx.Response:
+    """Async counterpart of :func:`get`.
+
+    Raises ``httpx.HTTPStatusError`` for non-retryable error statuses.
+    """
+    bucket = get_rate_limiter(provider)
+    timeout = timeout if timeout is not None else config["HTTP_TIMEOUT"]
+
+    async for attempt in AsyncRetrying(**_retry_kwargs()):
+        with attempt:
+            waited = await bucket.aacquire() if bucket is not None else 0.0
+            started = time.perf_counter()
+            try:
+                response = await get_async_client().get(url, params=params, timeout=timeout)
+            except Exception as exc:
+                _record(provider, type(exc).__name__, started, waited)
+                raise
+            _record(provider, response.status_code, started, waited, len(response.content))
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableHTTPError(response.status_code, url, _retry_after(response.headers))
+            response.raise_for_status()
+    return response
+
+
+async def aget_json(provider: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+    """GET ``url`` through :func:`aget` and decode the JSON body.
+
+    Concurrent calls with the same normalised parameters share one request.
+    """
+
+    async def fetch() -> Any:
+        return (await aget(provider, url, params=params, timeout=timeout)).json()
+
+    return await _inflight.ado(request_key(provider, url, params), fetch)
+
+
+async def aclose() -> None:
+    """Close the async client bound to the running event loop, if any."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
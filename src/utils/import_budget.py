@@ -0,0 +1,70 @@
+"""Import-time budget check.
+
+Imports each entry-point module in a fresh interpreter and fails when it
+takes longer than its budget, so an eager import of a heavy dependency
+(langchain_openai, pandas, the agent graphs) in a package ``__init__``
+is caught before it slows down every CLI run and batch worker.
+
+Usage:
+    python -m src.utils.import_budget [--repeat 5] [--scale 2.0]
+
+On a regression, ``python -X importtime -c "import <module>"`` shows where
+the time goes.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Entry point -> budget in milliseconds for a cold import on a developer
+# machine. Keep a generous margin over the measured time; the point is to
+# catch whole heavy dependencies sneaking in, not small drifts.
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "src": 100,
+    "src.config": 150,
+    "src.tools": 100,
+    "src.agent": 100,
+    "src.batch": 800,
+    "src.service.pool": 800,
+    "src.tools.coin_price": 2000,
+}
+
+_TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def measure(module: str, repeat: int = 3) -> float:
+    """Best-of-``repeat`` cold import time of ``module`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(module=module)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(completed.stdout.strip().splitlines()[-1]) * 1000)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check cold import times against their budgets.")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: all budgeted entry points)")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. for slow CI runners")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for module in args.modules or IMPORT_BUDGETS_MS:
+        if module not in IMPORT_BUDGETS_MS:
+            parser.error(f"No import budget for {module!r}")
+        budget = IMPORT_BUDGETS_MS[module] * args.scale
+        elapsed = measure(module, args.repeat)
+        status = "ok" if elapsed <= budget else "OVER"
+        failed += status == "OVER"
+        print(f"{status:4}  {module:24} {elapsed:8.1f} ms  (budget {budget:.0f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Lazy package exports.
+
+Package ``__init__`` modules declare what they export and where it lives;
+the defining submodule is imported on first attribute access instead of
+when the package is imported. ``from package import name`` keeps working
+unchanged, but a process only pays for the modules it actually touches.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, Dict, List
+
+
+class LazyModule(ModuleType):
+    """Module type installed on packages that use :func:`lazy_exports`."""
+
+    _lazy_exports: Dict[str, str]
+
+    def __getattr__(self, name: str) -> Any:
+        exports = self.__dict__.get("_lazy_exports", {})
+        if name not in exports:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], self.__name__), name)
+        # Cache on the package so later lookups skip __getattr__.
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        exports = self.__dict__.get("_lazy_exports", {})
+        if (
+            name in exports
+            and isinstance(value, ModuleType)
+            and value.__name__ == f"{self.__name__}.{name}"
+        ):
+            # Importing a submodule binds it on its package; where the
+            # submodule shares its name with an export (get_stock_price),
+            # keep the export.
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(self.__dict__) | set(self.__dict__.get("_lazy_exports", {})))
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> List[str]:
+    """Resolve ``exports`` of ``package`` on first access and return ``__all__``.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Exported name -> module defining it, relative to
+            ``package`` (``".coin_price"``) or absolute.
+
+    Usage::
+
+        __all__ = lazy_exports(__name__, {
+            "get_coin_price": ".coin_price",
+        })
+    """
+    module = sys.modules[package]
+    module.__class__ = LazyModule
+    module._lazy_exports = dict(exports)
+    return list(exports)
@@ -0,0 +1,262 @@
+"""In-process metrics rendered in the Prometheus text format.
+
+Counters and histograms are kept in memory per label set and rendered by
+:func:`render` in the Prometheus text exposition format (version 0.0.4),
+which ``GET /metrics`` on the analysis API serves and ``python -m src.batch
+--metrics`` writes to a file. The metric families the app records are
+defined at the bottom of this module:
+
+* tools, graph nodes and LLM calls are timed by
+  :class:`src.utils.tracing.MetricsCallbackHandler`;
+* upstream requests, their status codes and rate-limit hits by
+  :mod:`src.utils.http`;
+* cache hits and misses by the candle store, the LLM cache and the
+  response cache.
+
+Usage::
+
+    from src.utils.metrics import CACHE_REQUESTS
+
+    CACHE_REQUESTS.labels(cache="candles", result="hit").inc()
+"""
+
+import bisect
+import math
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+NAMESPACE = "trading"
+
+# Seconds, from a warm cache read up to a slow multi-turn agent step.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Bytes, from a short JSON error up to an ``outputsize=full`` time series.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+# Estimated LLM tokens of a tool result.
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All registered families in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Base class for a metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional[Registry] = REGISTRY):
+        self.name = f"{NAMESPACE}_{name}" if NAMESPACE else name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: object, **labels: object):
+        """Return the child for one label set, creating it on first use."""
+        if labels:
+            if values or set(labels) != set(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+            values = tuple(labels[name] for name in self.labelnames)
+        elif len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {len(values)} values")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self) -> None:
+        """Drop every label set."""
+        with self._lock:
+            self._children.clear()
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return list(self._children.items())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        with self._lock:
+            self.value += amount
+
+
+class Counter(Metric):
+    """Monotonically increasing count; ``name`` should end in ``_total``."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def samples(self) -> Iterator[str]:
+        for key, child in self._items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bucket plus the implicit +Inf bucket; not cumulative.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed upper-bound buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Optional[Registry] = REGISTRY,
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        if not self.buckets:
+            raise ValueError("Histogram needs at least one finite bucket")
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def samples(self) -> Iterator[str]:
+        names = self.labelnames + ("le",)
+        for key, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+def render() -> str:
+    """The default registry in the Prometheus text format."""
+    return REGISTRY.render()
+
+
+# ------------------------------------------------------------------ families
+
+TOOL_SECONDS = Histogram(
+    "tool_duration_seconds", "Wall time of a tool call.", ("tool", "status"),
+)
+TOOL_OUTPUT_BYTES = Histogram(
+    "tool_output_bytes", "Serialised size of a tool result.", ("tool",), buckets=SIZE_BUCKETS,
+)
+TOOL_OUTPUT_TOKENS = Histogram(
+    "tool_output_tokens", "Estimated LLM tokens of a tool result.", ("tool",), buckets=TOKEN_BUCKETS,
+)
+NODE_SECONDS = Histogram(
+    "graph_node_duration_seconds", "Wall time of one LangGraph node step.", ("graph", "node", "status"),
+)
+LLM_SECONDS = Histogram(
+    "llm_duration_seconds", "Wall time of a chat model call.", ("model", "status"),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens reported by the chat model, by direction.", ("model", "direction"),
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "Upstream HTTP attempts by status code (or exception name), retries included.",
+    ("provider", "status"),
+)
+UPSTREAM_SECONDS = Histogram(
+    "upstream_request_duration_seconds", "Wall time of one upstream HTTP attempt.", ("provider",),
+)
+UPSTREAM_BYTES = Histogram(
+    "upstream_response_bytes", "Body size of an upstream HTTP response.", ("provider",), buckets=SIZE_BUCKETS,
+)
+RATE_LIMIT_HITS = Counter(
+    "rate_limit_hits_total",
+    "Requests delayed by the local token bucket (throttle) or answered with 429 (upstream).",
+    ("provider", "source"),
+)
+RATE_LIMIT_WAIT_SECONDS = Counter(
+    "rate_limit_wait_seconds_total", "Time spent waiting for a local token bucket.", ("provider",),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit, stale or miss).", ("cache", "result"),
+)
@@ -0,0 +1,86 @@
+"""Single-flight coalescing of identical in-flight calls.
+
+When several callers ask for the same thing at the same time, only the first
+(the "leader") runs the call; the others wait for it and share its result or
+exception. Nothing is cached once the call finishes, so this only removes
+duplicate concurrent work and never serves stale data.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Request parameters whose values upstream treats case-insensitively.
+_CASE_INSENSITIVE_PARAMS = {"symbol", "symbols"}
+
+
+def request_key(provider: str, url: str, params: Optional[Mapping[str, Any]] = None) -> Tuple:
+    """Build a hashable key for a GET request with normalised parameters."""
+    items = []
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        value = str(value).strip()
+        if name in _CASE_INSENSITIVE_PARAMS:
+            value = value.upper()
+        items.append((name, value))
+    return (provider, url, tuple(sorted(items)))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key (threads and asyncio)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Task[Any]"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless an identical call is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of :meth:`do`.
+
+        The shared call runs as its own task, so one caller being cancelled
+        does not cancel the request for everybody else.
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(loop_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[loop_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(loop_key, None))
+        return await asyncio.shield(task)
@@ -0,0 +1,35 @@
+"""Helpers for declaring LangChain tools."""
+
+from typing import Awaitable, Callable, TypeVar
+
+from langchain_core.tools import BaseTool
+
+# Every tool module imports this one, so importing any tool also attaches
+# the metrics callback to all LangChain runs.
+from . import tracing  # noqa: F401
+
+AsyncFn = TypeVar("AsyncFn", bound=Callable[..., Awaitable])
+
+
+def async_variant(sync_tool: BaseTool) -> Callable[[AsyncFn], AsyncFn]:
+    """Register the decorated coroutine as the native async path of ``sync_tool``.
+
+    The tool keeps its name, description and argument schema from the sync
+    function; ``ainvoke`` (used by the agents' ToolNode when several tool
+    calls run concurrently) then awaits the coroutine instead of running the
+    blocking function in a thread pool::
+
+        @tool
+        def get_quote(symbol: str) -> dict:
+            ...
+
+        @async_variant(get_quote)
+        async def aget_quote(symbol: str) -> dict:
+            ...
+    """
+
+    def register(coroutine: AsyncFn) -> AsyncFn:
+        sync_tool.coroutine = coroutine
+        return coroutine
+
+    return register
@@ -0,0 +1,298 @@
+"""Tool, graph node and LLM instrumentation through LangChain callbacks.
+
+:class:`MetricsCallbackHandler` is attached to every LangChain run in the
+process through a configure hook (the mechanism LangSmith tracing uses), so
+every tool in ``src/tools`` and every node of both agent graphs is covered
+whether it is invoked by an agent, the fast path or directly, without
+touching the tools themselves. It feeds the histograms and counters in
+:mod:`src.utils.metrics` and writes one structured span per finished run to
+the ``src.trace`` logger as a JSON line::
+
+    {"span": "tool", "name": "get_coin_indicators", "status": "ok",
+     "duration_ms": 412.7, "trace_id": "...", "span_id": "...",
+     "parent_id": "...", "graph": "trade_analysis_agent", "bytes": 1830,
+     "tokens": 523}
+
+``span`` is ``run`` (a top-level runnable, e.g. a whole agent invocation),
+``node``, ``tool``, ``llm`` or ``upstream`` (one HTTP attempt, logged by
+:mod:`src.utils.http` under the tool that made it). Span logging is off
+unless the logger is configured, e.g. with :func:`configure_span_log`.
+
+Set ``METRICS_ENABLED=false`` to skip the callback entirely.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, NamedTuple, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import var_child_runnable_config
+from langchain_core.tracers.context import register_configure_hook
+
+from src.config import config
+from .metrics import (
+    LLM_SECONDS,
+    LLM_TOKENS,
+    NODE_SECONDS,
+    TOOL_OUTPUT_BYTES,
+    TOOL_OUTPUT_TOKENS,
+    TOOL_SECONDS,
+)
+
+span_logger = logging.getLogger("src.trace")
+
+# Runs that never report an end (e.g. a cancelled stream) are forgotten
+# oldest-first beyond this many open runs.
+MAX_OPEN_RUNS = 10000
+
+
+def configure_span_log(target: Optional[str]) -> None:
+    """Write span logs to ``target``: ``-`` for stderr, else a file path."""
+    if not target:
+        return
+    sink = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target, encoding="utf-8")
+    sink.setFormatter(logging.Formatter("%(message)s"))
+    span_logger.addHandler(sink)
+    span_logger.setLevel(logging.INFO)
+    span_logger.propagate = False
+
+
+def _id(value: Optional[UUID]) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def log_span(
+    kind: str,
+    name: str,
+    duration_s: float,
+    status: str = "ok",
+    span_id: Optional[UUID] = None,
+    parent_id: Optional[UUID] = None,
+    trace_id: Optional[UUID] = None,
+    **fields: Any,
+) -> None:
+    """Write one span to the ``src.trace`` logger if it is enabled.
+
+    ``trace_id`` defaults to the trace of the still-open ``parent_id`` run.
+    """
+    if not span_logger.isEnabledFor(logging.INFO):
+        return
+    if trace_id is None and handler is not None:
+        trace_id = handler.trace_of(parent_id)
+    record = {
+        "ts": round(time.time(), 3),
+        "span": kind,
+        "name": name,
+        "status": status,
+        "duration_ms": round(duration_s * 1000, 3),
+        "trace_id": _id(trace_id),
+        "span_id": _id(span_id),
+        "parent_id": _id(parent_id),
+    }
+    record.update((key, value) for key, value in fields.items() if value is not None)
+    span_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def current_run_id() -> Optional[UUID]:
+    """Id of the LangChain run (e.g. the tool call) executing the caller."""
+    run_config = var_child_runnable_config.get()
+    callbacks = run_config.get("callbacks") if run_config else None
+    return getattr(callbacks, "parent_run_id", None)
+
+
+def _status(error: BaseException) -> str:
+    return "cancelled" if isinstance(error, asyncio.CancelledError) else "error"
+
+
+def _payload_text(output: Any) -> str:
+    # Agents get a ToolMessage whose content is the serialised result.
+    content = getattr(output, "content", output)
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, separators=(",", ":"), default=str)
+
+
+def _model_name(serialized: Optional[Dict[str, Any]], metadata: Optional[Dict[str, Any]]) -> str:
+    if metadata and metadata.get("ls_model_name"):
+        return str(metadata["ls_model_name"])
+    serialized = serialized or {}
+    kwargs = serialized.get("kwargs") or {}
+    name = kwargs.get("model_name") or kwargs.get("model") or serialized.get("name")
+    if not name and serialized.get("id"):
+        name = serialized["id"][-1]
+    return str(name or "unknown")
+
+
+def _token_usage(response: Any) -> Dict[str, int]:
+    usage = {"input": 0, "output": 0}
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                usage["input"] += metadata.get("input_tokens", 0)
+                usage["output"] += metadata.get("output_tokens", 0)
+    if not any(usage.values()):
+        legacy = (response.llm_output or {}).get("token_usage") or {}
+        usage["input"] = legacy.get("prompt_tokens", 0)
+        usage["output"] = legacy.get("completion_tokens", 0)
+    return usage
+
+
+class _Run(NamedTuple):
+    kind: str
+    name: str
+    started: float
+    trace_id: UUID
+    parent_id: Optional[UUID]
+    graph: Optional[str]
+    # Checkpoint namespace of the enclosing graph node, if any.
+    node_ns: Optional[str] = None
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Record latency, payload and token metrics for tools, nodes and LLM calls."""
+
+    # Cheap and thread-safe, so skip the executor hop for async runs.
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, _Run] = {}
+        self._lock = threading.Lock()
+
+    def trace_of(self, run_id: Optional[UUID]) -> Optional[UUID]:
+        """Id of the top-level run that ``run_id`` belongs to, if still open."""
+        run = self._runs.get(run_id) if run_id is not None else None
+        return run.trace_id if run else None
+
+    def _start(
+        self, kind: str, name: str, run_id: UUID, parent_run_id: Optional[UUID], node_ns: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            parent = self._runs.get(parent_run_id) if parent_run_id is not None else None
+            if parent is None:
+                # A top-level run: an agent graph, or a tool or model called directly.
+                graph = name if kind == "chain" else None
+                run = _Run("run" if kind == "chain" else kind, name, time.perf_counter(), run_id, parent_run_id, graph)
+            else:
+                if kind == "node" and node_ns == parent.node_ns:
+                    # A runnable inside the node that shares its name.
+                    kind = "chain"
+                node_ns = node_ns if kind == "node" else parent.node_ns
+                run = _Run(kind, name, time.perf_counter(), parent.trace_id, parent_run_id, parent.graph, node_ns)
+            self._runs[run_id] = run
+            while len(self._runs) > MAX_OPEN_RUNS:
+                del self._runs[next(iter(self._runs))]
+
+    def _end(self, run_id: UUID) -> Optional[_Run]:
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    def _log(self, run: _Run, run_id: UUID, elapsed: float, status: str, **fields: Any) -> None:
+        log_span(
+            run.kind,
+            run.name,
+            elapsed,
+            status,
+            span_id=run_id,
+            parent_id=run.parent_id,
+            trace_id=run.trace_id,
+            graph=run.graph,
+            **fields,
+        )
+
+    # ------------------------------------------------------------ chains
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        # LangGraph names a node's run after the node and tags it in metadata;
+        # runs inside the node inherit the tags but not a new namespace.
+        if metadata and metadata.get("langgraph_node") == name:
+            self._start("node", name, run_id, parent_run_id, metadata.get("langgraph_checkpoint_ns"))
+        else:
+            self._start("chain", name, run_id, parent_run_id)
+
+    def _chain_end(self, run_id: UUID, status: str) -> None:
+        run = self._end(run_id)
+        if run is None or run.kind == "chain":
+            return
+        elapsed = time.perf_counter() - run.started
+        if run.kind == "node":
+            NODE_SECONDS.labels(run.graph, run.name, status).observe(elapsed)
+        self._log(run, run_id, elapsed, status)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        self._chain_end(run_id, "ok")
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._chain_end(run_id, _status(error))
+
+    # ------------------------------------------------------------- tools
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None, inputs=None, **kwargs):
+        self._start("tool", (serialized or {}).get("name") or kwargs.get("name") or "tool", run_id, parent_run_id)
+
+    def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
+        from src.utils.encoding import CHARS_PER_TOKEN
+
+        run = self._end(run_id)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        text = _payload_text(output)
+        size, tokens = len(text.encode("utf-8")), int(len(text) / CHARS_PER_TOKEN) + 1
+        TOOL_SECONDS.labels(run.name, "ok").observe(elapsed)
+        TOOL_OUTPUT_BYTES.labels(run.name).observe(size)
+        TOOL_OUTPUT_TOKENS.labels(run.name).observe(tokens)
+        self._log(run, run_id, elapsed, "ok", bytes=size, tokens=tokens)
+
+    def on_tool_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        run = self._end(run_id)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        status = _status(error)
+        TOOL_SECONDS.labels(run.name, status).observe(elapsed)
+        self._log(run, run_id, elapsed, status, error=f"{type(error).__name__}: {error}")
+
+    # --------------------------------------------------------------- LLM
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._start("llm", _model_name(serialized, metadata), run_id, parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        self._start("llm", _model_name(serialized, metadata), run_id, parent_run_id)
+
+    def on_llm_end(self, response, *, run_id, parent_run_id=None, **kwargs):
+        run = self._end(run_id)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        usage = _token_usage(response)
+        LLM_SECONDS.labels(run.name, "ok").observe(elapsed)
+        for direction, count in usage.items():
+            if count:
+                LLM_TOKENS.labels(run.name, direction).inc(count)
+        self._log(run, run_id, elapsed, "ok", input_tokens=usage["input"], output_tokens=usage["output"])
+
+    def on_llm_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        run = self._end(run_id)
+        if run is None:
+            return
+        elapsed = time.perf_counter() - run.started
+        status = _status(error)
+        LLM_SECONDS.labels(run.name, status).observe(elapsed)
+        self._log(run, run_id, elapsed, status, error=f"{type(error).__name__}: {error}")
+
+
+handler: Optional[MetricsCallbackHandler] = MetricsCallbackHandler() if config["METRICS_ENABLED"] else None
+
+# A default value makes the hook apply in every thread and task, not just
+# the context that imported this module.
+_handler_var: ContextVar[Optional[MetricsCallbackHandler]] = ContextVar("metrics_callback_handler", default=handler)
+register_configure_hook(_handler_var, inheritable=True)
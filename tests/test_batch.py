@@ -0,0 +1,33 @@
+"""Regression tests for the batch runner."""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from src.batch import analyse_trade, load_trades, run_batch
+
+
+def test_malformed_lines_do_not_abort_the_batch(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    path.write_text('{bad json\n[1, 2]\n\n"text"\n', encoding="utf-8")
+    output = io.StringIO()
+    ok, failed = asyncio.run(run_batch(load_trades(str(path)), output, concurrency=2))
+    records = sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda r: r["index"])
+    assert (ok, failed) == (0, 3)
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert all(r["status"] == "error" and ":" in r["error"] for r in records)
+
+
+def test_fast_mode_uses_the_chosen_market():
+    trade = {"trading_stock": "AAPL", "trading_time": "2025-01-02 15:00:00", "trading_amount": "100"}
+    with pytest.raises(ValueError, match="trading_coin"):
+        asyncio.run(analyse_trade(trade, "coin", mode="fast"))
+
+
+def test_unreadable_input_is_reported_at_index_zero(tmp_path):
+    output = io.StringIO()
+    ok, failed = asyncio.run(run_batch(load_trades(str(tmp_path / "missing.jsonl")), output))
+    assert (ok, failed) == (0, 1)
+    assert json.loads(output.getvalue())["index"] == 0
@@ -0,0 +1,38 @@
+"""Regression tests for the local news archive."""
+
+import json
+import time
+
+import pytest
+
+from src.store.news import Article, NewsStore, tag_symbols
+
+
+def _store(tmp_path) -> NewsStore:
+    store = NewsStore(str(tmp_path / "news.db"), refresh_seconds=0)
+    now = int(time.time() * 1000)
+    titles = ["PEPE rallies as memecoins surge", "PEPE slides after listing", "Bitcoin rallies past resistance"]
+    store.ingest(
+        Article(f"https://news.example/{n}", title, "Example", now - n * 60_000, title, tag_symbols(title))
+        for n, title in enumerate(titles)
+    )
+    return store
+
+
+def test_untagged_coin_with_query(tmp_path):
+    store = _store(tmp_path)
+    now = int(time.time() * 1000)
+    result = store.search("PEPE", now - 3_600_000, now, query="rallies")
+    assert result["symbol"] == "PEPE"
+    assert [a["title"] for a in result["articles"]] == ["PEPE rallies as memecoins surge"]
+
+
+def test_failing_feed_does_not_stop_the_others(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    now = int(time.time() * 1000)
+    record = {"url": "https://news.example/a", "title": "Bitcoin rallies", "published_at": now}
+    feed.write_text(json.dumps(record) + "\n", encoding="utf-8")
+    store = NewsStore(str(tmp_path / "news.db"), feeds=[str(tmp_path / "missing.xml"), str(feed)], refresh_seconds=0)
+    with pytest.raises(FileNotFoundError):
+        store.refresh()
+    assert [a["title"] for a in store.search("BTC", now - 60_000, now + 60_000)["articles"]] == ["Bitcoin rallies"]
@@ -0,0 +1,63 @@
+"""Regression tests for stock candle coverage."""
+
+import datetime
+import importlib
+
+import numpy as np
+import pandas as pd
+
+from src.store.candles import CandleStore
+
+# The package exports the tool under the module's name.
+module = importlib.import_module("src.tools.stock.get_stock_price")
+
+INTRADAY = "TIME_SERIES_INTRADAY"
+
+
+def _month(offset: int = 0) -> str:
+    return str(pd.Period(datetime.date.today(), freq="M") + offset)
+
+
+def _bars(start: str, end: str) -> pd.DataFrame:
+    index = pd.date_range(start, end, freq="5min")
+    values = np.arange(len(index), dtype=float) + 100
+    return pd.DataFrame(
+        {"Open": values, "High": values, "Low": values, "Close": values, "Volume": values}, index=index
+    )
+
+
+def test_current_month_is_covered_from_its_start():
+    month = _month()
+    frame = _bars(f"{month}-01 04:00", f"{month}-01 20:00")
+    start, end = module._covered_range(frame, 0, INTRADAY, "full", month)
+    assert start == module._month_range(month)[0]
+    assert end == module.to_ms(f"{month}-01 19:55")
+
+
+def test_plan_running_into_current_month_covers_both_months():
+    previous, month = _month(-1), _month()
+    now_ms = module.to_ms(f"{month}-01 20:00")
+    gap_start = module.to_ms(f"{previous}-01")
+    plan = module.plan_requests(INTRADAY, "5min", gap_start, now_ms, now_ms=now_ms)
+    assert plan == [module.PlannedRequest("full", previous), module.PlannedRequest("full", month)]
+    frames = [_bars(f"{previous}-02 04:00", f"{previous}-02 20:00"), _bars(f"{month}-01 04:00", f"{month}-01 20:00")]
+    _, covered = module._merge_planned(frames, plan, gap_start, INTRADAY)
+    assert covered == (module._month_range(previous)[0], module.to_ms(f"{month}-01 19:55"))
+
+
+def test_repeated_range_from_month_start_hits_the_store(tmp_path, monkeypatch):
+    month = _month()
+    store = CandleStore(str(tmp_path))
+    requests = []
+
+    def fetch(symbol, function_type, interval, outputsize, adjusted, extended_hours, month):
+        requests.append((outputsize, month))
+        return _bars(f"{month}-01 04:00", f"{month}-03 20:00")
+
+    monkeypatch.setattr(module, "get_candle_store", lambda: store)
+    monkeypatch.setattr(module, "_fetch_time_series", fetch)
+    monkeypatch.setattr(module, "exchange_now_ms", lambda: module.to_ms(f"{month}-20 12:00"))
+    for _ in range(3):
+        frame = module.fetch_stock_candles("AAPL", f"{month}-01", f"{month}-02 23:59", INTRADAY, "5min")
+        assert len(frame) > 0
+    assert requests == [("full", month)]
@@ -0,0 +1,40 @@
+"""Regression tests for bulk stock quotes."""
+
+import importlib
+
+import pytest
+
+# The package exports the tool under the module's name.
+module = importlib.import_module("src.tools.stock.get_stock_quotes")
+
+RATE_LIMIT = (
+    "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day. "
+    "Please subscribe to any of the premium plans at https://www.alphavantage.co/premium/ "
+    "to instantly remove all daily rate limits."
+)
+PREMIUM = (
+    "Thank you for using Alpha Vantage! This is a premium endpoint. You may subscribe to any of "
+    "the premium plans at https://www.alphavantage.co/premium/ to instantly unlock all premium endpoints"
+)
+
+
+@pytest.fixture(autouse=True)
+def bulk_available(monkeypatch):
+    monkeypatch.setattr(module, "_bulk_available", True)
+
+
+def test_rate_limit_notice_keeps_bulk_enabled():
+    with pytest.raises(ValueError, match="API Rate Limit"):
+        module._parse_bulk({"Information": RATE_LIMIT}, ["AAPL"])
+    assert module._bulk_available
+
+
+def test_unexpected_response_keeps_bulk_enabled():
+    with pytest.raises(ValueError):
+        module._parse_bulk({"message": "try again later"}, ["AAPL"])
+    assert module._bulk_available
+
+
+def test_premium_notice_disables_bulk():
+    assert module._parse_bulk({"Information": PREMIUM}, ["AAPL"]) is None
+    assert not module._bulk_available
@@ -0,0 +1,40 @@
+"""Regression tests for graph node classification in the metrics callback."""
+
+from typing import List, Tuple, TypedDict
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+
+from src.utils.tracing import MetricsCallbackHandler
+
+
+class State(TypedDict):
+    value: int
+
+
+def _spans(graph) -> List[Tuple[str, str]]:
+    spans = []
+    handler = MetricsCallbackHandler()
+    handler._log = lambda run, run_id, elapsed, status, **fields: spans.append((run.kind, run.name))
+    graph.invoke({"value": 0}, {"callbacks": [handler]})
+    return spans
+
+
+def _graph(name: str, node):
+    builder = StateGraph(State)
+    builder.add_node(name, node)
+    builder.add_edge(START, name)
+    builder.add_edge(name, END)
+    return builder.compile()
+
+
+def test_inner_runnable_named_like_its_node_is_not_a_node():
+    inner = RunnableLambda(lambda state: {"value": state["value"] + 1}, name="work")
+    spans = _spans(_graph("work", lambda state: inner.invoke(state)))
+    assert [s for s in spans if s[0] == "node"] == [("node", "work")]
+
+
+def test_subgraph_nodes_are_nodes():
+    inner = _graph("work", lambda state: {"value": state["value"] + 1})
+    spans = _spans(_graph("agent", inner))
+    assert sorted(s for s in spans if s[0] == "node") == [("node", "agent"), ("node", "work")]